@@ -0,0 +1,122 @@
+import os
+import argparse
+
+from backend.utils.neo4j_pool import get_session, execute_write
+
+
+# ====================================
+# Materialized per-supplier risk aggregates
+# ====================================
+# Stored on each Supplier so read paths avoid aggregating AFFECTS edges:
+#   event_count      number of AFFECTS edges
+#   severity_events  edges whose event has a severity
+#   severity_sum     sum of those severities
+#   severity_max     max of those severities
+#   severity_avg     severity_sum / severity_events (null without severities)
+#   severity_score   coalesce(severity_avg, 0.0); never null, so the
+#                    dashboard can order on it straight from an index
+#   event_types      distinct event types
+AGGREGATE_CHUNK_SIZE = int(os.getenv("AGGREGATE_CHUNK_SIZE", "1000"))
+
+
+# Cypher fragment for `MERGE (e)-[r:AFFECTS]->(s) ON CREATE SET ...`:
+# folds one newly linked event `e` into supplier `s`. Each item only
+# reads its own property, so SET ordering does not matter.
+ON_LINK_AGGREGATES = """
+    s.event_count = coalesce(s.event_count, 0) + 1,
+    s.severity_events = coalesce(s.severity_events, 0) + CASE WHEN e.severity IS NULL THEN 0 ELSE 1 END,
+    s.severity_sum = coalesce(s.severity_sum, 0.0) + coalesce(e.severity, 0.0),
+    s.severity_max = CASE
+        WHEN e.severity IS NULL THEN s.severity_max
+        WHEN s.severity_max IS NULL OR e.severity > s.severity_max THEN e.severity
+        ELSE s.severity_max END,
+    s.event_types = CASE
+        WHEN e.type IS NULL OR e.type IN coalesce(s.event_types, []) THEN coalesce(s.event_types, [])
+        ELSE coalesce(s.event_types, []) + e.type END
+"""
+
+# Separate clause run after the MERGE, once the counters above are set
+SET_SEVERITY_AVG = """
+    SET s.severity_avg = CASE WHEN s.severity_events > 0
+                              THEN s.severity_sum / s.severity_events END,
+        s.severity_score = coalesce(s.severity_avg, 0.0)
+"""
+
+
+def refresh_supplier_aggregates(tx, supplier_ids):
+    """
+    Recompute aggregates exactly from AFFECTS edges. Used after edge
+    removals, severity changes and for drift repair.
+    """
+    tx.run("""
+        UNWIND $ids AS sid
+        MATCH (s:Supplier {id: sid})
+        OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
+        WITH s,
+             count(e) AS event_count,
+             count(e.severity) AS severity_events,
+             coalesce(sum(e.severity), 0.0) AS severity_sum,
+             max(e.severity) AS severity_max,
+             avg(e.severity) AS severity_avg,
+             [t IN collect(DISTINCT e.type) WHERE t IS NOT NULL] AS event_types
+        SET s.event_count = event_count,
+            s.severity_events = severity_events,
+            s.severity_sum = toFloat(severity_sum),
+            s.severity_max = severity_max,
+            s.severity_avg = severity_avg,
+            s.severity_score = coalesce(severity_avg, 0.0),
+            s.event_types = event_types
+    """, ids=list(supplier_ids))
+
+
+def refresh_event_suppliers(tx, event_ids):
+    """Refresh aggregates of every supplier linked to the given events."""
+    ids = [r["id"] for r in tx.run("""
+        UNWIND $event_ids AS eid
+        MATCH (:RiskEvent {id: eid})-[:AFFECTS]->(s:Supplier)
+        RETURN DISTINCT s.id AS id
+    """, event_ids=list(event_ids))]
+    if ids:
+        refresh_supplier_aggregates(tx, ids)
+    return ids
+
+
+def delete_event(tx, event_id):
+    """Remove a RiskEvent and fold it out of its suppliers' aggregates."""
+    ids = [r["id"] for r in tx.run("""
+        MATCH (e:RiskEvent {id: $event_id})
+        OPTIONAL MATCH (e)-[:AFFECTS]->(s:Supplier)
+        SET s.risk_touched_at = datetime()
+        WITH e, collect(s.id) AS ids
+        DETACH DELETE e
+        UNWIND ids AS id
+        RETURN id
+    """, event_id=event_id)]
+    if ids:
+        refresh_supplier_aggregates(tx, ids)
+    return ids
+
+
+# ====================================
+# Rebuild (drift repair)
+# ====================================
+def rebuild_supplier_aggregates(chunk_size=AGGREGATE_CHUNK_SIZE):
+    with get_session() as session:
+        ids = [r["id"] for r in session.run("MATCH (s:Supplier) RETURN s.id AS id")]
+
+    for start in range(0, len(ids), chunk_size):
+        execute_write(refresh_supplier_aggregates, ids[start:start + chunk_size])
+
+    return {"suppliers": len(ids)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Supplier risk aggregates")
+    parser.add_argument("--rebuild", action="store_true", help="recompute aggregates for every supplier")
+    parser.add_argument("--chunk-size", type=int, default=AGGREGATE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print("🔧 Rebuilt aggregates:", rebuild_supplier_aggregates(args.chunk_size))
+    else:
+        parser.print_help()
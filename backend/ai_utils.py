@@ -1,11 +1,15 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from groq import Groq
 from dotenv import load_dotenv
 from datetime import datetime, date
 from neo4j.time import DateTime as Neo4jDateTime
 from backend.utils.neo4j_utils import serialize_record
-from backend.mcp.graph_mcp import GraphMCP
+from backend import storage
+from backend.llm_cache import analysis_cache, cache_key
+from backend.supplier_index import get_supplier_index
+from backend import metrics
 
 
 # Load environment variables
@@ -17,29 +21,88 @@ load_dotenv(env_path)
 # Create Groq key.
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-def analyze_text(text):
-    prompt = f"""
-    You MUST respond ONLY in valid JSON. No extra text. No explanation.
+LLM_MODEL = "llama-3.1-8b-instant"
+# Bump when the analysis prompt changes so cached results are not reused
+PROMPT_VERSION = "analysis-v1"
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
 
-    Extract the following from the news text:
+
+def set_llm_client(new_client):
+    """
+    Swap the LLM client (e.g. for a local fake when benchmarking).
+    Anything exposing `chat.completions.create(...)` like Groq works.
+    """
+    global client
+    client = new_client
+
+
+ANALYSIS_FIELDS = """
     - summary (string)
     - sentiment (positive, neutral, negative)
     - sentiment_score (0 to 1)
     - entities (list of company or supplier names)
     - severity (0 to 1)
+"""
 
-    Text:
-    {text}
+
+def default_analysis(text):
+    return {
+        "summary": text[:100],
+        "sentiment": "neutral",
+        "sentiment_score": 0.5,
+        "entities": [],
+        "severity": 0.3
+    }
+
+
+def is_valid_analysis(analysis):
+    """
+    True for a dict with an `entities` list and a numeric `severity`,
+    the fields ingest relies on. Anything else is never cached.
     """
+    if not isinstance(analysis, dict):
+        return False
+    severity = analysis.get("severity")
+    return (
+        isinstance(analysis.get("entities"), list)
+        and isinstance(severity, (int, float)) and not isinstance(severity, bool)
+    )
 
-    try:
+
+def complete(prompt, purpose="analyze"):
+    with metrics.timed(f"llm.{purpose}"):
         response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0
         )
+    metrics.record_llm_usage(purpose, getattr(response, "usage", None))
+    return (response.choices[0].message.content or "").strip()
 
-        raw = response.choices[0].message.content.strip()
+
+@metrics.instrument("analyze_text")
+def analyze_text(text, use_cache=True):
+    """
+    Analyze one article. Results are cached on disk by content, model
+    and prompt version; use_cache=False forces a fresh LLM call.
+    """
+    key = cache_key(text, LLM_MODEL, PROMPT_VERSION)
+    if use_cache:
+        cached = analysis_cache.get(key)
+        if is_valid_analysis(cached):
+            return cached
+
+    prompt = f"""
+    You MUST respond ONLY in valid JSON. No extra text. No explanation.
+
+    Extract the following from the news text:
+    {ANALYSIS_FIELDS}
+    Text:
+    {text}
+    """
+
+    try:
+        raw = complete(prompt)
 
         # 🔍 Debug print (optional)
         print("Raw LLM Output:", raw)
@@ -49,17 +112,94 @@ def analyze_text(text):
             raise ValueError("Empty response from model")
 
         # Try to parse JSON
-        return json.loads(raw)
+        analysis = json.loads(raw)
+
+        if not is_valid_analysis(analysis):
+            raise ValueError("Analysis is not an object with entities and severity")
 
     except Exception as e:
         print("LLM error:", e)
-        return {
-            "summary": text[:100],
-            "sentiment": "neutral",
-            "sentiment_score": 0.5,
-            "entities": [],
-            "severity": 0.3
-        }
+        return default_analysis(text)
+
+    if use_cache:
+        analysis_cache.put(key, analysis)
+    return analysis
+
+
+# ====================================
+# Batch Analysis
+# ====================================
+def analyze_packed(texts):
+    """
+    Analyze several articles with one prompt. Items the model skips or
+    mangles come back as None.
+    """
+    articles = "\n".join(
+        f"[{i}] {json.dumps(text)}" for i, text in enumerate(texts)
+    )
+    prompt = f"""
+    You MUST respond ONLY in valid JSON. No extra text. No explanation.
+
+    For EACH numbered news text below, extract:
+    - index (the number in brackets)
+    {ANALYSIS_FIELDS}
+    Return a JSON array with one object per text.
+
+    Texts:
+    {articles}
+    """
+
+    results = [None] * len(texts)
+
+    try:
+        parsed = json.loads(complete(prompt, purpose="analyze_packed"))
+        for item in parsed if isinstance(parsed, list) else []:
+            idx = item.get("index") if isinstance(item, dict) else None
+            if (isinstance(idx, int) and 0 <= idx < len(texts) and results[idx] is None
+                    and is_valid_analysis(item)):
+                item.pop("index")
+                results[idx] = item
+    except Exception as e:
+        print("LLM batch error:", e)
+
+    return results
+
+
+def analyze_texts(texts, batch_size=1, max_workers=LLM_CONCURRENCY, use_cache=True):
+    """
+    Analyze many articles; results line up with `texts` by index.
+
+    batch_size=1 sends one prompt per article, otherwise articles are
+    packed `batch_size` per prompt. Either way at most `max_workers`
+    LLM calls are in flight, and only cache misses reach the LLM.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    if batch_size <= 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda t: analyze_text(t, use_cache=use_cache), texts))
+
+    keys = [cache_key(text, LLM_MODEL, PROMPT_VERSION) for text in texts]
+    results = [analysis_cache.get(key) if use_cache else None for key in keys]
+    results = [result if is_valid_analysis(result) else None for result in results]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        analyzed = pool.map(lambda batch: analyze_packed([texts[i] for i in batch]), batches)
+
+        for batch, batch_results in zip(batches, analyzed):
+            for i, result in zip(batch, batch_results):
+                if result is None:
+                    results[i] = default_analysis(texts[i])
+                    continue
+                results[i] = result
+                if use_cache:
+                    analysis_cache.put(keys[i], result)
+
+    return results
 
 
 def serialize_value(value):
@@ -81,36 +221,14 @@ def serialize_record(obj):
 
 def load_all_suppliers():
     """
-    Fetch all suppliers dynamically from Neo4j.
+    Fetch all suppliers dynamically from the graph backend.
     """
-    g = GraphMCP()
-    try:
-        suppliers = g.get_all_suppliers()
-        return suppliers
-    finally:
-        g.close()    
+    return storage.graph_mcp().get_all_suppliers()
 
 
 def extract_supplier_from_message(message: str):
     """
-    Extract supplier name from user message using Neo4j-loaded suppliers
+    Extract supplier name from user message using the shared in-memory
+    supplier index (longest name/alias match wins)
     """
-    from backend.ai_utils import load_all_suppliers  # local import to avoid circular
-
-    message_lower = message.lower()
-    suppliers = load_all_suppliers()
-
-    for supplier in suppliers:
-        name = supplier["name"]
-        aliases = supplier.get("aliases", [])
-
-        # Match full name
-        if name.lower() in message_lower:
-            return name
-
-        # Match aliases
-        for alias in aliases:
-            if alias.lower() in message_lower:
-                return name
-
-    return None
+    return get_supplier_index().find_name_in_text(message)
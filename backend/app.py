@@ -1,9 +1,22 @@
 import os
-from flask import Flask, jsonify, render_template, request
+import json
+import time
+import atexit
+from flask import Flask, Response, g, jsonify, render_template, request, stream_with_context
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
 import requests
-from backend.langgraph_agent_reference import run_agent
+from backend.langgraph_agent_reference import run_agent, run_agent_stream
+from backend.intent_router import router_stats
+from backend.response_cache import response_cache, intent_cache
+from backend.jobs import job_queue, enqueue_ingest
+from backend.utils.neo4j_pool import get_session, pool_stats, close_driver
+from backend.mcp.name_resolver import normalize_name
+from backend.storage import get_graph, ALERT_SORTS, SUPPLIER_SORTS
+from backend import metrics
+from backend.mcp import profiling
+from backend.pagination import (
+    PaginationError, parse_limit, parse_float, decode_cursor, page
+)
 
 
 # =========================
@@ -14,20 +27,33 @@ env_path = os.path.join(BASE_DIR, ".env")
 if os.path.exists(env_path):
     load_dotenv(env_path)
 
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
 # =========================
-# Neo4j Driver
+# Neo4j Driver (shared pool)
 # =========================
-def get_neo4j_driver():
-    return GraphDatabase.driver(
-        NEO4J_URI,
-        auth=(NEO4J_USER, NEO4J_PASSWORD)
-    )
+atexit.register(close_driver)
+
+# =========================
+# Request metrics
+# =========================
+# Labelled by route pattern, not path, to keep label cardinality fixed.
+# Streaming responses are timed up to the first byte; the explanation
+# stream itself is recorded as the llm.explain_stream stage.
+if metrics.METRICS_ENABLED:
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            metrics.record_request(
+                request.method, route, response.status_code, time.perf_counter() - started
+            )
+        return response
 
 # =========================
 # ROUTES
@@ -40,14 +66,33 @@ def home():
 @app.route("/test-neo4j")
 def test_neo4j():
     try:
-        driver = get_neo4j_driver()
-        with driver.session() as session:
+        with get_session() as session:
             count = session.run("MATCH (n) RETURN count(n) AS c").single()["c"]
         return jsonify(ok=True, node_count=count)
     except Exception as e:
         return jsonify(ok=False, error=str(e))
 
 
+@app.route("/api/neo4j-pool")
+def neo4j_pool():
+    return jsonify(pool_stats())
+
+
+@app.route("/api/slow-queries")
+def slow_queries():
+    # Filled only while MCP_PROFILE is timing/profile
+    return jsonify(
+        profile=profiling.MCP_PROFILE,
+        threshold_ms=profiling.SLOW_QUERY_MS,
+        queries=profiling.recent_slow_queries()
+    )
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    if not metrics.METRICS_ENABLED:
+        return jsonify(error="metrics disabled (METRICS_ENABLED=0)"), 404
+    return Response(metrics.render_metrics(), mimetype="text/plain; version=0.0.4")
 
 
 # -------------------------
@@ -55,15 +100,36 @@ def test_neo4j():
 # -------------------------
 @app.route("/api/ingest-news", methods=["GET", "POST"])
 def ingest_news_api():
-    from ingest_news import ingest_all
-    from risk_engine import update_all_risks_and_alerts
+    """
+    Queue an ingest run and return its job id right away. If one is
+    already queued or running, that job is returned instead.
+    """
+    # ?full_sweep=1 rescans every supplier instead of only touched ones
+    full_sweep = request.args.get("full_sweep") in ("1", "true")
 
-    try:
-        results = ingest_all()
-        alerts = update_all_risks_and_alerts()
-        return jsonify({"ingested": results, "alerts": alerts})
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
+    job, created = enqueue_ingest(full_sweep=full_sweep)
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "deduplicated": not created,
+        "status_url": f"/api/jobs/{job.id}"
+    }), 202
+
+
+@app.route("/api/jobs")
+def api_jobs():
+    return jsonify([
+        {"id": j.id, "kind": j.kind, "status": j.status, "created_at": j.created_at}
+        for j in job_queue.list()
+    ])
+
+
+@app.route("/api/jobs/<job_id>")
+def api_job_status(job_id):
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
 
 
 # -------------------------
@@ -71,17 +137,37 @@ def ingest_news_api():
 # -------------------------
 @app.route("/api/alerts")
 def api_alerts():
+    """
+    Open alerts, one keyset-paginated page at a time.
+
+    ?limit=50&sort=risk|created_at|country&cursor=<next_cursor>
+    &min_risk=0.6&country=India&supplier_id=S1
+    """
     try:
-        driver = get_neo4j_driver()
-        query = """
-        MATCH (a:Alert {open: true})
-        RETURN a.supplier_id AS supplier_id,
-               a.risk_value AS risk,
-               a.created_at AS created_at
-        """
-        with driver.session() as session:
-            results = session.run(query).data()
-        return jsonify(results)
+        sort = request.args.get("sort", "risk")
+        if sort not in ALERT_SORTS:
+            raise PaginationError(f"sort must be one of {sorted(ALERT_SORTS)}")
+        limit = parse_limit(request.args.get("limit"))
+        cursor_value, cursor_tiebreak = decode_cursor(request.args.get("cursor"), sort)
+        min_risk = parse_float(request.args.get("min_risk"), "min_risk")
+    except (PaginationError, ValueError) as e:
+        return jsonify(ok=False, error=str(e)), 400
+
+    try:
+        rows = get_graph().list_alerts(
+            sort,
+            limit + 1,
+            cursor_value,
+            cursor_tiebreak,
+            min_risk=min_risk,
+            country=request.args.get("country"),
+            supplier_id=request.args.get("supplier_id")
+        )
+
+        result = page(rows, limit, sort, "_sort", "supplier_id")
+        for row in result["items"]:
+            row.pop("_sort")
+        return jsonify(result)
     except Exception as e:
         return jsonify(ok=False, error=str(e)), 500
 
@@ -91,20 +177,7 @@ def api_alerts():
 # -------------------------
 @app.route("/api/supplier/<sid>")
 def api_supplier_detail(sid):
-    driver = get_neo4j_driver()
-    query = """
-    MATCH (s:Supplier {id:$sid})
-    OPTIONAL MATCH (s)-[:SUPPLIES]->(p:Product)
-    OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
-    RETURN s{.*, 
-            products: collect(DISTINCT p.name), 
-            events: collect(DISTINCT e{.*})} AS supplier
-    """
-    with driver.session() as session:
-        result = session.run(query, sid=sid).single()
-    if not result:
-        return jsonify({})
-    return jsonify(result["supplier"])
+    return jsonify(get_graph().supplier_detail(sid) or {})
 
 
 @app.route("/agent-ui", methods=["GET", "POST"])
@@ -145,41 +218,89 @@ def api_agent():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/supplier-dashboard")
-def supplier_dashboard():
-    from neo4j import GraphDatabase
-    import os
+@app.route("/api/agent/stream", methods=["POST"])
+def api_agent_stream():
+    """
+    Server-Sent Events variant of /api/agent: a `data` event with the
+    query result, `token` events with explanation text, then `done`
+    (or `error`).
+    """
+    data = request.get_json()
+    message = data.get("message")
 
-    driver = GraphDatabase.driver(
-        os.getenv("NEO4J_URI"),
-        auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
+    if not message:
+        return jsonify({"error": "Message is required"}), 400
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+    def generate():
+        try:
+            for event, payload in run_agent_stream(message):
+                yield sse(event, payload)
+        except Exception as e:
+            yield sse("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-    query = """
-    MATCH (s:Supplier)
-    OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
-    WITH s,
-         collect(DISTINCT e.type) AS risk_events,
-         coalesce(avg(e.severity), 0.0) AS avg_risk
-    RETURN
-        s.name AS supplier,
-        s.country AS country,
-        avg_risk AS risk_score,
-        risk_events
-    ORDER BY risk_score DESC
+
+@app.route("/api/agent/stats")
+def api_agent_stats():
+    return jsonify({
+        "router": router_stats(),
+        "response_cache": response_cache.stats(),
+        "intent_cache": intent_cache.stats()
+    })
+
+
+@app.route("/api/suppliers")
+def api_suppliers():
     """
+    Suppliers with their risk score and event types, keyset-paginated.
 
-    with driver.session() as session:
-        suppliers = session.run(query).data()
+    ?limit=50&sort=risk|created_at|country|name&cursor=<next_cursor>
+    &country=India&min_risk=0.4&q=<name prefix>
+    """
+    try:
+        sort = request.args.get("sort", "risk")
+        if sort not in SUPPLIER_SORTS:
+            raise PaginationError(f"sort must be one of {sorted(SUPPLIER_SORTS)}")
+        limit = parse_limit(request.args.get("limit"))
+        cursor_value, cursor_tiebreak = decode_cursor(request.args.get("cursor"), sort)
+        min_risk = parse_float(request.args.get("min_risk"), "min_risk")
+    except (PaginationError, ValueError) as e:
+        return jsonify(ok=False, error=str(e)), 400
 
-    driver.close()
+    q = normalize_name(request.args.get("q")) or None
 
-    return render_template(
-        "supplier_dashboard.html",
-        suppliers=suppliers
-    )
+    try:
+        rows = get_graph().list_suppliers(
+            sort,
+            limit + 1,
+            cursor_value,
+            cursor_tiebreak,
+            country=request.args.get("country"),
+            q=q,
+            min_risk=min_risk
+        )
+
+        result = page(rows, limit, sort, "_sort", "id")
+        for row in result["items"]:
+            row.pop("_sort")
+        return jsonify(result)
+    except Exception as e:
+        return jsonify(ok=False, error=str(e)), 500
 
 
+@app.route("/supplier-dashboard")
+def supplier_dashboard():
+    # Rows are fetched page by page from /api/suppliers by dashboard.js
+    return render_template("supplier_dashboard.html")
+
 
 # =========================
 if __name__ == "__main__":
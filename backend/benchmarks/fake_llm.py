@@ -0,0 +1,129 @@
+import re
+import json
+import time
+import random
+import threading
+from types import SimpleNamespace
+
+
+# ====================================
+# Groq stand-in
+# ====================================
+# Drop-in for `Groq(...)` wherever only `chat.completions.create` is
+# used: backend.ai_utils.set_llm_client(FakeGroq(...)) and
+# langgraph_agent_reference.client. Answers are canned but shaped like
+# the real model's, and every call sleeps for a configurable latency.
+EXPLANATION = (
+    "Risk is elevated because recent disruption events have hit this supplier "
+    "and its upstream partners. Severity has trended upward over the last "
+    "weeks. Consider qualifying an alternate source and increasing buffer "
+    "stock for affected products."
+)
+
+
+def _tokens(text):
+    # Rough English token count, enough for usage accounting
+    return max(1, len(text) // 4)
+
+
+class FakeCompletions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, model=None, messages=None, temperature=None, stream=False, **kwargs):
+        return self._owner.complete(messages or [], stream=stream, model=model)
+
+
+class FakeGroq:
+    """
+    latency         seconds before a response (or the first stream chunk)
+    jitter          extra uniform random latency, 0..jitter seconds
+    token_latency   seconds between stream chunks
+    entities        {text: [entity, ...]} the analysis prompt should
+                    "extract"; texts not listed yield no entities
+    """
+
+    def __init__(self, latency=0.2, jitter=0.0, token_latency=0.0, entities=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.entities = dict(entities or {})
+        self.chat = SimpleNamespace(completions=FakeCompletions(self))
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _sleep(self):
+        with self._lock:
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    # -----------------------------------
+    # Canned answers by prompt shape
+    # -----------------------------------
+    def _analysis(self, text):
+        entities = self.entities.get(text, [])
+        return {
+            "summary": text[:100],
+            "sentiment": "negative" if entities else "neutral",
+            "sentiment_score": 0.2 if entities else 0.5,
+            "entities": entities,
+            "severity": round(0.3 + 0.1 * (len(text) % 7), 2)
+        }
+
+    def answer(self, prompt):
+        if "Return a JSON array with one object per text" in prompt:
+            texts = [json.loads(m) for m in re.findall(r"^\s*\[\d+\] (\".*\")$", prompt, re.M)]
+            return json.dumps([{"index": i, **self._analysis(t)} for i, t in enumerate(texts)])
+
+        if "Extract the following from the news text" in prompt:
+            text = prompt.rsplit("Text:", 1)[-1].strip()
+            return json.dumps(self._analysis(text))
+
+        if "intent classifier" in prompt:
+            message = prompt.rsplit("User message:", 1)[-1].lower()
+            return "EVENT_SEVERITY" if "severity" in message else "RISK_REPORT"
+
+        return EXPLANATION
+
+    def complete(self, messages, stream=False, model=None):
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        content = self.answer(prompt)
+        usage = SimpleNamespace(
+            prompt_tokens=_tokens(prompt),
+            completion_tokens=_tokens(content),
+            total_tokens=_tokens(prompt) + _tokens(content)
+        )
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+
+        self._sleep()
+        if stream:
+            return self._stream(content)
+
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage
+        )
+
+    def _stream(self, content):
+        for word in re.findall(r"\S+\s*", content):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=word))])
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens
+            }
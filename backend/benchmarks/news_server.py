@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import zlib
+import threading
+from xml.sax.saxutils import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+# ====================================
+# Local HTTP stand-in for the news feeds
+# ====================================
+# Serves NewsAPI-, Google News RSS- and GDELT-shaped responses built
+# from a fixed article list:
+#   /newsapi   NewsAPI /v2/everything JSON
+#   /rss       Google News RSS XML
+#   /gdelt     GDELT doc API JSON
+# Each query gets a stable slice of the articles, so repeated runs see
+# the same feed. use_news_server() points backend.ingest_news at it.
+PAGE_SIZE = 5
+GDELT_PAGE_SIZE = 10
+
+
+class NewsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    def _page(self, query, size):
+        articles = self.server.articles
+        if not articles:
+            return []
+        start = zlib.crc32(query.encode("utf-8")) % len(articles)
+        return [articles[(start + i) % len(articles)] for i in range(min(size, len(articles)))]
+
+    def _send(self, body, content_type):
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.count()
+
+        url = urlparse(self.path)
+        query = (parse_qs(url.query).get("q") or parse_qs(url.query).get("query") or [""])[0]
+
+        if url.path == "/newsapi":
+            self._send(json.dumps({"status": "ok", "articles": [
+                {
+                    "title": a["title"],
+                    "description": a["text"],
+                    "content": a["text"],
+                    "source": {"name": a["source"]},
+                    "url": a["url"]
+                }
+                for a in self._page(query, PAGE_SIZE)
+            ]}), "application/json")
+
+        elif url.path == "/rss":
+            items = "".join(
+                f"<item><title>{escape(a['title'])}</title>"
+                f"<description>{escape(a['text'])}</description>"
+                f"<link>{escape(a['url'])}</link></item>"
+                for a in self._page(query, PAGE_SIZE)
+            )
+            self._send(
+                f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{items}</channel></rss>',
+                "application/rss+xml"
+            )
+
+        elif url.path == "/gdelt":
+            self._send(json.dumps({"articles": [
+                {"title": a["title"], "url": a["url"], "documentidentifier": a["text"]}
+                for a in self._page(query, GDELT_PAGE_SIZE)
+            ]}), "application/json")
+
+        else:
+            self.send_error(404)
+
+
+class NewsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, articles, latency=0.0, host="127.0.0.1", port=0):
+        super().__init__((host, port), NewsHandler)
+        self.articles = list(articles)
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="news-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def use_news_server(server):
+    """
+    Point the ingest fetchers at `server`. NewsAPI needs a key to run at
+    all, so a placeholder is set if none is configured.
+    """
+    from backend import ingest_news
+
+    ingest_news.NEWSAPI_URL = f"{server.base_url}/newsapi"
+    ingest_news.GOOGLE_NEWS_RSS_URL = f"{server.base_url}/rss"
+    ingest_news.GDELT_URL = f"{server.base_url}/gdelt"
+    os.environ.setdefault("NEWSAPI_KEY", "bench")
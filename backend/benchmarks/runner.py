@@ -0,0 +1,351 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+from contextlib import contextmanager, redirect_stdout
+
+import numpy as np
+
+
+# ====================================
+# Offline benchmark runner
+# ====================================
+#   python -m backend.benchmarks.runner --out bench.json
+#   python -m backend.benchmarks.runner --neo4j --out bench.json --baseline main.json
+#
+# In-process stages (fetch, dedup, analyze, index, routing, scoring,
+# propagation) always run against the local news server and the fake
+# Groq client. --neo4j adds the database-bound stages (graph load,
+# ingest_all, risk sweeps, MCP queries, agent answers) against NEO4J_URI,
+# --embedded the MCP queries against an in-process EmbeddedGraph;
+# use a scratch database: synthetic data is removed afterwards, but the
+# risk sweeps touch every supplier.
+SAMPLE_MESSAGES = [
+    "How risky is {name}?",
+    "Show latest events for {name}",
+    "What is the risk severity in India?",
+    "Top risky suppliers",
+    "Add supplier {name} with risk 0.4",
+]
+
+
+class StageRecorder:
+    """Latency samples per stage, plus items processed per sample."""
+
+    def __init__(self):
+        self.samples = {}
+        self.items = {}
+
+    @contextmanager
+    def measure(self, stage, items=1):
+        """
+        Time the block as one sample. The yielded dict's "items" can be
+        set inside the block when the count is only known afterwards.
+        """
+        sample = {"items": items}
+        started = time.perf_counter()
+        yield sample
+        self.samples.setdefault(stage, []).append(time.perf_counter() - started)
+        self.items[stage] = self.items.get(stage, 0) + sample["items"]
+
+    def summary(self):
+        stages = {}
+        for stage, samples in self.samples.items():
+            ms = np.asarray(samples) * 1000
+            total_s = float(np.sum(samples))
+            stages[stage] = {
+                "samples": len(samples),
+                "items": self.items[stage],
+                "total_s": round(total_s, 4),
+                "ops_per_s": round(len(samples) / total_s, 2) if total_s else None,
+                "items_per_s": round(self.items[stage] / total_s, 2) if total_s else None,
+                "mean_ms": round(float(ms.mean()), 3),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "p99_ms": round(float(np.percentile(ms, 99)), 3),
+                "min_ms": round(float(ms.min()), 3),
+                "max_ms": round(float(ms.max()), 3),
+            }
+        return stages
+
+
+def code_version():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+# ====================================
+# Stages
+# ====================================
+def run_offline(rec, graph, articles, args):
+    from backend.ingest_news import fetch_all_news
+    from backend.dedup import dedup_articles
+    from backend.ai_utils import analyze_texts
+    from backend.supplier_index import SupplierIndex
+    from backend.intent_router import classify
+    from backend.risk_scoring import score
+    from backend.propagation import propagate
+    from backend.benchmarks.synthetic import supplier_rows, scoring_inputs, supply_graph
+
+    fetched = []
+    for _ in range(args.iterations):
+        with rec.measure("fetch") as sample:
+            fetched = fetch_all_news()["articles"]
+            sample["items"] = len(fetched)
+
+    kept = fetched
+    for _ in range(args.iterations):
+        with rec.measure("dedup", len(fetched)):
+            kept, _ = dedup_articles(fetched)
+
+    texts = [a["text"] for a in kept]
+    for _ in range(args.iterations):
+        with rec.measure("analyze", len(texts)):
+            analyze_texts(texts, batch_size=args.llm_batch, use_cache=False)
+
+    rows = supplier_rows(graph)
+    index = None
+    for _ in range(args.iterations):
+        with rec.measure("supplier_index_build", len(rows)):
+            index = SupplierIndex(rows)
+
+    for _ in range(args.iterations):
+        for article in articles:
+            with rec.measure("entity_resolve"):
+                index.resolve_all(article["entities"])
+            with rec.measure("supplier_in_text"):
+                index.find_name_in_text(article["title"])
+
+    names = [s["name"] for s in graph["suppliers"][:len(SAMPLE_MESSAGES)]]
+    messages = [(m.format(name=n), "{name}" in m) for m, n in zip(SAMPLE_MESSAGES, names)]
+    for _ in range(args.iterations):
+        for message, has_supplier in messages:
+            with rec.measure("intent_classify"):
+                classify(message, has_supplier=has_supplier)
+
+    inputs = scoring_inputs(graph)
+    for _ in range(args.iterations):
+        with rec.measure("risk_scoring", inputs.n_suppliers):
+            score(inputs)
+
+    network = supply_graph(graph)
+    for _ in range(args.iterations):
+        with rec.measure("propagation", network.n_nodes):
+            propagate(network)
+
+    return [message for message, _ in messages]
+
+
+def run_neo4j(rec, graph, messages, args):
+    from backend.ingest_news import ingest_all
+    from backend.risk_engine import update_all_risks_and_alerts, update_changed_risks_and_alerts
+    from backend.benchmarks.synthetic import load_into_neo4j
+    from backend import langgraph_agent_reference as agent
+    from backend.response_cache import response_cache, intent_cache
+
+    with rec.measure("neo4j_load", len(graph["suppliers"]) + len(graph["events"])):
+        load_into_neo4j(graph)
+
+    for _ in range(args.iterations):
+        with rec.measure("ingest_all") as sample:
+            sample["items"] = len(ingest_all())
+
+    for _ in range(args.sweep_iterations):
+        with rec.measure("risk_sweep_legacy", len(graph["suppliers"])):
+            update_all_risks_and_alerts()
+        with rec.measure("risk_sweep_batch", len(graph["suppliers"])):
+            update_changed_risks_and_alerts(full=True)
+        with rec.measure("risk_sweep_incremental"):
+            update_changed_risks_and_alerts()
+
+    names = [s["name"] for s in graph["suppliers"][:5]]
+    ids = [s["id"] for s in graph["suppliers"][:5]]
+    mcp_calls = [
+        ("graph.top_risky_suppliers", lambda n, i: agent.graph_mcp.top_risky_suppliers(5)),
+        ("graph.latest_supplier_events", lambda n, i: agent.graph_mcp.latest_supplier_events(n)),
+        ("graph.supplier_risk_summary", lambda n, i: agent.graph_mcp.supplier_risk_summary(n)),
+        ("graph.top_severe_events", lambda n, i: agent.graph_mcp.top_severe_events("India")),
+        ("risk.supplier_risk_report", lambda n, i: agent.risk_mcp.supplier_risk_report(n)),
+        ("risk.risk_report_for_id", lambda n, i: agent.risk_mcp.risk_report_for_id(i)),
+        ("risk.top_risky_suppliers", lambda n, i: agent.risk_mcp.top_risky_suppliers(5)),
+    ]
+    for _ in range(args.iterations):
+        for name, supplier_id in zip(names, ids):
+            for stage, call in mcp_calls:
+                with rec.measure(f"mcp.{stage}"):
+                    call(name, supplier_id)
+
+    # DATA_UPDATE messages would write; only benchmark the read intents
+    read_messages = [m for m in messages if not m.startswith("Add supplier")]
+    for _ in range(args.iterations):
+        for message in read_messages:
+            response_cache.clear()
+            intent_cache.clear()
+            with rec.measure("agent_answer"):
+                agent.run_agent(message)
+            with rec.measure("agent_cached"):
+                agent.run_agent(message)
+
+
+def run_embedded(rec, graph, args):
+    """The MCP query surface against an in-process EmbeddedGraph."""
+    from backend.storage.embedded import EmbeddedGraph
+    from backend.storage.mcp import EmbeddedGraphMCP, EmbeddedRiskMCP
+
+    store = EmbeddedGraph()
+    with rec.measure("embedded_load", len(graph["suppliers"]) + len(graph["events"])):
+        store.bulk_load(graph["suppliers"], graph["events"], graph["affects"], graph["supplies_to"])
+
+    graph_mcp, risk_mcp = EmbeddedGraphMCP(store), EmbeddedRiskMCP(store)
+    names = [s["name"] for s in graph["suppliers"][:5]]
+    ids = [s["id"] for s in graph["suppliers"][:5]]
+    calls = [
+        ("graph.top_risky_suppliers", lambda n, i: graph_mcp.top_risky_suppliers(5)),
+        ("graph.latest_supplier_events", lambda n, i: graph_mcp.latest_supplier_events(n)),
+        ("graph.supplier_risk_summary", lambda n, i: graph_mcp.supplier_risk_summary(n)),
+        ("graph.top_severe_events", lambda n, i: graph_mcp.top_severe_events("India")),
+        ("graph.get_all_suppliers", lambda n, i: graph_mcp.get_all_suppliers()),
+        ("risk.supplier_risk_report", lambda n, i: risk_mcp.supplier_risk_report(n)),
+        ("risk.top_risky_suppliers", lambda n, i: risk_mcp.top_risky_suppliers(5)),
+    ]
+    for _ in range(args.iterations):
+        for name, supplier_id in zip(names, ids):
+            for stage, call in calls:
+                with rec.measure(f"embedded.{stage}"):
+                    call(name, supplier_id)
+
+
+def compare(stages, baseline, tolerance):
+    """Stages whose p95 grew by more than `tolerance` over the baseline."""
+    regressions = []
+    for stage, current in stages.items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before.get("p95_ms"):
+            continue
+        ratio = current["p95_ms"] / before["p95_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append({
+                "stage": stage,
+                "baseline_p95_ms": before["p95_ms"],
+                "p95_ms": current["p95_ms"],
+                "ratio": round(ratio, 2)
+            })
+    return regressions
+
+
+def run(args):
+    # The LLM clients are built at import time and want a key
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+
+    from backend import ai_utils
+    from backend import langgraph_agent_reference as agent
+    from backend.llm_cache import analysis_cache
+    from backend.benchmarks.synthetic import generate_graph, generate_articles, clear_synthetic
+    from backend.benchmarks.fake_llm import FakeGroq
+    from backend.benchmarks.news_server import NewsServer, use_news_server
+    from backend.ingest_news import event_id_for
+
+    graph = generate_graph(
+        n_suppliers=args.suppliers,
+        n_events=args.events,
+        supplies_to_degree=args.degree,
+        seed=args.seed
+    )
+    articles = generate_articles(graph, n_articles=args.articles, seed=args.seed)
+
+    fake = FakeGroq(
+        latency=args.llm_latency,
+        jitter=args.llm_jitter,
+        entities={a["text"]: a["entities"] for a in articles},
+        seed=args.seed
+    )
+    ai_utils.set_llm_client(fake)
+    agent.client = fake
+    analysis_cache.bypass = True
+
+    server = NewsServer(articles, latency=args.news_latency).start()
+    use_news_server(server)
+
+    rec = StageRecorder()
+    log = sys.stdout if args.verbose else io.StringIO()
+    started = time.time()
+    try:
+        with redirect_stdout(log):
+            messages = run_offline(rec, graph, articles, args)
+            if args.embedded:
+                run_embedded(rec, graph, args)
+            if args.neo4j:
+                try:
+                    run_neo4j(rec, graph, messages, args)
+                finally:
+                    if not args.keep:
+                        clear_synthetic(event_ids={event_id_for(a) for a in articles})
+    finally:
+        server.stop()
+
+    return {
+        "meta": {
+            "version": code_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": started,
+            "elapsed_s": round(time.time() - started, 2),
+            "params": vars(args),
+            "graph": {k: len(v) for k, v in graph.items()},
+        },
+        "stages": rec.summary(),
+        "llm": fake.stats(),
+        "news_requests": server.requests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of the ingest, risk and agent paths")
+    parser.add_argument("--suppliers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--degree", type=int, default=3, help="SUPPLIES_TO edges per supplier")
+    parser.add_argument("--articles", type=int, default=200, help="articles served by the news stand-in")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--sweep-iterations", type=int, default=2, help="risk sweeps (with --neo4j)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.0)
+    parser.add_argument("--llm-batch", type=int, default=1, help="articles per analysis prompt")
+    parser.add_argument("--news-latency", type=float, default=0.02, help="seconds per news HTTP request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--neo4j", action="store_true", help="also run Neo4j-bound stages against NEO4J_URI")
+    parser.add_argument("--embedded", action="store_true", help="also time MCP queries on the embedded graph backend")
+    parser.add_argument("--keep", action="store_true", help="keep synthetic data in Neo4j afterwards")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report; exit 1 if any stage's p95 regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth vs baseline")
+    parser.add_argument("--verbose", action="store_true", help="show pipeline logging")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report["stages"], json.load(f), args.tolerance)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        for stage, s in report["stages"].items():
+            print(f"⏱ {stage}: p50 {s['p50_ms']} ms, p95 {s['p95_ms']} ms, p99 {s['p99_ms']} ms, {s['items_per_s']} items/s")
+        print(f"📄 Report written to {args.out}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    for r in report.get("regressions", []):
+        print(f"✘ {r['stage']}: p95 {r['baseline_p95_ms']} → {r['p95_ms']} ms (x{r['ratio']})", file=sys.stderr)
+    sys.exit(1 if report.get("regressions") else 0)
@@ -0,0 +1,250 @@
+import time
+import random
+
+from backend.utils.neo4j_pool import get_session, execute_write
+from backend.aggregates import refresh_supplier_aggregates
+
+
+# ====================================
+# Synthetic supply graph
+# ====================================
+# Everything generated here is tagged `bench: true` with BENCH_ ids so
+# it can be removed again with clear_synthetic().
+ID_PREFIX = "BENCH_"
+
+SYLLABLES = ["ka", "ro", "vi", "ta", "lo", "me", "su", "na", "pe", "zo", "ri", "da", "mu", "le", "xo", "fa"]
+SECTORS = ["Foods", "Agro", "Packaging", "Chemicals", "Logistics", "Dairy", "Oils", "Beverages"]
+COUNTRIES = ["India", "China", "Vietnam", "Indonesia", "Brazil", "Germany", "USA", "Kenya"]
+EVENT_TYPES = ["strike", "flood", "fire", "regulation", "cyberattack", "port closure"]
+SOURCES = ["NewsAPI", "GoogleNewsRSS", "GDELT"]
+
+
+def _word(i):
+    """Unique pronounceable word for every i (base-16 over SYLLABLES)."""
+    parts = []
+    i += len(SYLLABLES)  # at least two syllables
+    while i:
+        i, digit = divmod(i, len(SYLLABLES))
+        parts.append(SYLLABLES[digit])
+    return "".join(reversed(parts)).capitalize()
+
+
+def generate_graph(n_suppliers=1000, n_events=5000, aliases_per_supplier=2,
+                   supplies_to_degree=3, max_suppliers_per_event=3, days=365, seed=0):
+    """
+    Build a deterministic synthetic graph as plain dicts:
+
+        {"suppliers": [{id, name, aliases, country, risk}],
+         "events": [{id, summary, severity, type, source, ingested_at}],
+         "affects": [(event_id, supplier_id)],
+         "supplies_to": [(upstream_id, downstream_id)]}
+
+    SUPPLIES_TO only points from lower to higher supplier numbers, so
+    the supply graph is a DAG. `ingested_at` is epoch seconds spread
+    over the last `days` days.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+
+    suppliers = []
+    for i in range(n_suppliers):
+        word = _word(i)
+        sector = SECTORS[i % len(SECTORS)]
+        aliases = [word, f"{word} {sector[:3]}", f"{word} Group"][:aliases_per_supplier]
+        suppliers.append({
+            "id": f"{ID_PREFIX}S{i}",
+            "name": f"{word} {sector} Ltd",
+            "aliases": aliases,
+            "country": COUNTRIES[i % len(COUNTRIES)],
+            "risk": round(rng.random(), 3)
+        })
+
+    events = []
+    affects = []
+    for i in range(n_events):
+        targets = rng.sample(suppliers, min(n_suppliers, rng.randint(1, max_suppliers_per_event)))
+        event_type = rng.choice(EVENT_TYPES)
+        events.append({
+            "id": f"{ID_PREFIX}E{i}",
+            "summary": f"{event_type.capitalize()} disrupts {targets[0]['name']}",
+            "severity": round(rng.random(), 3),
+            "type": event_type,
+            "source": rng.choice(SOURCES),
+            "ingested_at": now - rng.random() * days * 86400
+        })
+        affects.extend((events[-1]["id"], s["id"]) for s in targets)
+
+    supplies_to = []
+    for i in range(n_suppliers - 1):
+        for j in rng.sample(range(i + 1, n_suppliers), min(supplies_to_degree, n_suppliers - 1 - i)):
+            supplies_to.append((suppliers[i]["id"], suppliers[j]["id"]))
+
+    return {"suppliers": suppliers, "events": events, "affects": affects, "supplies_to": supplies_to}
+
+
+def generate_articles(graph, n_articles=200, duplicate_rate=0.2, seed=0):
+    """
+    News articles about random suppliers, shaped like the fetchers'
+    output plus the `entities` the LLM stand-in should extract. About
+    `duplicate_rate` of them are syndicated copies (same story, new URL).
+    """
+    rng = random.Random(seed)
+    articles = []
+
+    for i in range(n_articles):
+        if articles and rng.random() < duplicate_rate:
+            original = rng.choice(articles)
+            articles.append({**original, "url": f"{original['url']}?utm_source=syndicated{i}"})
+            continue
+
+        supplier = rng.choice(graph["suppliers"])
+        mention = rng.choice([supplier["name"], *supplier["aliases"]])
+        event_type = rng.choice(EVENT_TYPES)
+        articles.append({
+            "title": f"{event_type.capitalize()} hits {mention} operations in {supplier['country']}",
+            "text": (
+                f"Story {i}: a {event_type} has disrupted production at {mention}, "
+                f"a {supplier['country']} supplier. Shipments to downstream "
+                f"manufacturers are expected to slip by {rng.randint(2, 30)} days."
+            ),
+            "source": "BenchWire",
+            "url": f"https://bench.local/news/{i}",
+            "entities": [mention]
+        })
+
+    return articles
+
+
+# ====================================
+# In-memory views (no Neo4j needed)
+# ====================================
+def supplier_rows(graph):
+    """Rows in the shape of GraphMCP.get_all_suppliers (for SupplierIndex)."""
+    return [{"id": s["id"], "name": s["name"], "aliases": s["aliases"]} for s in graph["suppliers"]]
+
+
+def scoring_inputs(graph):
+    from backend.risk_scoring import ScoringInputs
+
+    index = {s["id"]: i for i, s in enumerate(graph["suppliers"])}
+    events = {e["id"]: e for e in graph["events"]}
+    rows = [(index[sid], events[eid]) for eid, sid in graph["affects"]]
+
+    return ScoringInputs(
+        supplier_ids=[s["id"] for s in graph["suppliers"]],
+        base=[s["risk"] for s in graph["suppliers"]],
+        owner=[i for i, _ in rows],
+        severity=[e["severity"] for _, e in rows],
+        ingested_at=[e["ingested_at"] for _, e in rows],
+        sources=[e["source"] for _, e in rows],
+        types=[e["type"] for _, e in rows],
+    )
+
+
+def supply_graph(graph):
+    from backend.propagation import SupplyGraph
+
+    index = {s["id"]: i for i, s in enumerate(graph["suppliers"])}
+    return SupplyGraph(
+        node_ids=[s["id"] for s in graph["suppliers"]],
+        seed=[s["risk"] for s in graph["suppliers"]],
+        src=[index[a] for a, _ in graph["supplies_to"]],
+        dst=[index[b] for _, b in graph["supplies_to"]],
+    )
+
+
+# ====================================
+# Neo4j load / cleanup
+# ====================================
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _load_suppliers(tx, rows):
+    tx.run("""
+        UNWIND $rows AS row
+        MERGE (s:Supplier {id: row.id})
+        SET s.name = row.name,
+            s.name_norm = toLower(trim(row.name)),
+            s.aliases = row.aliases,
+            s.country = row.country,
+            s.risk = row.risk,
+            s.bench = true,
+            s.created_at = coalesce(s.created_at, datetime()),
+            s.risk_touched_at = datetime()
+    """, rows=rows)
+
+
+def _load_events(tx, rows):
+    tx.run("""
+        UNWIND $rows AS row
+        MERGE (e:RiskEvent {id: row.id})
+        SET e.summary = row.summary,
+            e.severity = row.severity,
+            e.type = row.type,
+            e.source = row.source,
+            e.ingested_at = datetime({epochMillis: toInteger(row.ingested_at * 1000)}),
+            e.bench = true
+    """, rows=rows)
+
+
+def _load_edges(tx, label, rel, rows):
+    # label / rel are our own constants, never user input
+    tx.run(f"""
+        UNWIND $rows AS row
+        MATCH (a:{label} {{id: row[0]}}), (b:Supplier {{id: row[1]}})
+        MERGE (a)-[:{rel}]->(b)
+    """, rows=rows)
+
+
+def load_into_neo4j(graph, batch_size=5000):
+    """
+    Write a generated graph to the configured Neo4j and fill in the
+    supplier aggregates. Point NEO4J_URI at a scratch database.
+    Returns per-step timings in ms.
+    """
+    timings = {}
+
+    def step(name, fn, rows):
+        started = time.perf_counter()
+        for chunk in _chunks(rows, batch_size):
+            execute_write(fn, chunk)
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    step("suppliers_ms", _load_suppliers, graph["suppliers"])
+    step("events_ms", _load_events, graph["events"])
+    step("affects_ms", lambda tx, rows: _load_edges(tx, "RiskEvent", "AFFECTS", rows), [list(r) for r in graph["affects"]])
+    step("supplies_to_ms", lambda tx, rows: _load_edges(tx, "Supplier", "SUPPLIES_TO", rows), [list(r) for r in graph["supplies_to"]])
+    step("aggregates_ms", refresh_supplier_aggregates, [s["id"] for s in graph["suppliers"]])
+
+    return timings
+
+
+def clear_synthetic(event_ids=(), batch_size=10000):
+    """
+    Remove benchmark nodes and their alerts. `event_ids` adds RiskEvents
+    created by ingesting stand-in news (they are not tagged).
+    """
+    with get_session() as session:
+        if event_ids:
+            session.run("""
+                UNWIND $ids AS id
+                MATCH (e:RiskEvent {id: id})
+                DETACH DELETE e
+            """, ids=list(event_ids))
+        session.run("""
+            MATCH (a:Alert)
+            WHERE a.supplier_id STARTS WITH $prefix
+            DELETE a
+        """, prefix=ID_PREFIX)
+        for label in ("RiskEvent", "Supplier"):
+            while True:
+                deleted = session.run(f"""
+                    MATCH (n:{label} {{bench: true}})
+                    WITH n LIMIT $batch
+                    DETACH DELETE n
+                    RETURN count(*) AS deleted
+                """, batch=batch_size).single()["deleted"]
+                if not deleted:
+                    break
@@ -0,0 +1,37 @@
+import os
+import time
+import threading
+
+from backend.storage import get_graph
+
+
+# Seconds a worker trusts its last read of the version before asking
+# the graph again. Bumps from this process are visible immediately.
+DATA_VERSION_POLL = float(os.getenv("DATA_VERSION_POLL", "2"))
+
+_version = None
+_read_at = 0.0
+_lock = threading.Lock()
+
+
+def _store(version):
+    global _version, _read_at
+    with _lock:
+        _version = version
+        _read_at = time.monotonic()
+    return version
+
+
+def bump_data_version():
+    """
+    Record that graph data changed (ingest, risk recompute, supplier
+    edits). Anything cached against an older version is stale.
+    """
+    return _store(get_graph().bump_version())
+
+
+def current_data_version():
+    if _version is not None and time.monotonic() - _read_at < DATA_VERSION_POLL:
+        return _version
+
+    return _store(get_graph().current_version())
@@ -0,0 +1,136 @@
+import os
+import re
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# ====================================
+# Settings
+# ====================================
+# Max differing SimHash bits for two articles to count as near-duplicates
+SIMHASH_THRESHOLD = int(os.getenv("DEDUP_SIMHASH_THRESHOLD", "3"))
+SIMHASH_BITS = 64
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid", "ref", "oc"}
+
+
+# ====================================
+# URL Canonicalization
+# ====================================
+def canonical_url(url):
+    """
+    Normalize a URL so syndicated copies of the same link compare equal:
+    lowercased host without www, no fragment, no tracking params,
+    sorted query string, no trailing slash.
+    """
+    if not url:
+        return None
+
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+# ====================================
+# SimHash
+# ====================================
+def _tokens(text):
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text):
+    """
+    64-bit SimHash over word bigrams (unigrams for one-word texts).
+    None for text without any tokens: there is nothing to compare.
+    """
+    words = _tokens(text)
+    features = [" ".join(pair) for pair in zip(words, words[1:])] or words
+    if not features:
+        return None
+
+    # Column-wise majority vote over the feature hashes' bit strings
+    rows = [format(_feature_hash(f), "064b") for f in features]
+    bits = "".join("1" if column.count("1") * 2 > len(rows) else "0" for column in zip(*rows))
+    return int(bits, 2)
+
+
+def _bands(fingerprint, n_bands):
+    """
+    Split a fingerprint into n_bands bit ranges. Two fingerprints at
+    Hamming distance < n_bands must agree on at least one band, so
+    bucketing by band finds every candidate pair without all-pairs.
+    """
+    width = -(-SIMHASH_BITS // n_bands)
+    mask = (1 << width) - 1
+    return [(i, fingerprint >> (i * width) & mask) for i in range(n_bands)]
+
+
+# ====================================
+# Dedup Stage
+# ====================================
+def dedup_articles(articles, threshold=SIMHASH_THRESHOLD):
+    """
+    Drop exact (canonical URL) and near (title + text SimHash) duplicates,
+    keeping the first occurrence. Articles without any title/text tokens
+    are only deduplicated by URL. Returns (kept_articles, report).
+    """
+    kept = []
+    seen_urls = set()
+    buckets = {}
+    url_dupes = 0
+    near_dupes = 0
+
+    n_bands = threshold + 1
+
+    for art in articles:
+        url = canonical_url(art.get("url"))
+        if url and url in seen_urls:
+            url_dupes += 1
+            continue
+
+        fingerprint = simhash(f"{art.get('title') or ''} {art.get('text') or ''}")
+        if fingerprint is None:
+            if url:
+                seen_urls.add(url)
+            kept.append(art)
+            continue
+
+        bands = _bands(fingerprint, n_bands)
+
+        candidates = set()
+        for band in bands:
+            candidates.update(buckets.get(band, ()))
+
+        if any(bin(fingerprint ^ other).count("1") <= threshold for other in candidates):
+            near_dupes += 1
+            continue
+
+        if url:
+            seen_urls.add(url)
+        for band in bands:
+            buckets.setdefault(band, set()).add(fingerprint)
+        kept.append(art)
+
+    report = {
+        "input": len(articles),
+        "url_duplicates": url_dupes,
+        "near_duplicates": near_dupes,
+        "kept": len(kept)
+    }
+    return kept, report
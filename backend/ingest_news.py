@@ -1,9 +1,11 @@
 import os
-import datetime
+import time
+import hashlib
 import requests
 import feedparser
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
 
 
 
@@ -17,20 +19,18 @@ print("Loading .env from:", env_path)
 load_dotenv(env_path)
 
 
-from backend.ai_utils import analyze_text
-
-
-# ====================================
-# Neo4j Connection
-# ====================================
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-
-driver = GraphDatabase.driver(
-    NEO4J_URI,
-    auth=(NEO4J_USER, NEO4J_PASSWORD)
+from backend.ai_utils import analyze_texts
+from backend.dedup import dedup_articles, canonical_url
+from backend.llm_cache import normalize_text
+from backend.supplier_index import get_supplier_index
+from backend.storage import get_graph
+from backend.data_version import bump_data_version
+from backend.jobs import NullProgress
+from backend import metrics
+from backend.aggregates import (
+    ON_LINK_AGGREGATES, SET_SEVERITY_AVG, refresh_event_suppliers, refresh_supplier_aggregates
 )
+from backend.risk_engine import mark_suppliers_touched
 
 
 # ====================================
@@ -47,21 +47,66 @@ FMCG_KEYWORDS = [
 ]
 
 
+# ====================================
+# Shared HTTP session + per-source limits
+# ====================================
+# Base URLs are overridable so the fetchers can run against a local
+# HTTP stand-in.
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2/everything")
+GOOGLE_NEWS_RSS_URL = os.getenv("GOOGLE_NEWS_RSS_URL", "https://news.google.com/rss/search")
+GDELT_URL = os.getenv("GDELT_URL", "https://api.gdeltproject.org/api/v2/doc/doc")
+
+# Seconds per HTTP call / max in-flight calls, per source
+SOURCE_TIMEOUTS = {
+    "newsapi": float(os.getenv("NEWSAPI_TIMEOUT", "10")),
+    "google_rss": float(os.getenv("GOOGLE_RSS_TIMEOUT", "10")),
+    "gdelt": float(os.getenv("GDELT_TIMEOUT", "15")),
+}
+SOURCE_CONCURRENCY = {
+    "newsapi": int(os.getenv("NEWSAPI_CONCURRENCY", "4")),
+    "google_rss": int(os.getenv("GOOGLE_RSS_CONCURRENCY", "4")),
+    "gdelt": 1,
+}
+
+http = requests.Session()
+http.mount("http://", HTTPAdapter(pool_maxsize=sum(SOURCE_CONCURRENCY.values())))
+http.mount("https://", HTTPAdapter(pool_maxsize=sum(SOURCE_CONCURRENCY.values())))
+
+
+def fetch_many(source, fn, items):
+    """
+    Run fn(item) for every item on a pool bounded by the source's
+    concurrency limit. A failing item is logged and skipped; results
+    keep the order of `items`. Returns (results, failures) with one
+    "item: error" string per failed item.
+    """
+    results = []
+    failures = []
+
+    with ThreadPoolExecutor(max_workers=SOURCE_CONCURRENCY[source]) as pool:
+        futures = [pool.submit(fn, item) for item in items]
+        for item, future in zip(items, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                failures.append(f"{item}: {e}")
+                print(f"⚠ {source} error for {item!r}:", e)
+
+    return results, failures
+
+
 # ====================================
 # 1️⃣ Fetch from NewsAPI
 # ====================================
 def fetch_news_from_newsapi():
     print("\n📰 Fetching NewsAPI articles...")
-    url = "https://newsapi.org/v2/everything"
     NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 
-    articles = []
-
     if not NEWSAPI_KEY:
         print("⚠ NEWSAPI_KEY missing in .env — skipping NewsAPI.")
-        return articles
+        return [], []
 
-    for keyword in FMCG_KEYWORDS:
+    def fetch_keyword(keyword):
         params = {
             "q": keyword,
             "language": "en",
@@ -70,49 +115,65 @@ def fetch_news_from_newsapi():
             "apiKey": NEWSAPI_KEY
         }
 
-        response = requests.get(url, params=params)
+        response = http.get(NEWSAPI_URL, params=params, timeout=SOURCE_TIMEOUTS["newsapi"])
         data = response.json()
 
-        if "articles" in data:
-            for art in data["articles"]:
-                articles.append({
-                    "title": art["title"],
-                    "text": art["description"] or art["content"] or "",
-                    "source": art["source"]["name"]
-                })
+        return [
+            {
+                "title": art["title"],
+                "text": art["description"] or art["content"] or "",
+                "source": art["source"]["name"],
+                "url": art.get("url")
+            }
+            for art in data.get("articles", [])
+        ]
+
+    articles, failures = fetch_many("newsapi", fetch_keyword, FMCG_KEYWORDS)
 
     print(f"✔ NewsAPI returned {len(articles)} articles.")
-    return articles
+    return articles, failures
 
 
 # ====================================
 # 2️⃣ Fetch from Google News RSS
 # ====================================
+GOOGLE_RSS_QUERIES = [
+    "FMCG India",
+    "Hindustan Unilever",
+    "ITC Limited",
+    "Nestle India",
+    "Britannia",
+    "Dabur",
+    "Marico"
+]
+
+
 def fetch_google_news_rss():
     print("\n📰 Fetching Google News RSS articles...")
-    rss_urls = [
-        "https://news.google.com/rss/search?q=FMCG+India",
-        "https://news.google.com/rss/search?q=Hindustan+Unilever",
-        "https://news.google.com/rss/search?q=ITC+Limited",
-        "https://news.google.com/rss/search?q=Nestle+India",
-        "https://news.google.com/rss/search?q=Britannia",
-        "https://news.google.com/rss/search?q=Dabur",
-        "https://news.google.com/rss/search?q=Marico"
-    ]
-
-    articles = []
 
-    for url in rss_urls:
-        feed = feedparser.parse(url)
-        for entry in feed.entries[:5]:
-            articles.append({
+    def fetch_feed(query):
+        response = http.get(
+            GOOGLE_NEWS_RSS_URL,
+            params={"q": query},
+            timeout=SOURCE_TIMEOUTS["google_rss"]
+        )
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+
+        return [
+            {
                 "title": entry.title,
                 "text": entry.summary,
-                "source": "GoogleNewsRSS"
-            })
+                "source": "GoogleNewsRSS",
+                "url": entry.get("link")
+            }
+            for entry in feed.entries[:5]
+        ]
+
+    articles, failures = fetch_many("google_rss", fetch_feed, GOOGLE_RSS_QUERIES)
 
     print(f"✔ Google RSS returned {len(articles)} articles.")
-    return articles
+    return articles, failures
 
 
 # ====================================
@@ -120,8 +181,6 @@ def fetch_google_news_rss():
 # ====================================
 def fetch_gdelt_news():
     print("\n📰 Fetching GDELT articles...")
-    
-    url = "https://api.gdeltproject.org/api/v2/doc/doc"
 
     params = {
         "query": " OR ".join(FMCG_KEYWORDS),
@@ -130,9 +189,10 @@ def fetch_gdelt_news():
     }
 
     articles = []
+    failures = []
 
     try:
-        response = requests.get(url, params=params)
+        response = http.get(GDELT_URL, params=params, timeout=SOURCE_TIMEOUTS["gdelt"])
         data = response.json()
 
         if "articles" in data:
@@ -140,85 +200,214 @@ def fetch_gdelt_news():
                 articles.append({
                     "title": art.get("title"),
                     "text": art.get("documentidentifier", ""),
-                    "source": "GDELT"
+                    "source": "GDELT",
+                    "url": art.get("url") or art.get("documentidentifier")
                 })
 
     except Exception as e:
+        failures.append(str(e))
         print("⚠ GDELT error:", e)
 
     print(f"✔ GDELT returned {len(articles)} articles.")
-    return articles
+    return articles, failures
 
 
 # ====================================
-# Combine All Real News
+# Combine All Real News (concurrently)
 # ====================================
-def get_all_real_news():
+# Each source returns (articles, failures): the articles it did get and
+# one message per request that failed
+NEWS_SOURCES = [
+    ("newsapi", fetch_news_from_newsapi),
+    ("google_rss", fetch_google_news_rss),
+    ("gdelt", fetch_gdelt_news),
+]
+
+
+def fetch_all_news():
+    """
+    Fetch every source at once. Returns
+    {"articles": [...], "sources": {name: {"articles", "ms", "failed", "error"}}}
+    with articles in source order. `failed` counts the source's failed
+    requests and `error` joins their messages; a failing source yields
+    no articles but does not stop the others.
+    """
+    def timed(name, fn):
+        started = time.perf_counter()
+        try:
+            with metrics.timed(f"fetch.{name}"):
+                articles, failures = fn()
+                if failures:
+                    # Partial failures do not raise, so count them here
+                    metrics.record_stage_error(f"fetch.{name}")
+                return articles, failures, time.perf_counter() - started
+        except Exception as e:
+            return [], [str(e)], time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=len(NEWS_SOURCES)) as pool:
+        futures = [(name, pool.submit(timed, name, fn)) for name, fn in NEWS_SOURCES]
+
     news = []
-    news.extend(fetch_news_from_newsapi())
-    news.extend(fetch_google_news_rss())
-    news.extend(fetch_gdelt_news())
+    sources = {}
+    for name, future in futures:
+        articles, failures, elapsed = future.result()
+        news.extend(articles)
+        sources[name] = {
+            "articles": len(articles),
+            "ms": round(elapsed * 1000, 2),
+            "failed": len(failures),
+            "error": "; ".join(failures) or None
+        }
+
+    return {"articles": news, "sources": sources}
 
+
+def get_all_real_news():
+    fetched = fetch_all_news()
+    news = fetched["articles"]
+
+    for name, stats in fetched["sources"].items():
+        failed = f", {stats['failed']} failed requests" if stats["failed"] else ""
+        print(f"⏱ {name}: {stats['articles']} articles in {stats['ms']} ms{failed}")
     print(f"\n🔎 Total collected articles: {len(news)}")
     return news
 
 
 # ====================================
-# Create Supplier Relationships
+# Bulk Event Writer
 # ====================================
-def link_entities(tx, event_id, entities):
-    for ent in entities:
-        tx.run("""
-            MATCH (s:Supplier)
-            WHERE toLower(s.name) CONTAINS toLower($ent)
-               OR any(alias IN s.aliases WHERE toLower(alias) CONTAINS toLower($ent))
-            MATCH (e:RiskEvent {id:$event_id})
-            MERGE (e)-[:AFFECTS]->(s)
-        """, ent=ent, event_id=event_id)
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+
+
+def event_id_for(article):
+    """
+    Stable event id derived from the article's content, so re-ingesting
+    the same story updates one RiskEvent instead of creating another.
+    """
+    basis = canonical_url(article.get("url")) or normalize_text(
+        f"{article.get('title') or ''} {article.get('text') or ''}"
+    )
+    return "EVT_" + hashlib.sha1(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def write_events_batch(tx, events):
+    """
+    Upsert a batch of RiskEvents and their AFFECTS links. `ingested_at`
+    keeps the first ingest time. Each event ends up linked to exactly its
+    `supplier_ids` (when given): links to suppliers it no longer resolves
+    to are removed and those suppliers' aggregates refreshed. New links are
+    folded into supplier aggregates; suppliers of events whose severity
+    changed are refreshed.
+    """
+    changed = [r["id"] for r in tx.run("""
+        UNWIND $events AS ev
+        MERGE (e:RiskEvent {id: ev.id})
+        WITH e, ev, e.severity AS old_severity
+        SET e.summary = ev.summary,
+            e.sentiment = ev.sentiment,
+            e.sentiment_score = ev.sentiment_score,
+            e.severity = ev.severity,
+            e.source = ev.source,
+            e.ingested_at = coalesce(e.ingested_at, datetime())
+        WITH e, old_severity
+        WHERE old_severity IS NOT NULL AND old_severity <> e.severity
+        RETURN e.id AS id
+    """, events=events)]
+
+    unlinked = [r["id"] for r in tx.run("""
+        UNWIND $events AS ev
+        MATCH (:RiskEvent {id: ev.id})-[r:AFFECTS]->(s:Supplier)
+        WHERE ev.supplier_ids IS NOT NULL AND NOT s.id IN ev.supplier_ids
+        DELETE r
+        SET s.risk_touched_at = datetime()
+        RETURN DISTINCT s.id AS id
+    """, events=events)]
+    if unlinked:
+        refresh_supplier_aggregates(tx, unlinked)
+
+    tx.run(f"""
+        UNWIND $events AS ev
+        MATCH (e:RiskEvent {{id: ev.id}})
+        UNWIND ev.supplier_ids AS sid
+        MATCH (s:Supplier {{id: sid}})
+        MERGE (e)-[r:AFFECTS]->(s)
+        ON CREATE SET r.linked_at = datetime(),
+                      s.risk_touched_at = datetime(),
+                      {ON_LINK_AGGREGATES}
+        {SET_SEVERITY_AVG}
+    """, events=[ev for ev in events if ev["supplier_ids"]])
+
+    if changed:
+        mark_suppliers_touched(tx, refresh_event_suppliers(tx, changed))
+
+
+def write_events(events):
+    """Upsert and link events through the configured graph backend."""
+    get_graph().upsert_events(events)
 
 
 # ====================================
 # Ingest Pipeline
 # ====================================
-def ingest_all():
-    articles = get_all_real_news()
-    events_created = []
-
-    for art in articles:
-        print(f"\n🔍 Processing article: {art['title']}")
-
-        # Run LLM
-        analysis = analyze_text(art["text"])
-        print("Raw LLM Output:", analysis)
-
-        entities = analysis.get("entities", [])
-        severity = analysis.get("severity", 0.3)
-
-        # Generate event ID
-        event_id = f"EVT_{int(datetime.datetime.utcnow().timestamp())}"
-
-        # Store in Neo4j
-        with driver.session() as session:
-            session.run("""
-                MERGE (e:RiskEvent {id:$id})
-                SET e.summary=$summary,
-                    e.sentiment=$sentiment,
-                    e.sentiment_score=$sentiment_score,
-                    e.severity=$severity,
-                    e.source=$source,
-                    e.ingested_at=datetime()
-            """,
-            id=event_id,
-            summary=analysis["summary"],
-            sentiment=analysis["sentiment"],
-            sentiment_score=analysis["sentiment_score"],
-            severity=severity,
-            source=art["source"])
-
-            session.execute_write(link_entities, event_id, entities)
-
-        events_created.append({"id": event_id, "entities": entities})
-        print(f"✔ Event {event_id} created with entities: {entities}")
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "1"))
+
+
+def ingest_all(progress=None):
+    """
+    Fetch, dedup, analyze and store news. `progress` (see backend.jobs)
+    receives per-stage timings and article counts.
+    """
+    progress = progress or NullProgress()
+
+    with progress.stage("fetch"):
+        articles = get_all_real_news()
+    progress.count("fetched", len(articles))
+
+    # Drop syndicated copies before paying for LLM analysis
+    with progress.stage("dedup"):
+        articles, dedup_report = dedup_articles(articles)
+    print(f"🧹 Dedup: {dedup_report}")
+    progress.count("deduplicated", len(articles))
+
+    # Run LLM (concurrently / packed, results in article order)
+    with progress.stage("analyze"):
+        analyses = analyze_texts([art["text"] for art in articles], batch_size=LLM_BATCH_SIZE)
+    progress.count("analyzed", len(analyses))
+
+    with progress.stage("write"):
+        # Suppliers may have changed since the last run
+        index = get_supplier_index(refresh=True)
+
+        events = {}
+        for art, analysis in zip(articles, analyses):
+            print(f"\n🔍 Processing article: {art['title']}")
+            print("Raw LLM Output:", analysis)
+
+            event_id = event_id_for(art)
+            entities = [e for e in analysis.get("entities", []) if isinstance(e, str) and e.strip()]
+            events[event_id] = {
+                "id": event_id,
+                "summary": analysis.get("summary", art["text"][:100]),
+                "sentiment": analysis.get("sentiment", "neutral"),
+                "sentiment_score": analysis.get("sentiment_score", 0.5),
+                "severity": analysis.get("severity", 0.3),
+                "source": art["source"],
+                "entities": entities,
+                "supplier_ids": index.resolve_all(entities)
+            }
+
+        # Store in Neo4j (batched UNWIND, retried on transient errors)
+        write_events(list(events.values()))
+        if events:
+            bump_data_version()
+    progress.count("written", len(events))
+
+    events_created = [
+        {"id": ev["id"], "entities": ev["entities"], "suppliers": ev["supplier_ids"]}
+        for ev in events.values()
+    ]
+    for ev in events_created:
+        print(f"✔ Event {ev['id']} stored with entities: {ev['entities']}")
 
     return events_created
 
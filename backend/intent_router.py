@@ -0,0 +1,97 @@
+import os
+import re
+import threading
+
+
+# ====================================
+# Settings
+# ====================================
+# Below this confidence the agent falls back to the LLM router
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6"))
+
+# Labels that route to write handlers: the rules may still spot them
+# (so they discount rival labels) but never decide them without the LLM.
+LLM_CONFIRMED_LABELS = {"DATA_UPDATE"}
+
+
+# ====================================
+# Rules: (label, pattern, weight)
+# ====================================
+# Weights are the confidence one match alone gives a label; several
+# matches for the same label combine as a noisy-or.
+RULES = [
+    ("NEWS_QUERY", r"\bnews\b|\bheadlines?\b|\barticles?\b", 0.8),
+    ("NEWS_QUERY", r"\b(latest|recent)\b.*\b(events?|updates?|happen\w*)\b", 0.6),
+    ("NEWS_QUERY", r"\bwhat('?s| is) happening\b", 0.6),
+
+    ("EVENT_SEVERITY", r"\bsever(e|ity)\b", 0.7),
+    ("EVENT_SEVERITY", r"\b(in|across|for) (india|the country|[a-z]+ region)\b", 0.3),
+
+    ("GRAPH_QUERY", r"\b(top|most|highest|riskiest|rank\w*)\b.*\bsuppliers\b", 0.8),
+    ("GRAPH_QUERY", r"\bsuppliers\b.*\b(top|most|highest|riskiest|greatest|biggest)\b", 0.8),
+    ("GRAPH_QUERY", r"\b(which|what|list|show)\b.*\bsuppliers\b", 0.5),
+    ("GRAPH_QUERY", r"\b(graph|relationships?|connected|network)\b", 0.6),
+
+    ("RISK_REPORT", r"\b(explain|summar\w+|report|overview|breakdown)\b", 0.7),
+
+    ("DATA_UPDATE", r"\b(add|update|insert|create|register|delete|remove)\b.*\b(supplier|data|record)s?\b", 0.9),
+]
+
+# Only counts when the message names a known supplier
+SUPPLIER_RULES = [
+    ("SUPPLIER_RISK", r"\b(risk\w*|safe|exposure|score)\b", 0.8),
+    ("NEWS_QUERY", r"\bnews\b|\bheadlines?\b", 0.2),
+]
+
+_compiled = [(label, re.compile(p, re.I), w) for label, p, w in RULES]
+_compiled_supplier = [(label, re.compile(p, re.I), w) for label, p, w in SUPPLIER_RULES]
+
+
+def classify(message, has_supplier=False):
+    """
+    Rule-based intent guess. Returns (label, confidence) where confidence
+    is the winning label's score discounted by the runner-up, so
+    ambiguous messages score low and go to the LLM. Labels in
+    LLM_CONFIRMED_LABELS always come back with confidence 0.
+    """
+    scores = {}
+
+    rules = _compiled + (_compiled_supplier if has_supplier else [])
+    for label, pattern, weight in rules:
+        if pattern.search(message or ""):
+            scores[label] = 1 - (1 - scores.get(label, 0.0)) * (1 - weight)
+
+    if not scores:
+        return "UNKNOWN", 0.0
+
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    label, top = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+    if label in LLM_CONFIRMED_LABELS:
+        return label, 0.0
+    return label, round(top * (1 - runner_up), 4)
+
+
+# ====================================
+# Path counters
+# ====================================
+# rules / llm: fresh routing decisions; memo: intent_cache hits
+_stats = {"rules": 0, "llm": 0, "memo": 0}
+_stats_lock = threading.Lock()
+
+
+def record_route(path):
+    with _stats_lock:
+        _stats[path] += 1
+
+
+def router_stats():
+    with _stats_lock:
+        decided = _stats["rules"] + _stats["llm"]
+        return {
+            **_stats,
+            "total": decided + _stats["memo"],
+            "rules_share": round(_stats["rules"] / decided, 4) if decided else 0.0,
+            "threshold": INTENT_CONFIDENCE_THRESHOLD,
+        }
@@ -0,0 +1,202 @@
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from backend import metrics
+
+
+# Finished jobs kept around for the status endpoints
+MAX_JOB_HISTORY = 50
+
+# Run SUPPLIES_TO risk propagation after each ingest's risk sweep, then
+# sweep the suppliers whose propagated risk changed
+PROPAGATE_ON_INGEST = os.getenv("PROPAGATE_ON_INGEST", "1").lower() in ("1", "true", "yes")
+
+
+class JobProgress:
+    """
+    Per-stage progress for one job. Pipelines report through
+    `stage(name)` and `count(key, n)`; the job exposes a snapshot.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        with self._lock:
+            self.stages[name] = {"status": "running", "elapsed_ms": None}
+        try:
+            with metrics.timed(f"pipeline.{name}"):
+                yield
+        except Exception:
+            self._finish(name, "failed", started)
+            raise
+        self._finish(name, "done", started)
+
+    def _finish(self, name, status, started):
+        with self._lock:
+            self.stages[name] = {
+                "status": status,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+
+    def count(self, key, n):
+        with self._lock:
+            self.counts[key] = n
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "counts": dict(self.counts)
+            }
+
+
+class NullProgress:
+    """Progress sink for runs outside the job queue."""
+
+    @contextmanager
+    def stage(self, name):
+        with metrics.timed(f"pipeline.{name}"):
+            yield
+
+    def count(self, key, n):
+        pass
+
+
+class Job:
+    def __init__(self, kind, params=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = "queued"
+        self.progress = JobProgress()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_ms": round((end - self.started_at) * 1000, 2) if self.started_at else None,
+            **self.progress.snapshot(),
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobQueue:
+    """
+    In-process queue with a single worker. Submitting a kind that is
+    already queued or running returns the existing job instead of
+    starting another, so two ingests never overlap.
+    """
+
+    def __init__(self, max_workers=1):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, **params):
+        """
+        Queue fn(progress, **params). Returns (job, created).
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.kind == kind and job.status in ("queued", "running"):
+                    return job, False
+
+            job = Job(kind, params)
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_JOB_HISTORY:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.status in ("queued", "running"):
+                    break
+                self._jobs.popitem(last=False)
+
+        self._pool.submit(self._run, job, fn)
+        return job, True
+
+    def _run(self, job, fn):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(job.progress, **job.params)
+            job.status = "succeeded"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+
+job_queue = JobQueue()
+
+
+# ====================================
+# Ingest job
+# ====================================
+def run_ingest_job(progress, full_sweep=False):
+    # Imported here: these modules open Neo4j/LLM clients at import time
+    from backend.ingest_news import ingest_all
+    from backend.risk_engine import update_changed_risks_and_alerts
+
+    results = ingest_all(progress=progress)
+
+    with progress.stage("risk"):
+        risk = update_changed_risks_and_alerts(full=full_sweep)
+    progress.count("alerts", risk["opened"])
+    progress.count("alerts_closed", risk["closed"])
+
+    propagation = None
+    if PROPAGATE_ON_INGEST:
+        from backend.propagation import propagate_risk
+
+        with progress.stage("propagate"):
+            propagation = propagate_risk()
+
+        if propagation["changed"]:
+            with progress.stage("risk_propagated"):
+                downstream = update_changed_risks_and_alerts()
+            risk["alerts_created"] += downstream["alerts_created"]
+            risk["alerts_closed"] += downstream["alerts_closed"]
+            progress.count("alerts", downstream["opened"])
+            progress.count("alerts_closed", downstream["closed"])
+
+    return {
+        "ingested": results,
+        "alerts": risk["alerts_created"],
+        "alerts_closed": risk["alerts_closed"],
+        "risk_mode": risk["mode"],
+        "risk_writes": {k: risk[k] for k in ("written", "skipped", "opened", "closed")},
+        "risk_chunks": risk["chunks"],
+        "propagation": propagation
+    }
+
+
+def enqueue_ingest(full_sweep=False):
+    return job_queue.submit("ingest", run_ingest_job, full_sweep=full_sweep)
@@ -7,12 +7,14 @@ from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
 from groq import Groq 
 
-# Import MCP modules
-from .mcp.graph_mcp import GraphMCP
-from .mcp.risk_mcp import RiskMCP
-from .mcp.data_mcp import DataMCP
+# MCP helpers for the configured graph backend
+from backend import storage
 
 from backend.ai_utils import extract_supplier_from_message
+from backend.intent_router import classify, record_route, INTENT_CONFIDENCE_THRESHOLD
+from backend.response_cache import response_cache, intent_cache, normalize_message
+from backend.data_version import current_data_version
+from backend import metrics
 
 
 
@@ -22,6 +24,12 @@ from backend.ai_utils import extract_supplier_from_message
 load_dotenv()
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
+# MCP helpers borrow sessions from the shared driver pool (or read the
+# embedded graph), so one instance each serves every message.
+graph_mcp = storage.graph_mcp()
+risk_mcp = storage.risk_mcp()
+data_mcp = storage.data_mcp()
+
 # ====================================================
 # Agent State
 # ====================================================
@@ -37,12 +45,49 @@ class AgentState(BaseModel):
         "UNKNOWN"
     ] = "UNKNOWN"
 
+    # Set once the intent is decided, so the graph's route node does not
+    # classify a message the caller already routed
+    routed: bool = False
+
     result: Optional[Union[Dict, List]] = None
 
 
 # ====================================================
 # Step 1 — Intent Classification (FIXED)
 # ====================================================
+def route(state: AgentState) -> AgentState:
+    """
+    Try the local rule-based classifier first; only ask the LLM when it
+    is not confident enough.
+    """
+    if state.routed:
+        return state
+
+    supplier = extract_supplier_from_message(state.message)
+    memo_key = (normalize_message(state.message), supplier)
+
+    cached = intent_cache.get(memo_key)
+    if cached is not None:
+        record_route("memo")
+        state.intent = cached
+        state.routed = True
+        return state
+
+    label, confidence = classify(state.message, has_supplier=supplier is not None)
+
+    if confidence >= INTENT_CONFIDENCE_THRESHOLD:
+        record_route("rules")
+        state.intent = label
+    else:
+        record_route("llm")
+        state = llm_route(state)
+
+    state.routed = True
+    intent_cache.put(memo_key, state.intent)
+    return state
+
+
+@metrics.instrument("agent.llm_route")
 def llm_route(state: AgentState) -> AgentState:
     prompt = f"""
 You are an intent classifier for a supply chain risk AI agent.
@@ -81,6 +126,7 @@ User message:
         messages=[{"role": "user", "content": prompt}],
         temperature=0
     )
+    metrics.record_llm_usage("route", getattr(response, "usage", None))
 
     label = (response.choices[0].message.content or "UNKNOWN").strip().upper()
 
@@ -104,11 +150,7 @@ User message:
 # Step 2A — Handle Graph Query
 # ====================================================
 def handle_graph(state: AgentState) -> AgentState:
-    g = GraphMCP()
-    try:
-        state.result = g.top_risky_suppliers(limit=5)
-    finally:
-        g.close()
+    state.result = graph_mcp.top_risky_suppliers(limit=5)
     return state
 
 
@@ -116,11 +158,7 @@ def handle_graph(state: AgentState) -> AgentState:
 # Step 2B — Supplier Risk Report (legacy)
 # ====================================================
 def handle_risk(state: AgentState) -> AgentState:
-    r = RiskMCP()
-    try:
-        state.result = r.supplier_risk_report("S1")
-    finally:
-        r.close()
+    state.result = risk_mcp.supplier_risk_report("S1")
     return state
 
 
@@ -128,19 +166,15 @@ def handle_risk(state: AgentState) -> AgentState:
 # Step 2C — Handle Data Updates
 # ====================================================
 def handle_data(state: AgentState) -> AgentState:
-    d = DataMCP()
-    try:
-        example = {
-            "id": "S99",
-            "name": "New Supplier GmbH",
-            "esg": 70,
-            "fin": 0.8,
-            "ld": 20,
-            "country": "DE"
-        }
-        state.result = d.add_supplier(example)
-    finally:
-        d.close()
+    example = {
+        "id": "S99",
+        "name": "New Supplier GmbH",
+        "esg": 70,
+        "fin": 0.8,
+        "ld": 20,
+        "country": "DE"
+    }
+    state.result = data_mcp.add_supplier(example)
     return state
 
 
@@ -150,23 +184,15 @@ def handle_data(state: AgentState) -> AgentState:
 # Step 2D — Latest Supplier News
 # ====================================================
 def handle_news(state: AgentState) -> AgentState:
-    from backend.ai_utils import extract_supplier_from_message
-    g = GraphMCP()
-
-    try:
-        supplier_name = extract_supplier_from_message(state.message)
-
-        if not supplier_name:
-            state.result = {
-                "error": "Please specify a supplier name for news lookup."
-            }
-            return state
+    supplier_name = extract_supplier_from_message(state.message)
 
-        state.result = g.latest_supplier_events(supplier_name)
-
-    finally:
-        g.close()
+    if not supplier_name:
+        state.result = {
+            "error": "Please specify a supplier name for news lookup."
+        }
+        return state
 
+    state.result = graph_mcp.latest_supplier_events(supplier_name)
     return state
 
 
@@ -175,23 +201,15 @@ def handle_news(state: AgentState) -> AgentState:
 # Step 2E — Supplier Risk Summary (GUARDED)
 # ====================================================
 def handle_supplier_risk(state: AgentState) -> AgentState:
-    from backend.ai_utils import extract_supplier_from_message
-    g = GraphMCP()
-
-    try:
-        supplier_name = extract_supplier_from_message(state.message)
+    supplier_name = extract_supplier_from_message(state.message)
 
-        if not supplier_name:
-            state.result = {
-                "error": "Could not identify supplier. Please mention a supplier name."
-            }
-            return state
-
-        state.result = g.supplier_risk_summary(supplier_name)
-
-    finally:
-        g.close()
+    if not supplier_name:
+        state.result = {
+            "error": "Could not identify supplier. Please mention a supplier name."
+        }
+        return state
 
+    state.result = graph_mcp.supplier_risk_summary(supplier_name)
     return state
 
 
@@ -200,11 +218,7 @@ def handle_supplier_risk(state: AgentState) -> AgentState:
 # Step 2F — Highest Severity Events (Country-level)
 # ====================================================
 def handle_event_severity(state: AgentState) -> AgentState:
-    g = GraphMCP()
-    try:
-        state.result = g.top_severe_events(country="India")
-    finally:
-        g.close()
+    state.result = graph_mcp.top_severe_events(country="India")
     return state
 
 
@@ -213,7 +227,7 @@ def handle_event_severity(state: AgentState) -> AgentState:
 # ====================================================
 builder = StateGraph(AgentState)
 
-builder.add_node("route", llm_route)
+builder.add_node("route", route)
 builder.add_node("graph", handle_graph)
 builder.add_node("risk", handle_risk)
 builder.add_node("data", handle_data)
@@ -261,25 +275,70 @@ graph = builder.compile()
 # ====================================================
 # Run Agent (GUARDED)
 # ====================================================
+# Writes must run every time, and bump the data version as they do so
+# a cached answer could never be hit again anyway
+UNCACHED_INTENTS = {"DATA_UPDATE"}
+
+
+def response_key(message: str, intent: str):
+    supplier = extract_supplier_from_message(message)
+    return (normalize_message(message), intent, supplier, current_data_version())
+
+
+def route_message(message: str):
+    """Decide the intent once per request; the graph reuses it."""
+    return route(AgentState(message=message)).intent
+
+
+@metrics.instrument("agent.run")
 def run_agent(message: str):
-    state = AgentState(message=message)
+    """
+    Answer a message, reusing a cached answer while the graph data
+    version is unchanged.
+    """
+    intent = route_message(message)
+    if intent in UNCACHED_INTENTS:
+        return answer_message(message, intent)
+
+    key = response_key(message, intent)
+
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    answer = answer_message(message, intent)
+    response_cache.put(key, answer)
+    return answer
+
+
+@metrics.instrument("agent.query")
+def query_message(message: str, intent: Optional[str] = None):
+    """
+    Run the message's graph query (routing it first unless `intent` is
+    given); no explanation.
+    """
+    if intent is None:
+        state = AgentState(message=message)
+    else:
+        state = AgentState(message=message, intent=intent, routed=True)
     out = graph.invoke(state)
 
-    result = out.get("result", {}) if isinstance(out, dict) else out.result
+    return out.get("result", {}) if isinstance(out, dict) else out.result
 
-    # ---- Guard: empty or error ----
+
+def guard_explanation(result):
+    """Explanation for empty/error results, or None if the LLM should explain."""
     if not result or (isinstance(result, dict) and "error" in result):
-        return {
-            "data": result,
-            "explanation": (
-                result.get("error")
-                if isinstance(result, dict)
-                else "No risk data found for the given criteria."
-            )
-        }
+        return (
+            result.get("error")
+            if isinstance(result, dict)
+            else "No risk data found for the given criteria."
+        )
+    return None
 
-    # ---- LLM Explanation ----
-    prompt = f"""
+
+def explanation_prompt(message, result):
+    return f"""
 You are a supply chain risk analyst.
 
 User question:
@@ -291,11 +350,26 @@ Agent data:
 Explain the risk clearly in 3–4 lines.
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3
-    )
+
+def answer_message(message: str, intent: Optional[str] = None):
+    result = query_message(message, intent)
+
+    # ---- Guard: empty or error ----
+    guarded = guard_explanation(result)
+    if guarded is not None:
+        return {
+            "data": result,
+            "explanation": guarded
+        }
+
+    # ---- LLM Explanation ----
+    with metrics.timed("llm.explain"):
+        response = client.chat.completions.create(
+            model="llama-3.1-8b-instant",
+            messages=[{"role": "user", "content": explanation_prompt(message, result)}],
+            temperature=0.3
+        )
+    metrics.record_llm_usage("explain", getattr(response, "usage", None))
 
     explanation = response.choices[0].message.content
 
@@ -303,3 +377,54 @@ Explain the risk clearly in 3–4 lines.
         "data": result,
         "explanation": explanation
     }
+
+
+# ====================================================
+# Streaming variant
+# ====================================================
+def run_agent_stream(message: str):
+    """
+    Yield ("data", result) as soon as the graph query finishes, then
+    ("token", text) chunks of the explanation, then ("done", answer).
+    Cached answers are replayed as one data + one token event.
+    """
+    intent = route_message(message)
+    key = None if intent in UNCACHED_INTENTS else response_key(message, intent)
+
+    cached = response_cache.get(key) if key is not None else None
+    if cached is not None:
+        yield "data", cached["data"]
+        yield "token", cached["explanation"] or ""
+        yield "done", cached
+        return
+
+    result = query_message(message, intent)
+    yield "data", result
+
+    explanation = guard_explanation(result)
+    if explanation is not None:
+        yield "token", explanation
+    else:
+        parts = []
+        usage = None
+        with metrics.timed("llm.explain_stream"):
+            stream = client.chat.completions.create(
+                model="llama-3.1-8b-instant",
+                messages=[{"role": "user", "content": explanation_prompt(message, result)}],
+                temperature=0.3,
+                stream=True
+            )
+            for chunk in stream:
+                # Groq reports usage on the final chunk under x_groq
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    yield "token", text
+        metrics.record_llm_usage("explain", usage)
+        explanation = "".join(parts)
+
+    answer = {"data": result, "explanation": explanation}
+    if key is not None:
+        response_cache.put(key, answer)
+    yield "done", answer
@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+# ====================================
+# Settings
+# ====================================
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(BASE_DIR, ".cache", "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_MAX_AGE_DAYS = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+# Evict at most once per this many writes
+EVICT_EVERY = 200
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def cache_key(text, model, prompt_version):
+    raw = "\x1f".join([normalize_text(text), model, prompt_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Content-addressed on-disk cache for LLM analysis results.
+
+    Keyed by a hash of normalized article text, model name and prompt
+    version, so a prompt or model change never serves stale results.
+    Old entries expire after `max_age_days`; past `max_entries` the
+    least recently used rows are dropped.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 max_age_days=LLM_CACHE_MAX_AGE_DAYS, bypass=LLM_CACHE_BYPASS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.bypass = bypass
+
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis(last_used)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS analysis_created_at ON analysis(created_at)")
+            self._conn.commit()
+        return self._conn
+
+    # -----------------------------------
+    # Lookups
+    # -----------------------------------
+    def get(self, key):
+        if self.bypass:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value FROM analysis WHERE key = ? AND created_at >= ?",
+                (key, now - self.max_age)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            conn.execute("UPDATE analysis SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        if self.bypass:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM analysis WHERE created_at < ?", (now - self.max_age,))
+        conn.execute("""
+            DELETE FROM analysis WHERE key IN (
+                SELECT key FROM analysis
+                ORDER BY last_used DESC
+                LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def evict(self):
+        with self._lock:
+            conn = self._connect()
+            self._evict(conn, time.time())
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM analysis")
+            conn.commit()
+
+    # -----------------------------------
+    # Stats
+    # -----------------------------------
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._connect().execute("SELECT count(*) FROM analysis").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "bypass": self.bypass,
+            }
+
+
+analysis_cache = AnalysisCache()
@@ -1,50 +1,68 @@
-import os
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
+from backend.mcp.profiling import mcp_session
+from backend.mcp.name_resolver import normalize_name
+from backend.supplier_index import invalidate_supplier_index
+from backend.data_version import bump_data_version
+from backend import metrics
 
-load_dotenv()
 
 class DataMCP:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(
-            os.getenv("NEO4J_URI"),
-            auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
-        )
+    def __init__(self, session_factory=mcp_session):
+        # Swappable so tooling (e.g. plan checks) can wrap sessions
+        self.session = session_factory
 
     def close(self):
-        self.driver.close()
+        # The pooled driver is process-wide; nothing to release here.
+        pass
 
     # -----------------------------
     # Add / Update Supplier
     # -----------------------------
+    @metrics.instrument("mcp.data.add_supplier")
     def add_supplier(self, supplier: dict):
         """
         supplier = {
-            id, name, country, aliases (list)
+            id, name, country, aliases (list), risk (optional)
         }
+        New suppliers and changes to `risk` mark the supplier for the
+        next incremental risk sweep.
         """
         query = """
         MERGE (s:Supplier {id:$id})
+        WITH s, s.risk AS old_risk
         SET s.name = $name,
+            s.name_norm = $name_norm,
             s.country = $country,
-            s.aliases = $aliases
+            s.aliases = $aliases,
+            s.risk = coalesce($risk, s.risk),
+            s.severity_score = coalesce(s.severity_score, 0.0),
+            s.created_at = coalesce(s.created_at, datetime())
+        FOREACH (_ IN CASE WHEN old_risk IS NULL OR old_risk <> s.risk
+                           THEN [1] ELSE [] END |
+            SET s.risk_touched_at = datetime())
         RETURN s
         """
 
-        with self.driver.session() as session:
+        with self.session() as session:
             record = session.run(
                 query,
                 id=supplier["id"],
                 name=supplier["name"],
+                name_norm=normalize_name(supplier["name"]),
                 country=supplier.get("country"),
-                aliases=supplier.get("aliases", [])
+                aliases=supplier.get("aliases", []),
+                risk=supplier.get("risk")
             ).single()
 
+        # Names/aliases may have changed
+        invalidate_supplier_index()
+        bump_data_version()
+
         return dict(record["s"])
 
     # -----------------------------
     # Attach supplier to product
     # -----------------------------
+    @metrics.instrument("mcp.data.link_supplier_product")
     def link_supplier_product(self, supplier_id, product_name):
         query = """
         MATCH (s:Supplier {id:$sid})
@@ -52,7 +70,9 @@ class DataMCP:
         MERGE (s)-[:SUPPLIES]->(p)
         """
 
-        with self.driver.session() as session:
+        with self.session() as session:
             session.run(query, sid=supplier_id, pname=product_name)
 
+        bump_data_version()
+
         return {"ok": True}
@@ -1,51 +1,49 @@
-from neo4j import GraphDatabase
-import os
-from dotenv import load_dotenv
 from backend.utils.neo4j_utils import serialize_record
-
-load_dotenv()
+from backend.mcp.profiling import mcp_session, serializing
+from backend.mcp.name_resolver import SupplierResolver
+from backend import metrics
 
 
 class GraphMCP:
-    def __init__(self):
-        self.uri = os.getenv("NEO4J_URI")
-        self.user = os.getenv("NEO4J_USER")
-        self.password = os.getenv("NEO4J_PASSWORD")
+    """
+    Read-only graph queries. Sessions are borrowed from the shared
+    driver pool, so instances are cheap to create.
+    """
 
-        self.driver = GraphDatabase.driver(
-            self.uri,
-            auth=(self.user, self.password)
-        )
+    def __init__(self, session_factory=mcp_session):
+        # Swappable so tooling (e.g. plan checks) can wrap sessions
+        self.session = session_factory
+        self.resolver = SupplierResolver(session_factory)
 
     def close(self):
-        self.driver.close()
+        # The pooled driver is process-wide; nothing to release here.
+        pass
 
     # -----------------------------------
     # Helper: Run Cypher Query (SAFE)
     # -----------------------------------
     def run_query(self, query, params=None):
-        with self.driver.session() as session:
+        with self.session() as session:
             result = session.run(query, params or {})
-            raw = [record.data() for record in result]
-            return serialize_record(raw) if raw else []
+            with serializing(session):
+                raw = [record.data() for record in result]
+                return serialize_record(raw) if raw else []
 
     # -----------------------------------
     # 1) Top Risky Suppliers
     # -----------------------------------
+    @metrics.instrument("mcp.graph.top_risky_suppliers")
     def top_risky_suppliers(self, limit: int = 5):
         query = """
-        MATCH (e:RiskEvent)-[:AFFECTS]->(s:Supplier)
-        WITH s,
-             count(e) AS event_count,
-             avg(e.severity) AS avg_severity,
-             sum(e.severity) AS total_severity
+        MATCH (s:Supplier)
+        WHERE s.severity_sum IS NOT NULL AND s.event_count > 0
         RETURN
             s.name AS supplier,
             s.country AS country,
-            event_count,
-            round(avg_severity, 2) AS avg_severity,
-            round(total_severity, 2) AS total_severity
-        ORDER BY total_severity DESC
+            s.event_count AS event_count,
+            round(s.severity_avg, 2) AS avg_severity,
+            round(s.severity_sum, 2) AS total_severity
+        ORDER BY s.severity_sum DESC
         LIMIT $limit
         """
         return self.run_query(query, {"limit": limit})
@@ -54,9 +52,15 @@ class GraphMCP:
     # 2) Latest Supplier Events
     # -----------------------------------
     def latest_supplier_events(self, supplier, limit=5):
+        ids = self.resolver.resolve(supplier)
+        return self.latest_events_for_ids(ids, limit) if ids else []
+
+    @metrics.instrument("mcp.graph.latest_events_for_ids")
+    def latest_events_for_ids(self, supplier_ids, limit=5):
         query = """
-        MATCH (e:RiskEvent)-[:AFFECTS]->(s:Supplier)
-        WHERE toLower(s.name) CONTAINS toLower($supplier)
+        MATCH (s:Supplier)
+        WHERE s.id IN $ids
+        MATCH (e:RiskEvent)-[:AFFECTS]->(s)
         RETURN
             e.type AS event_type,
             e.summary AS summary,
@@ -66,7 +70,7 @@ class GraphMCP:
         LIMIT $limit
         """
         return self.run_query(query, {
-            "supplier": supplier,
+            "ids": supplier_ids,
             "limit": limit
         })
 
@@ -74,20 +78,27 @@ class GraphMCP:
     # 3) Supplier Risk Summary
     # -----------------------------------
     def supplier_risk_summary(self, supplier):
+        ids = self.resolver.resolve(supplier)
+        return self.risk_summary_for_ids(ids) if ids else []
+
+    @metrics.instrument("mcp.graph.risk_summary_for_ids")
+    def risk_summary_for_ids(self, supplier_ids):
         query = """
-        MATCH (e:RiskEvent)-[:AFFECTS]->(s:Supplier)
-        WHERE toLower(s.name) CONTAINS toLower($supplier)
+        MATCH (s:Supplier)
+        WHERE s.id IN $ids
+          AND s.event_count > 0
         RETURN
             s.name AS supplier,
-            count(e) AS total_events,
-            round(avg(e.severity), 2) AS avg_severity,
-            max(e.severity) AS max_severity
+            s.event_count AS total_events,
+            round(s.severity_avg, 2) AS avg_severity,
+            s.severity_max AS max_severity
         """
-        return self.run_query(query, {"supplier": supplier})
+        return self.run_query(query, {"ids": supplier_ids})
 
     # -----------------------------------
     # 4) Top Severe Events (Country)
     # -----------------------------------
+    @metrics.instrument("mcp.graph.top_severe_events")
     def top_severe_events(self, country="India", limit=5):
         query = """
         MATCH (e:RiskEvent)-[:AFFECTS]->(s:Supplier)
@@ -109,6 +120,7 @@ class GraphMCP:
 # -----------------------------------
     # 5) Get All Suppliers (Dynamic)
     # -----------------------------------
+    @metrics.instrument("mcp.graph.get_all_suppliers")
     def get_all_suppliers(self):
         """
         Returns all suppliers with possible aliases.
@@ -117,6 +129,7 @@ class GraphMCP:
         query = """
         MATCH (s:Supplier)
         RETURN
+            s.id AS id,
             s.name AS name,
             coalesce(s.aliases, []) AS aliases
         """
@@ -0,0 +1,62 @@
+import os
+import re
+
+from backend.mcp.profiling import mcp_session
+from backend import metrics
+
+
+# Most suppliers one name may resolve to; the *_for_ids helpers take them all
+SUPPLIER_MATCH_LIMIT = int(os.getenv("SUPPLIER_MATCH_LIMIT", "10"))
+
+
+def normalize_name(name):
+    """Python twin of the Cypher `toLower(trim(name))` stored as s.name_norm."""
+    return (name or "").strip().lower()
+
+
+class SupplierResolver:
+    """
+    Resolve a user-supplied supplier string to Supplier ids once, so
+    MCP queries can anchor on the id constraint instead of scanning
+    every name.
+
+    1. exact match on the indexed `s.name_norm`
+    2. otherwise the `supplier_names` full-text index over name and aliases
+
+    Matches are ordered by score, then name, then id, so the same input
+    always resolves to the same suppliers; up to SUPPLIER_MATCH_LIMIT
+    are returned.
+    """
+
+    def __init__(self, session_factory=mcp_session):
+        self.session = session_factory
+
+    @metrics.instrument("mcp.resolver.resolve")
+    def resolve(self, supplier, limit=SUPPLIER_MATCH_LIMIT):
+        name_norm = normalize_name(supplier)
+        if not name_norm:
+            return []
+
+        with self.session() as session:
+            exact = session.run("""
+                MATCH (s:Supplier)
+                WHERE s.name_norm = $name_norm
+                RETURN s.id AS id
+                ORDER BY id
+                LIMIT $limit
+            """, name_norm=name_norm, limit=limit).data()
+            if exact:
+                return [r["id"] for r in exact]
+
+            terms = re.findall(r"[a-z0-9]+", name_norm)
+            if not terms:
+                return []
+
+            fuzzy = session.run("""
+                CALL db.index.fulltext.queryNodes('supplier_names', $q)
+                YIELD node, score
+                RETURN node.id AS id, node.name AS name, score
+                ORDER BY score DESC, name ASC, id ASC
+                LIMIT $limit
+            """, q=" AND ".join(f"{t}*" for t in terms), limit=limit).data()
+            return [r["id"] for r in fuzzy]
@@ -0,0 +1,227 @@
+import os
+import re
+import sys
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from backend.utils.neo4j_pool import get_session
+from backend import metrics
+
+
+# ====================================
+# Settings
+# ====================================
+# MCP_PROFILE:
+#   off     - sessions come straight from the pool (default)
+#   timing  - wall time, row count and serialization time per query
+#   profile - as timing, plus the Cypher PROFILE summary (db hits and
+#             rows per operator). PROFILE executes the query, so it
+#             costs a little extra work on the server.
+MCP_PROFILE = os.getenv("MCP_PROFILE", "off").lower()
+if MCP_PROFILE in ("", "0", "false", "no"):
+    MCP_PROFILE = "off"
+elif MCP_PROFILE in ("1", "true", "yes"):
+    MCP_PROFILE = "timing"
+if MCP_PROFILE not in ("off", "timing", "profile"):
+    raise ValueError(f"MCP_PROFILE must be off, timing or profile (got {MCP_PROFILE!r})")
+
+# Queries whose wall + serialization time reaches this go to the slow
+# log (0 logs every query)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# JSON-lines file for slow queries; empty prints them instead
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "")
+
+# Slow queries kept in memory for /api/slow-queries
+SLOW_QUERY_HISTORY = int(os.getenv("SLOW_QUERY_HISTORY", "100"))
+
+_slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+_log_lock = threading.Lock()
+
+
+def set_profile_mode(mode):
+    """Switch profiling at runtime (tooling, benchmarks)."""
+    global MCP_PROFILE
+    if mode not in ("off", "timing", "profile"):
+        raise ValueError("mode must be off, timing or profile")
+    MCP_PROFILE = mode
+
+
+# ====================================
+# Helpers
+# ====================================
+def redact_params(params):
+    """Parameter shapes only; values never reach the log."""
+    def shape(value):
+        if value is None:
+            return None
+        if isinstance(value, (str, bytes, list, tuple, set, dict)):
+            return f"<{type(value).__name__} len={len(value)}>"
+        return f"<{type(value).__name__}>"
+
+    return {k: shape(v) for k, v in (params or {}).items()}
+
+
+def compact_query(query, limit=500):
+    return re.sub(r"\s+", " ", query).strip()[:limit]
+
+
+def profile_operators(plan):
+    """
+    Flatten a PROFILE tree into [{"operator", "db_hits", "rows"}],
+    parents before children.
+    """
+    if not plan:
+        return []
+    args = plan.get("args", {})
+    ops = [{
+        "operator": plan.get("operatorType", "").split("@")[0],
+        "db_hits": plan.get("dbHits", args.get("DbHits", 0)),
+        "rows": plan.get("rows", args.get("Rows", 0)),
+    }]
+    for child in plan.get("children", []):
+        ops.extend(profile_operators(child))
+    return ops
+
+
+def _caller():
+    """Name of the MCP method that issued the query."""
+    frame = sys._getframe(2)
+    while frame.f_code.co_name == "run_query" and frame.f_back is not None:
+        frame = frame.f_back
+    owner = frame.f_locals.get("self")
+    name = frame.f_code.co_name
+    return f"{type(owner).__name__}.{name}" if owner is not None else name
+
+
+# ====================================
+# Profiling session
+# ====================================
+class ProfiledResult:
+    """
+    Records fetched eagerly by the session. Supports what MCP code uses
+    (`data()`, `single()`, iteration); time spent in `data()` counts as
+    serialization.
+    """
+
+    def __init__(self, records, report):
+        self._records = records
+        self._report = report
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+    def data(self):
+        started = time.perf_counter()
+        rows = [record.data() for record in self._records]
+        self._report["serialize_ms"] += (time.perf_counter() - started) * 1000
+        return rows
+
+    def consume(self):
+        return None
+
+
+class ProfilingSession:
+    """
+    Session wrapper that times each query and, in "profile" mode, runs
+    it under PROFILE. Reports are emitted when the session closes so
+    serialization done by the caller is included.
+    """
+
+    def __init__(self, session, mode):
+        self._session = session
+        self.mode = mode
+        self.reports = []
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        prefix = "PROFILE " if self.mode == "profile" else ""
+
+        started = time.perf_counter()
+        result = self._session.run(prefix + query, params)
+        records = list(result)
+        summary = result.consume()
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        report = {
+            "helper": _caller(),
+            "query": compact_query(query),
+            "params": redact_params(params),
+            "rows": len(records),
+            "wall_ms": round(wall_ms, 3),
+            "serialize_ms": 0.0,
+        }
+        if self.mode == "profile" and summary is not None and summary.profile:
+            operators = profile_operators(summary.profile)
+            report["db_hits"] = sum(op["db_hits"] or 0 for op in operators)
+            report["operators"] = operators
+        self.reports.append(report)
+        return ProfiledResult(records, report)
+
+    @contextmanager
+    def serializing(self):
+        """Attribute the block's time to the last query's serialization."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.reports:
+                self.reports[-1]["serialize_ms"] += (time.perf_counter() - started) * 1000
+
+    def flush(self):
+        for report in self.reports:
+            report["serialize_ms"] = round(report["serialize_ms"], 3)
+            if report["wall_ms"] + report["serialize_ms"] >= SLOW_QUERY_MS:
+                log_slow_query(report)
+        self.reports = []
+
+
+def serializing(session):
+    """`session.serializing()` for profiling sessions, else a no-op."""
+    return session.serializing() if isinstance(session, ProfilingSession) else nullcontext()
+
+
+@contextmanager
+def _profiled_session(mode):
+    with get_session() as session:
+        profiler = ProfilingSession(session, mode)
+        try:
+            yield profiler
+        finally:
+            profiler.flush()
+
+
+def mcp_session():
+    """
+    Default session factory for the MCP classes: a plain pooled session,
+    or a profiling one when MCP_PROFILE is on.
+    """
+    if MCP_PROFILE == "off":
+        return get_session()
+    return _profiled_session(MCP_PROFILE)
+
+
+# ====================================
+# Slow-query log
+# ====================================
+def log_slow_query(report):
+    entry = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "threshold_ms": SLOW_QUERY_MS, **report}
+    _slow_queries.append(entry)
+    metrics.record_slow_query(report["helper"])
+
+    line = json.dumps(entry, default=str)
+    if SLOW_QUERY_LOG:
+        with _log_lock, open(SLOW_QUERY_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    else:
+        print(f"🐢 Slow query: {line}")
+
+
+def recent_slow_queries():
+    return list(_slow_queries)
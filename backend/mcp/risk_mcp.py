@@ -1,18 +1,17 @@
-import os
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
+from backend.mcp.profiling import mcp_session
+from backend.mcp.name_resolver import SupplierResolver
+from backend import metrics
 
-load_dotenv()
 
 class RiskMCP:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(
-            os.getenv("NEO4J_URI"),
-            auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
-        )
+    def __init__(self, session_factory=mcp_session):
+        # Swappable so tooling (e.g. plan checks) can wrap sessions
+        self.session = session_factory
+        self.resolver = SupplierResolver(session_factory)
 
     def close(self):
-        self.driver.close()
+        # The pooled driver is process-wide; nothing to release here.
+        pass
 
     # -----------------------------
     # Supplier Risk Report
@@ -21,20 +20,29 @@ class RiskMCP:
         """
         Returns risk events affecting a supplier + aggregated severity
         """
+        # One report: the best match
+        ids = self.resolver.resolve(supplier_name, limit=1)
+        if not ids:
+            return {"error": "Supplier not found"}
+        return self.risk_report_for_id(ids[0])
+
+    @metrics.instrument("mcp.risk.risk_report_for_id")
+    def risk_report_for_id(self, supplier_id):
         query = """
-        MATCH (s:Supplier)
-        WHERE toLower(s.name) CONTAINS toLower($name)
+        MATCH (s:Supplier {id: $id})
         OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
+        WITH s, collect(e.summary) AS events
         RETURN
             s.name AS supplier,
-            collect(e.summary) AS events,
-            avg(e.severity) AS avg_severity,
-            max(e.severity) AS max_severity,
-            count(e) AS event_count
+            events,
+            s.severity_avg AS avg_severity,
+            s.severity_max AS max_severity,
+            coalesce(s.event_count, 0) AS event_count,
+            s.propagated_risk AS propagated_risk
         """
 
-        with self.driver.session() as session:
-            record = session.run(query, name=supplier_name).single()
+        with self.session() as session:
+            record = session.run(query, id=supplier_id).single()
 
         if not record:
             return {"error": "Supplier not found"}
@@ -44,22 +52,25 @@ class RiskMCP:
             "event_count": record["event_count"],
             "average_severity": round(record["avg_severity"] or 0, 2),
             "max_severity": record["max_severity"],
+            "propagated_risk": record["propagated_risk"],
             "events": record["events"]
         }
 
     # -----------------------------
     # Top risky suppliers
     # -----------------------------
+    @metrics.instrument("mcp.risk.top_risky_suppliers")
     def top_risky_suppliers(self, limit=5):
         query = """
-        MATCH (s:Supplier)<-[:AFFECTS]-(e:RiskEvent)
+        MATCH (s:Supplier)
+        WHERE s.severity_avg IS NOT NULL
         RETURN
             s.name AS supplier,
-            avg(e.severity) AS risk_score,
-            count(e) AS events
-        ORDER BY risk_score DESC
+            s.severity_avg AS risk_score,
+            s.event_count AS events
+        ORDER BY s.severity_avg DESC
         LIMIT $limit
         """
 
-        with self.driver.session() as session:
+        with self.session() as session:
             return session.run(query, limit=limit).data()
@@ -0,0 +1,218 @@
+import os
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+# ====================================
+# Settings
+# ====================================
+# Read once at import: when disabled, `instrument` returns functions
+# unwrapped and `timed` hands back a shared no-op context manager.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+METRICS_PREFIX = os.getenv("METRICS_PREFIX", "supply_risk")
+
+# Histogram upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms keyed by (metric name, label values).
+    Everything sits behind one lock; an observation is a dict lookup and
+    a few additions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, kind, help_text):
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # -----------------------------------
+    # Prometheus text exposition format
+    # -----------------------------------
+    def render(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.sum, h.count, h.buckets))
+                for key, h in self._histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def header(name):
+            if name in described:
+                return
+            described.add(name)
+            kind, help_text = self._help.get(name, ("untyped", ""))
+            lines.append(f"# HELP {METRICS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{METRICS_PREFIX}_{name}{_labels(name, labels)} {value}")
+
+        for (name, labels), (counts, total, count, buckets) in histograms:
+            header(name)
+            cumulative = 0
+            for bound, n in zip((*buckets, "+Inf"), counts):
+                cumulative += n
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{METRICS_PREFIX}_{name}_bucket{_labels(name, labels, le=le)} {cumulative}")
+            lines.append(f"{METRICS_PREFIX}_{name}_sum{_labels(name, labels)} {total}")
+            lines.append(f"{METRICS_PREFIX}_{name}_count{_labels(name, labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Label names per metric, in the order label values are passed
+LABELS = {
+    "stage_duration_seconds": ("stage",),
+    "stage_calls_total": ("stage",),
+    "stage_errors_total": ("stage",),
+    "llm_calls_total": ("purpose",),
+    "llm_tokens_total": ("purpose", "type"),
+    "http_request_duration_seconds": ("method", "route", "status"),
+    "http_requests_total": ("method", "route", "status"),
+    "http_errors_total": ("method", "route"),
+    "slow_queries_total": ("helper",),
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(name, values, **extra):
+    pairs = list(zip(LABELS.get(name, ()), values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+registry = MetricsRegistry()
+registry.describe("stage_duration_seconds", "histogram", "Wall time per pipeline/query stage.")
+registry.describe("stage_calls_total", "counter", "Calls per stage.")
+registry.describe("stage_errors_total", "counter", "Calls per stage that raised.")
+registry.describe("llm_calls_total", "counter", "LLM completions per purpose.")
+registry.describe("llm_tokens_total", "counter", "LLM tokens per purpose and type (prompt/completion).")
+registry.describe("http_request_duration_seconds", "histogram", "Flask request latency.")
+registry.describe("http_requests_total", "counter", "Flask requests.")
+registry.describe("http_errors_total", "counter", "Flask requests answered with a 5xx.")
+registry.describe("slow_queries_total", "counter", "MCP queries over SLOW_QUERY_MS (MCP_PROFILE on).")
+
+
+# ====================================
+# Recording helpers
+# ====================================
+@contextmanager
+def _timed(stage):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.inc("stage_errors_total", (stage,))
+        raise
+    finally:
+        registry.observe("stage_duration_seconds", (stage,), time.perf_counter() - started)
+        registry.inc("stage_calls_total", (stage,))
+
+
+def timed(stage):
+    """Context manager recording latency, calls and errors for `stage`."""
+    return _timed(stage) if METRICS_ENABLED else _NOOP
+
+
+def instrument(stage):
+    """Decorator form of `timed`; a no-op when metrics are disabled."""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_stage_error(stage):
+    """Count an error for a stage that recovered instead of raising."""
+    if METRICS_ENABLED:
+        registry.inc("stage_errors_total", (stage,))
+
+
+def record_llm_usage(purpose, usage):
+    """
+    Count one LLM call and its tokens. `usage` is the response's usage
+    object (prompt_tokens / completion_tokens); None when the API did
+    not report it.
+    """
+    if not METRICS_ENABLED:
+        return
+    registry.inc("llm_calls_total", (purpose,))
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            registry.inc("llm_tokens_total", (purpose, kind), tokens)
+
+
+def record_request(method, route, status, elapsed):
+    labels = (method, route, str(status))
+    registry.observe("http_request_duration_seconds", labels, elapsed)
+    registry.inc("http_requests_total", labels)
+    if status >= 500:
+        registry.inc("http_errors_total", (method, route))
+
+
+def record_slow_query(helper):
+    if METRICS_ENABLED:
+        registry.inc("slow_queries_total", (helper,))
+
+
+def render_metrics():
+    return registry.render()
@@ -0,0 +1,269 @@
+import sys
+import argparse
+from contextlib import contextmanager
+
+from backend.utils.neo4j_pool import get_session
+from backend.mcp.graph_mcp import GraphMCP
+from backend.mcp.risk_mcp import RiskMCP
+
+
+# ====================================
+# Migrations: (version, description, statements)
+# ====================================
+# Append only; never edit a migration that has shipped. Every statement
+# must be idempotent (IF NOT EXISTS) so a partially applied migration
+# can simply be re-run.
+MIGRATIONS = [
+    (1, "uniqueness constraints", [
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (s:Supplier) REQUIRE s.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Manufacturer) REQUIRE m.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (p:Product) REQUIRE p.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (h:Hub) REQUIRE h.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Country) REQUIRE c.code IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (r:RiskEvent) REQUIRE r.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (st:RiskEngineState) REQUIRE st.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (v:DataVersion) REQUIRE v.id IS UNIQUE",
+    ]),
+    (2, "risk engine and aggregate indexes", [
+        "CREATE INDEX supplier_risk_touched IF NOT EXISTS FOR (s:Supplier) ON (s.risk_touched_at)",
+        "CREATE INDEX supplier_severity_sum IF NOT EXISTS FOR (s:Supplier) ON (s.severity_sum)",
+        "CREATE INDEX supplier_severity_avg IF NOT EXISTS FOR (s:Supplier) ON (s.severity_avg)",
+    ]),
+    (3, "query indexes for MCP lookups and alerts", [
+        "CREATE INDEX supplier_name IF NOT EXISTS FOR (s:Supplier) ON (s.name)",
+        "CREATE INDEX supplier_country IF NOT EXISTS FOR (s:Supplier) ON (s.country)",
+        "CREATE INDEX risk_event_ingested_at IF NOT EXISTS FOR (e:RiskEvent) ON (e.ingested_at)",
+        "CREATE INDEX risk_event_severity IF NOT EXISTS FOR (e:RiskEvent) ON (e.severity)",
+        "CREATE INDEX alert_supplier_open IF NOT EXISTS FOR (a:Alert) ON (a.supplier_id, a.open)",
+        "CREATE FULLTEXT INDEX supplier_names IF NOT EXISTS FOR (s:Supplier) ON EACH [s.name, s.aliases]",
+    ]),
+    (4, "normalized supplier names for id resolution", [
+        "CREATE INDEX supplier_name_norm IF NOT EXISTS FOR (s:Supplier) ON (s.name_norm)",
+        """
+        MATCH (s:Supplier)
+        WHERE s.name IS NOT NULL
+        CALL { WITH s SET s.name_norm = toLower(trim(s.name)) } IN TRANSACTIONS OF 10000 ROWS
+        """,
+    ]),
+    (5, "non-null, indexed sort keys for the paginated dashboards", [
+        "CREATE INDEX supplier_severity_score IF NOT EXISTS FOR (s:Supplier) ON (s.severity_score)",
+        "CREATE INDEX alert_risk_value IF NOT EXISTS FOR (a:Alert) ON (a.risk_value)",
+        "CREATE INDEX alert_created_at IF NOT EXISTS FOR (a:Alert) ON (a.created_at)",
+        "CREATE INDEX alert_country IF NOT EXISTS FOR (a:Alert) ON (a.country)",
+        """
+        MATCH (s:Supplier)
+        WHERE s.severity_score IS NULL
+        CALL { WITH s SET s.severity_score = coalesce(s.severity_avg, 0.0) } IN TRANSACTIONS OF 10000 ROWS
+        """,
+        """
+        MATCH (a:Alert)
+        WHERE a.country IS NULL
+        CALL {
+            WITH a
+            OPTIONAL MATCH (s:Supplier {id: a.supplier_id})
+            SET a.country = coalesce(s.country, '')
+        } IN TRANSACTIONS OF 10000 ROWS
+        """,
+    ]),
+    (6, "backfill materialized risk aggregates on existing suppliers", [
+        # Same computation as aggregates.refresh_supplier_aggregates
+        """
+        MATCH (s:Supplier)
+        WHERE s.event_count IS NULL
+        CALL {
+            WITH s
+            OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
+            WITH s,
+                 count(e) AS event_count,
+                 count(e.severity) AS severity_events,
+                 coalesce(sum(e.severity), 0.0) AS severity_sum,
+                 max(e.severity) AS severity_max,
+                 avg(e.severity) AS severity_avg,
+                 [t IN collect(DISTINCT e.type) WHERE t IS NOT NULL] AS event_types
+            SET s.event_count = event_count,
+                s.severity_events = severity_events,
+                s.severity_sum = toFloat(severity_sum),
+                s.severity_max = severity_max,
+                s.severity_avg = severity_avg,
+                s.severity_score = coalesce(severity_avg, 0.0),
+                s.event_types = event_types
+        } IN TRANSACTIONS OF 1000 ROWS
+        """,
+    ]),
+    (7, "supplier created_at for the dashboard's newest-first sort", [
+        "CREATE INDEX supplier_created_at IF NOT EXISTS FOR (s:Supplier) ON (s.created_at)",
+        # Creation time of existing suppliers is unknown; they count as
+        # created when this runs
+        """
+        MATCH (s:Supplier)
+        WHERE s.created_at IS NULL
+        CALL { WITH s SET s.created_at = datetime() } IN TRANSACTIONS OF 10000 ROWS
+        """,
+    ]),
+]
+
+
+def applied_versions(session):
+    return {r["version"] for r in session.run("MATCH (m:SchemaMigration) RETURN m.version AS version")}
+
+
+def migrate(dry_run=False):
+    """
+    Apply pending migrations in version order. Returns the versions
+    applied (or that would be, with dry_run).
+    """
+    applied = []
+
+    with get_session() as session:
+        # Schema commands run in their own auto-commit transactions
+        session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (m:SchemaMigration) REQUIRE m.version IS UNIQUE")
+        done = applied_versions(session)
+
+        for version, description, statements in MIGRATIONS:
+            if version in done:
+                continue
+
+            print(f"➡ Migration {version}: {description}")
+            if not dry_run:
+                for statement in statements:
+                    session.run(statement)
+                session.run("""
+                    MERGE (m:SchemaMigration {version: $version})
+                    SET m.description = $description, m.applied_at = datetime()
+                """, version=version, description=description)
+            applied.append(version)
+
+    return applied
+
+
+def status():
+    with get_session() as session:
+        done = applied_versions(session)
+    return [
+        {"version": version, "description": description, "applied": version in done}
+        for version, description, _ in MIGRATIONS
+    ]
+
+
+# ====================================
+# Query-plan regression checks
+# ====================================
+SCAN_OPERATORS = {"AllNodesScan", "NodeByLabelScan"}
+
+# Queries that are allowed to scan, with the reason
+KNOWN_SCANS = {
+    "GraphMCP.get_all_suppliers": "returns every supplier by design",
+}
+
+# Every MCP read query, called with representative arguments
+PLAN_CHECKS = [
+    ("GraphMCP.top_risky_suppliers", GraphMCP, "top_risky_suppliers", (5,)),
+    ("GraphMCP.latest_supplier_events", GraphMCP, "latest_supplier_events", ("Marico",)),
+    ("GraphMCP.latest_events_for_ids", GraphMCP, "latest_events_for_ids", (["S1"],)),
+    ("GraphMCP.supplier_risk_summary", GraphMCP, "supplier_risk_summary", ("Marico",)),
+    ("GraphMCP.risk_summary_for_ids", GraphMCP, "risk_summary_for_ids", (["S1"],)),
+    ("GraphMCP.top_severe_events", GraphMCP, "top_severe_events", ("India",)),
+    ("GraphMCP.get_all_suppliers", GraphMCP, "get_all_suppliers", ()),
+    ("RiskMCP.supplier_risk_report", RiskMCP, "supplier_risk_report", ("Marico",)),
+    ("RiskMCP.risk_report_for_id", RiskMCP, "risk_report_for_id", ("S1",)),
+    ("RiskMCP.top_risky_suppliers", RiskMCP, "top_risky_suppliers", (5,)),
+]
+
+
+class _EmptyResult:
+    def __iter__(self):
+        return iter(())
+
+    def single(self, strict=False):
+        return None
+
+    def data(self, *keys):
+        return []
+
+
+class PlanRecordingSession:
+    """
+    Session wrapper that EXPLAINs every query instead of running it and
+    keeps the plans. MCP methods see an empty result.
+    """
+
+    def __init__(self, session, mode="EXPLAIN"):
+        self._session = session
+        self.mode = mode
+        self.plans = []
+
+    def run(self, query, parameters=None, **kwargs):
+        result = self._session.run(f"{self.mode} {query}", parameters, **kwargs)
+        summary = result.consume()
+        self.plans.append({
+            "query": query,
+            "plan": summary.profile if self.mode == "PROFILE" else summary.plan
+        })
+        return _EmptyResult()
+
+
+def plan_operators(plan):
+    """Flatten a plan tree into operator names (without the @runtime suffix)."""
+    if not plan:
+        return []
+    name = plan.get("operatorType", "").split("@")[0]
+    ops = [name]
+    for child in plan.get("children", []):
+        ops.extend(plan_operators(child))
+    return ops
+
+
+def check_plans(mode="EXPLAIN"):
+    """
+    Plan every MCP query and flag label/all-nodes scans outside
+    KNOWN_SCANS. Returns a list of per-query reports.
+    """
+    reports = []
+
+    with get_session() as session:
+        for name, cls, method, args in PLAN_CHECKS:
+            recorder = PlanRecordingSession(session, mode)
+
+            @contextmanager
+            def factory():
+                yield recorder
+
+            getattr(cls(session_factory=factory), method)(*args)
+
+            operators = [op for p in recorder.plans for op in plan_operators(p["plan"])]
+            scans = sorted(SCAN_OPERATORS.intersection(operators))
+            reports.append({
+                "query": name,
+                "operators": operators,
+                "scans": scans,
+                "allowed": name in KNOWN_SCANS,
+                "ok": not scans or name in KNOWN_SCANS
+            })
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Neo4j schema migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations and whether they are applied")
+    parser.add_argument("--dry-run", action="store_true", help="show pending migrations without applying")
+    parser.add_argument("--check-plans", action="store_true", help="EXPLAIN every MCP query and fail on label scans")
+    parser.add_argument("--profile", action="store_true", help="use PROFILE instead of EXPLAIN for --check-plans")
+    args = parser.parse_args()
+
+    if args.status:
+        for m in status():
+            print(f"{'✔' if m['applied'] else '·'} {m['version']}: {m['description']}")
+        sys.exit(0)
+
+    if args.check_plans:
+        failed = False
+        for r in check_plans("PROFILE" if args.profile else "EXPLAIN"):
+            mark = "✔" if r["ok"] else "✘"
+            note = f" (allowed: {KNOWN_SCANS[r['query']]})" if r["scans"] and r["allowed"] else ""
+            print(f"{mark} {r['query']}: {' > '.join(r['operators'])}{note}")
+            failed = failed or not r["ok"]
+        sys.exit(1 if failed else 0)
+
+    applied = migrate(dry_run=args.dry_run)
+    print(f"🎉 {'Pending' if args.dry_run else 'Applied'} migrations: {applied or 'none'}")
@@ -0,0 +1,89 @@
+import json
+import base64
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PaginationError(ValueError):
+    """Bad limit, sort key or cursor in a paginated request."""
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if raw in (None, ""):
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, maximum)
+
+
+def parse_float(raw, name):
+    """Optional float query parameter; None when absent."""
+    if raw in (None, ""):
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise PaginationError(f"{name} must be a number")
+
+
+def encode_cursor(sort, value, tiebreak):
+    raw = json.dumps([sort, value, tiebreak], default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort):
+    """
+    Returns (value, tiebreak) of the last row of the previous page, or
+    (None, None) for the first page. A cursor from a different sort key
+    is rejected.
+    """
+    if not cursor:
+        return None, None
+    try:
+        cursor_sort, value, tiebreak = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise PaginationError("invalid cursor")
+    if cursor_sort != sort:
+        raise PaginationError("cursor does not match sort")
+    return value, tiebreak
+
+
+def keyset_predicate(expr, tiebreak_expr, descending, value_expr="$cursor_value"):
+    """
+    Cypher predicate selecting rows strictly after the cursor for
+    `ORDER BY expr {DESC|ASC}, tiebreak_expr ASC`. Expects the
+    $cursor_value / $cursor_tiebreak parameters (null on page one).
+    """
+    op = "<" if descending else ">"
+    return (
+        f"($cursor_tiebreak IS NULL OR {expr} {op} {value_expr} "
+        f"OR ({expr} = {value_expr} AND {tiebreak_expr} > $cursor_tiebreak))"
+    )
+
+
+def after_cursor(value, tiebreak, descending, cursor_value, cursor_tiebreak):
+    """Python twin of keyset_predicate for backends without Cypher."""
+    if cursor_tiebreak is None:
+        return True
+    if value == cursor_value:
+        return tiebreak > cursor_tiebreak
+    return value < cursor_value if descending else value > cursor_value
+
+
+def page(rows, limit, sort, sort_field, tiebreak_field):
+    """
+    Trim a `limit + 1` row fetch to one page and build the next cursor.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, last[sort_field], last[tiebreak_field])
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,208 @@
+import os
+import time
+import argparse
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # NumPy-only fallback below
+    sparse = None
+
+from backend.utils.neo4j_pool import get_session, execute_write
+from backend.data_version import bump_data_version
+from backend.risk_engine import RISK_EPSILON
+from backend.storage import get_graph
+
+
+# ====================================
+# Settings
+# ====================================
+PROPAGATION_DAMPING = float(os.getenv("PROPAGATION_DAMPING", "0.5"))
+PROPAGATION_MAX_DEPTH = int(os.getenv("PROPAGATION_MAX_DEPTH", "5"))
+PROPAGATION_WRITE_BATCH = int(os.getenv("PROPAGATION_WRITE_BATCH", "10000"))
+
+
+class SupplyGraph:
+    """
+    Compact in-process copy of the SUPPLIES_TO graph.
+
+    Nodes are numbered 0..n-1 (`node_ids` holds their Neo4j element ids).
+    Edges are stored in CSR form keyed by the *downstream* node: the
+    upstream suppliers of node j are indices[indptr[j]:indptr[j + 1]].
+    """
+
+    def __init__(self, node_ids, seed, src, dst):
+        n = len(node_ids)
+        self.node_ids = node_ids
+        self.seed = np.asarray(seed, dtype=np.float64)
+
+        src = np.asarray(src, dtype=np.int32)
+        dst = np.asarray(dst, dtype=np.int32)
+        order = np.argsort(dst, kind="stable")
+
+        self.indices = src[order]
+        self.rows = dst[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=n), out=self.indptr[1:])
+        self.in_degree = np.diff(self.indptr)
+
+        self._matrix = None
+        if sparse is not None:
+            self._matrix = sparse.csr_matrix(
+                (np.ones(len(self.indices)), self.indices, self.indptr), shape=(n, n)
+            )
+
+    @property
+    def n_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def upstream_sum(self, x):
+        """For every node, the sum of x over its upstream suppliers."""
+        if self._matrix is not None:
+            return self._matrix @ x
+        return np.bincount(self.rows, weights=x[self.indices], minlength=self.n_nodes)
+
+
+# ====================================
+# Export
+# ====================================
+def load_supply_graph():
+    """
+    Stream SUPPLIES_TO edges and supplier seed risk out of Neo4j.
+    Seed risk is a supplier's last_computed_risk (0 for everything else).
+    """
+    index = {}
+    node_ids = []
+    seed = []
+
+    def node(eid, risk):
+        i = index.get(eid)
+        if i is None:
+            i = index[eid] = len(node_ids)
+            node_ids.append(eid)
+            seed.append(risk or 0.0)
+        return i
+
+    src, dst = [], []
+    with get_session() as session:
+        result = session.run("""
+            MATCH (a)-[:SUPPLIES_TO]->(b)
+            RETURN elementId(a) AS a, a.last_computed_risk AS a_risk,
+                   elementId(b) AS b, b.last_computed_risk AS b_risk
+        """)
+        for record in result:
+            src.append(node(record["a"], record["a_risk"]))
+            dst.append(node(record["b"], record["b_risk"]))
+
+    return SupplyGraph(node_ids, seed, src, dst)
+
+
+# ====================================
+# Propagation
+# ====================================
+def propagate(graph, damping=PROPAGATION_DAMPING, max_depth=PROPAGATION_MAX_DEPTH, tol=1e-6):
+    """
+    Each hop adds `damping` times the mean propagated risk of a node's
+    upstream suppliers to its own seed risk, capped at 1:
+
+        r_0 = seed
+        r_k = min(1, seed + damping * mean_upstream(r_{k-1}))
+
+    Runs at most `max_depth` hops (risk travels at most that far) and
+    stops early once no value moves by more than `tol`.
+    Returns (risk, hops).
+    """
+    risk = graph.seed.copy()
+    has_upstream = graph.in_degree > 0
+    degree = np.where(has_upstream, graph.in_degree, 1)
+
+    hops = 0
+    for hops in range(1, max_depth + 1):
+        upstream_mean = graph.upstream_sum(risk) / degree
+        updated = np.minimum(1.0, graph.seed + damping * upstream_mean * has_upstream)
+        delta = np.abs(updated - risk).max() if len(risk) else 0.0
+        risk = updated
+        if delta <= tol:
+            break
+
+    return risk, hops
+
+
+# ====================================
+# Write back
+# ====================================
+# The risk engine alerts on max(own score, propagated_risk). A supplier
+# whose propagated_risk moves by more than RISK_EPSILON is stamped
+# risk_touched_at, so the next incremental sweep re-evaluates its alert.
+def write_propagated_batch(tx, rows, epsilon=RISK_EPSILON):
+    """Returns how many nodes' propagated_risk changed."""
+    return tx.run("""
+        UNWIND $rows AS row
+        MATCH (n) WHERE elementId(n) = row.id
+        WITH n, row
+        WHERE n.propagated_risk IS NULL OR abs(row.risk - n.propagated_risk) > $epsilon
+        SET n.propagated_risk = row.risk
+        FOREACH (_ IN CASE WHEN n:Supplier THEN [1] ELSE [] END |
+            SET n.risk_touched_at = datetime())
+        RETURN count(n) AS changed
+    """, rows=rows, epsilon=epsilon).single()["changed"]
+
+
+def write_propagated(node_ids, risk, epsilon=RISK_EPSILON, batch_size=PROPAGATION_WRITE_BATCH):
+    """Batched write_propagated_batch. Returns how many nodes' propagated_risk changed."""
+    changed = 0
+    for start in range(0, len(node_ids), batch_size):
+        rows = [
+            {"id": node_ids[i], "risk": float(risk[i])}
+            for i in range(start, min(start + batch_size, len(node_ids)))
+        ]
+        changed += execute_write(write_propagated_batch, rows, epsilon)
+    return changed
+
+
+def propagate_risk(damping=PROPAGATION_DAMPING, max_depth=PROPAGATION_MAX_DEPTH):
+    """
+    Export, propagate and write back `propagated_risk` on every node in
+    the supply graph. Run a risk sweep afterwards to apply it to alerts.
+    Returns timing and size stats.
+    """
+    timings = {}
+    store = get_graph()
+
+    started = time.perf_counter()
+    graph = store.supply_graph()
+    timings["export_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    risk, hops = propagate(graph, damping, max_depth)
+    timings["propagate_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    changed = store.write_propagated(graph.node_ids, risk, RISK_EPSILON)
+    timings["write_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    if changed:
+        bump_data_version()
+
+    return {
+        "nodes": graph.n_nodes,
+        "edges": graph.n_edges,
+        "hops": hops,
+        "changed": changed,
+        "engine": "scipy" if sparse is not None else "numpy",
+        **timings
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Propagate supplier risk over SUPPLIES_TO")
+    parser.add_argument("--damping", type=float, default=PROPAGATION_DAMPING)
+    parser.add_argument("--max-depth", type=int, default=PROPAGATION_MAX_DEPTH)
+    args = parser.parse_args()
+
+    print("🔗 Propagation:", propagate_risk(args.damping, args.max_depth))
@@ -0,0 +1,23 @@
+import os
+import json
+
+
+# ====================================
+# Risk scoring config
+# ====================================
+# Kept apart from backend.risk_scoring (numpy) so modules that only need
+# the settings, like the ingest path, import without it.
+#
+#   score = base_risk * RISK_BASE_WEIGHT + event_impact * RISK_EVENT_WEIGHT
+#
+# event_impact is the mean of a supplier's decayed event severities,
+# weighted by source weight * type weight. Decay halves a severity every
+# RISK_HALF_LIFE_DAYS (0 disables decay).
+RISK_BASE_WEIGHT = float(os.getenv("RISK_BASE_WEIGHT", "0.6"))
+RISK_EVENT_WEIGHT = float(os.getenv("RISK_EVENT_WEIGHT", "0.4"))
+RISK_HALF_LIFE_DAYS = float(os.getenv("RISK_HALF_LIFE_DAYS", "0"))
+
+# JSON objects, e.g. RISK_SOURCE_WEIGHTS='{"GDELT": 0.5}'. Unlisted
+# sources / types weigh 1.
+RISK_SOURCE_WEIGHTS = json.loads(os.getenv("RISK_SOURCE_WEIGHTS") or "{}")
+RISK_TYPE_WEIGHTS = json.loads(os.getenv("RISK_TYPE_WEIGHTS") or "{}")
@@ -1,56 +1,279 @@
 import os
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
+import time
+from backend.data_version import bump_data_version
+from backend.risk_config import RISK_HALF_LIFE_DAYS
+from backend.storage import get_graph
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-env_path = os.path.join(BASE_DIR, ".env")
-if os.path.exists(env_path):
-    load_dotenv(env_path)
+# Scores come from backend.risk_scoring.score (numpy), imported where
+# used so ingest can import this module without numpy.
 
-NEO4J_URI = os.getenv("NEO4J_URI")
-NEO4J_USER = os.getenv("NEO4J_USER")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
-ALERT_THRESHOLD = 0.5
+# Alerts open at ALERT_THRESHOLD and only close once risk falls below
+# ALERT_CLOSE_THRESHOLD, so a score hovering at the line does not flap.
+ALERT_THRESHOLD = float(os.getenv("ALERT_OPEN_THRESHOLD", "0.5"))
+ALERT_CLOSE_THRESHOLD = float(os.getenv("ALERT_CLOSE_THRESHOLD", "0.4"))
+# Score changes at or below this are not written back
+RISK_EPSILON = float(os.getenv("RISK_EPSILON", "0.001"))
+RISK_CHUNK_SIZE = int(os.getenv("RISK_CHUNK_SIZE", "1000"))
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
+# Cypher fragment: given `s`, `score` and `changed`, open, close or
+# refresh the supplier's open Alert and yield `action` ('open', 'close',
+# 'update' or null). An alert keeps its created_at while it stays open.
+# Starts with WITH so it can follow an update clause (Cypher needs one
+# between FOREACH/SET and the OPTIONAL MATCH).
+ALERT_TRANSITION = """
+    WITH s, score, changed
+    OPTIONAL MATCH (a:Alert {supplier_id: s.id, open: true})
+    WITH s, score, changed, a,
+         CASE
+             WHEN a IS NULL AND score >= $open_threshold THEN 'open'
+             WHEN a IS NOT NULL AND score < $close_threshold THEN 'close'
+             WHEN a IS NOT NULL AND (a.risk_value IS NULL OR abs(score - a.risk_value) > $epsilon) THEN 'update'
+         END AS action
+    FOREACH (_ IN CASE WHEN action = 'open' THEN [1] ELSE [] END |
+        CREATE (:Alert {supplier_id: s.id, open: true, risk_value: score, created_at: datetime(),
+                        country: coalesce(s.country, '')}))
+    FOREACH (_ IN CASE WHEN action = 'close' THEN [1] ELSE [] END |
+        SET a.open = false, a.risk_value = score, a.closed_at = datetime())
+    FOREACH (_ IN CASE WHEN action = 'update' THEN [1] ELSE [] END |
+        SET a.risk_value = score, a.updated_at = datetime())
+"""
 
-def compute_supplier_risk(tx, sid):
-    q = """
-    MATCH (s:Supplier {id:$sid})
-    OPTIONAL MATCH (s)<-[:AFFECTS]-(e:RiskEvent)
-    RETURN s.risk AS base_risk, collect(e.severity) AS sev
-    """
-    data = tx.run(q, sid=sid).single()
-    if not data:
-        return 0
+# Cypher fragment: an alert goes by the larger of the supplier's own
+# `score` and the risk propagated to it over SUPPLIES_TO
+# (backend.propagation), so upstream disruption can raise it.
+EFFECTIVE_RISK = """
+    WITH s, CASE WHEN s.propagated_risk > score THEN s.propagated_risk ELSE score END AS score, changed
+"""
+
+ALERT_PARAMS = {
+    "open_threshold": ALERT_THRESHOLD,
+    "close_threshold": ALERT_CLOSE_THRESHOLD,
+    "epsilon": RISK_EPSILON
+}
+
+
+# Store scores for `rows` ({id, risk}), skipping changes within
+# RISK_EPSILON, then apply ALERT_TRANSITION to every row on its
+# EFFECTIVE_RISK. `risk` in the result is that effective risk.
+APPLY_SCORES = f"""
+    UNWIND $rows AS row
+    MATCH (s:Supplier {{id: row.id}})
+    WITH s, row.risk AS score,
+         s.last_computed_risk IS NULL OR abs(row.risk - s.last_computed_risk) > $epsilon AS changed
+    FOREACH (_ IN CASE WHEN changed THEN [1] ELSE [] END |
+        SET s.last_computed_risk = score)
+    {EFFECTIVE_RISK}
+    {ALERT_TRANSITION}
+    RETURN s.id AS supplier, score AS risk, changed, action
+"""
 
-    base = data["base_risk"] or 0
-    sev_list = data["sev"] or []
 
-    event_impact = sum(sev_list)/len(sev_list) if sev_list else 0
-    score = base * 0.6 + event_impact * 0.4
+def apply_scores(tx, rows, epsilon=RISK_EPSILON, open_threshold=ALERT_THRESHOLD,
+                 close_threshold=ALERT_CLOSE_THRESHOLD):
+    """Returns one row per supplier: {supplier, risk, changed, action}."""
+    return tx.run(
+        APPLY_SCORES, rows=rows, epsilon=epsilon,
+        open_threshold=open_threshold, close_threshold=close_threshold
+    ).data()
 
-    tx.run("MATCH (s:Supplier {id:$sid}) SET s.last_computed_risk=$r", sid=sid, r=score)
-    return score
+
+def score_suppliers(tx, ids, scorer=None):
+    """[{id, risk}] for `ids`, scored by `scorer` (risk_scoring.score)."""
+    from backend.risk_scoring import load_scoring_inputs, score
+
+    inputs = load_scoring_inputs(tx, ids)
+    return [
+        {"id": sid, "risk": float(risk)}
+        for sid, risk in zip(inputs.supplier_ids, (scorer or score)(inputs))
+    ]
+
+
+def transition_alert(tx, sid, risk):
+    """
+    Apply alert hysteresis for one supplier on its own `risk` (or its
+    propagated risk, if higher). Returns the action taken.
+    """
+    record = tx.run(f"""
+        MATCH (s:Supplier {{id: $sid}})
+        WITH s, $risk AS score, false AS changed
+        {EFFECTIVE_RISK}
+        {ALERT_TRANSITION}
+        RETURN action
+    """, sid=sid, risk=risk, **ALERT_PARAMS).single()
+    return record["action"] if record else None
 
 
 def update_all_risks_and_alerts():
+    """
+    Rescore every supplier one transaction at a time. Kept as the
+    per-supplier baseline for the benchmark; the sweeps below batch.
+    """
+    from backend.risk_scoring import score
+
+    store = get_graph()
+    _, ids, watermark = store.touched_supplier_ids(full=True)
+
     alerts_created = []
-    with driver.session() as session:
-        suppliers = session.run("MATCH (s:Supplier) RETURN s.id AS id").data()
+    for sid in ids:
+        for row in store.compute_risk_chunk(
+            [sid], score, RISK_EPSILON, ALERT_THRESHOLD, ALERT_CLOSE_THRESHOLD
+        ):
+            if row["action"] == "open":
+                alerts_created.append({"supplier": row["supplier"], "risk": row["risk"]})
+    store.finish_sweep(watermark)
+
+    bump_data_version()
+    return alerts_created
 
-        for row in suppliers:
-            sid = row["id"]
 
-            with session.begin_transaction() as tx:
-                risk = compute_supplier_risk(tx, sid)
+# ====================================
+# Batch Mode (set-based, chunked UNWIND)
+# ====================================
+def compute_risk_chunk(tx, ids, scorer=None, **alert_params):
+    """
+    Score, store and alert a chunk of suppliers in one transaction:
+    `scorer` (risk_scoring.score) on the loaded inputs, then
+    apply_scores with `alert_params` (epsilon / thresholds).
+    Returns one row per supplier: {supplier, risk, changed, action}.
+    """
+    return apply_scores(tx, score_suppliers(tx, ids, scorer), **alert_params)
 
-                if risk >= ALERT_THRESHOLD:
-                    tx.run("""
-                        MERGE (a:Alert {supplier_id:$sid, open:true})
-                        SET a.risk_value=$risk, a.created_at=datetime()
-                    """, sid=sid, risk=risk)
-                    alerts_created.append({"supplier": sid, "risk": risk})
 
-    return alerts_created
+def _recompute_in_chunks(run_chunk, ids, chunk_size):
+    """run_chunk(ids) -> compute_risk_chunk rows, one call per chunk."""
+    alerts_created = []
+    alerts_closed = []
+    written = 0
+    chunks = []
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        started = time.perf_counter()
+
+        rows = run_chunk(chunk)
+
+        opened = [{"supplier": r["supplier"], "risk": r["risk"]} for r in rows if r["action"] == "open"]
+        closed = [{"supplier": r["supplier"], "risk": r["risk"]} for r in rows if r["action"] == "close"]
+        changed = sum(1 for r in rows if r["changed"])
+
+        alerts_created.extend(opened)
+        alerts_closed.extend(closed)
+        written += changed
+        chunks.append({
+            "chunk": len(chunks),
+            "suppliers": len(chunk),
+            "written": changed,
+            "alerts": len(opened),
+            "closed": len(closed),
+            "ms": round((time.perf_counter() - started) * 1000, 2)
+        })
+
+    return {
+        "alerts_created": alerts_created,
+        "alerts_closed": alerts_closed,
+        "suppliers": len(ids),
+        "written": written,
+        "skipped": len(ids) - written,
+        "opened": len(alerts_created),
+        "closed": len(alerts_closed),
+        "chunks": chunks
+    }
+
+
+def update_all_risks_and_alerts_batch(chunk_size=RISK_CHUNK_SIZE):
+    """
+    Set-based variant of update_all_risks_and_alerts: one write
+    transaction per `chunk_size` suppliers instead of 2-3 round trips
+    per supplier.
+
+    Returns {"alerts_created": [...], "alerts_closed": [...], "suppliers",
+    "written", "skipped", "opened", "closed", "chunks"} where
+    alerts_created holds newly opened alerts, in the same shape as the
+    per-supplier sweep.
+    """
+    return update_changed_risks_and_alerts(full=True, chunk_size=chunk_size)
+
+
+# ====================================
+# Incremental Mode (dirty set since watermark)
+# ====================================
+# Writers stamp `s.risk_touched_at = datetime()` whenever a supplier gets
+# a new AFFECTS edge or its base `risk` changes. The engine keeps the
+# time of its last sweep on a RiskEngineState node and only recomputes
+# suppliers touched since then.
+ENGINE_STATE_ID = "risk_engine"
+
+
+def mark_suppliers_touched(tx, ids):
+    tx.run("""
+        UNWIND $ids AS sid
+        MATCH (s:Supplier {id: sid})
+        SET s.risk_touched_at = datetime()
+    """, ids=list(ids))
+
+
+def get_watermark(tx):
+    record = tx.run("""
+        MATCH (st:RiskEngineState {id: $id})
+        RETURN st.watermark AS watermark
+    """, id=ENGINE_STATE_ID).single()
+    return record["watermark"] if record else None
+
+
+def set_watermark(tx, watermark):
+    tx.run("""
+        MERGE (st:RiskEngineState {id: $id})
+        SET st.watermark = $watermark
+    """, id=ENGINE_STATE_ID, watermark=watermark)
+
+
+def touched_supplier_ids(tx, watermark, include_open_alerts=False):
+    """
+    Suppliers touched since `watermark`. With include_open_alerts, also
+    every supplier with an open alert: under time decay their score
+    falls without any write, and only a rescore can close the alert.
+    """
+    ids = [r["id"] for r in tx.run("""
+        MATCH (s:Supplier)
+        WHERE s.risk_touched_at >= $watermark
+        RETURN s.id AS id
+    """, watermark=watermark)]
+    if include_open_alerts:
+        seen = set(ids)
+        ids.extend(
+            r["id"] for r in tx.run("""
+                MATCH (a:Alert {open: true})
+                RETURN DISTINCT a.supplier_id AS id
+            """)
+            if r["id"] not in seen
+        )
+    return ids
+
+
+def update_changed_risks_and_alerts(full=False, chunk_size=RISK_CHUNK_SIZE):
+    """
+    Recompute only suppliers touched since the last sweep (plus those
+    with open alerts when scores decay over time).
+    Pass full=True (or run with no watermark yet) to rescan everyone.
+    """
+    from backend.risk_scoring import score
+
+    store = get_graph()
+    mode, ids, watermark = store.touched_supplier_ids(full, include_open_alerts=RISK_HALF_LIFE_DAYS > 0)
+    result = _recompute_in_chunks(
+        lambda chunk: store.compute_risk_chunk(
+            chunk, score, RISK_EPSILON, ALERT_THRESHOLD, ALERT_CLOSE_THRESHOLD
+        ),
+        ids,
+        chunk_size
+    )
+    # Only once every chunk is written: a failed sweep leaves the
+    # touched suppliers for the next one
+    store.finish_sweep(watermark)
+
+    if result["written"] or result["opened"] or result["closed"]:
+        bump_data_version()
+
+    result["mode"] = mode
+    return result
@@ -0,0 +1,237 @@
+import os
+import time
+import argparse
+
+import numpy as np
+
+from backend.utils.neo4j_pool import get_session, execute_write
+from backend.data_version import bump_data_version
+from backend.risk_config import (
+    RISK_BASE_WEIGHT, RISK_EVENT_WEIGHT, RISK_HALF_LIFE_DAYS,
+    RISK_SOURCE_WEIGHTS, RISK_TYPE_WEIGHTS
+)
+from backend.risk_engine import apply_scores
+
+
+# ====================================
+# Scoring config
+# ====================================
+# Formula and weights: see backend.risk_config. With unit weights and no
+# decay this is the plain base/mean-severity blend used by score_loop.
+RISK_WRITE_BATCH = int(os.getenv("RISK_WRITE_BATCH", "10000"))
+
+SECONDS_PER_DAY = 86400.0
+
+
+class ScoringInputs:
+    """
+    Column arrays for a scoring run.
+
+    Suppliers are numbered 0..n-1 (`supplier_ids`, `base`). Events are
+    one row per AFFECTS edge: `owner` is the supplier index, `severity`
+    is NaN when unknown, `ingested_at` is epoch seconds (NaN if unset).
+    Event sources and types are stored as codes into their label lists.
+    """
+
+    def __init__(self, supplier_ids, base, owner, severity, ingested_at, sources, types):
+        self.supplier_ids = supplier_ids
+        self.base = np.asarray(base, dtype=np.float64)
+        self.owner = np.asarray(owner, dtype=np.int64)
+        self.severity = np.asarray(severity, dtype=np.float64)
+        self.ingested_at = np.asarray(ingested_at, dtype=np.float64)
+        self.source_labels, self.source_codes = _factorize(sources)
+        self.type_labels, self.type_codes = _factorize(types)
+
+    @property
+    def n_suppliers(self):
+        return len(self.supplier_ids)
+
+    @property
+    def n_events(self):
+        return len(self.owner)
+
+
+def _factorize(values):
+    """(labels, codes) with labels[codes[i]] == values[i]."""
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values)
+    )
+    return list(index), codes
+
+
+def _nan(value):
+    return np.nan if value is None else value
+
+
+# ====================================
+# Load (one streamed query)
+# ====================================
+def load_scoring_inputs(session, ids=None):
+    """
+    Stream base risk and event severities/timestamps for every supplier
+    (or just `ids`) in a single query. Works with a session or a
+    transaction.
+    """
+    supplier_ids, base = [], []
+    index = {}
+    owner, severity, ingested_at, sources, types = [], [], [], [], []
+
+    # With ids, anchor on the id constraint instead of filtering a scan
+    match = "MATCH (s:Supplier)" if ids is None else "UNWIND $ids AS sid MATCH (s:Supplier {id: sid})"
+    result = session.run(f"""
+        {match}
+        OPTIONAL MATCH (s)<-[:AFFECTS]-(e:RiskEvent)
+        RETURN s.id AS id, s.risk AS base,
+               e.severity AS severity, e.ingested_at.epochSeconds AS ingested_at,
+               e.source AS source, e.type AS type
+    """, ids=ids)
+
+    for record in result:
+        sid = record["id"]
+        i = index.get(sid)
+        if i is None:
+            i = index[sid] = len(supplier_ids)
+            supplier_ids.append(sid)
+            base.append(record["base"] or 0.0)
+        if record["severity"] is None:
+            continue
+        owner.append(i)
+        severity.append(record["severity"])
+        ingested_at.append(_nan(record["ingested_at"]))
+        sources.append(record["source"])
+        types.append(record["type"])
+
+    return ScoringInputs(supplier_ids, base, owner, severity, ingested_at, sources, types)
+
+
+# ====================================
+# Score (vectorized)
+# ====================================
+def _lookup_weights(labels, codes, weights):
+    """Map each event's label code to its configured weight (1 if unlisted)."""
+    if not weights:
+        return np.ones(len(codes))
+    table = np.array([float(weights.get(label, 1.0)) for label in labels])
+    return table[codes]
+
+
+def event_weights(inputs, source_weights=None, type_weights=None):
+    """Per-event source weight * type weight."""
+    source_weights = RISK_SOURCE_WEIGHTS if source_weights is None else source_weights
+    type_weights = RISK_TYPE_WEIGHTS if type_weights is None else type_weights
+
+    weights = _lookup_weights(inputs.source_labels, inputs.source_codes, source_weights)
+    return weights * _lookup_weights(inputs.type_labels, inputs.type_codes, type_weights)
+
+
+def decay_factors(inputs, now=None, half_life_days=RISK_HALF_LIFE_DAYS):
+    """Per-event 2^(-age / half-life); all ones when decay is off."""
+    if half_life_days <= 0 or not inputs.n_events:
+        return np.ones(inputs.n_events)
+
+    now = time.time() if now is None else now
+    age_days = np.maximum(0.0, (now - inputs.ingested_at) / SECONDS_PER_DAY)
+    # Events without a timestamp are treated as fresh
+    age_days = np.nan_to_num(age_days, nan=0.0)
+    return np.exp2(-age_days / half_life_days)
+
+
+def score(inputs, now=None, base_weight=RISK_BASE_WEIGHT, event_weight=RISK_EVENT_WEIGHT,
+          half_life_days=RISK_HALF_LIFE_DAYS, source_weights=None, type_weights=None):
+    """
+    Scores for every supplier in `inputs`, as an array in supplier order.
+
+    Decay scales each event's severity, not its weight in the mean, so a
+    supplier whose only events are old scores lower and its alert can
+    close.
+    """
+    n = inputs.n_suppliers
+    weights = event_weights(inputs, source_weights, type_weights)
+    decayed = inputs.severity * decay_factors(inputs, now, half_life_days)
+
+    weight_sum = np.bincount(inputs.owner, weights=weights, minlength=n)
+    severity_sum = np.bincount(inputs.owner, weights=weights * decayed, minlength=n)
+    event_impact = np.divide(
+        severity_sum, weight_sum, out=np.zeros(n), where=weight_sum > 0
+    )
+
+    return inputs.base * base_weight + event_impact * event_weight
+
+
+def score_loop(inputs):
+    """
+    Per-supplier reference (unit weights, no decay) computed one
+    supplier at a time. Kept for the benchmark and parity checks.
+    """
+    severities = [[] for _ in range(inputs.n_suppliers)]
+    for i, sev in zip(inputs.owner.tolist(), inputs.severity.tolist()):
+        severities[i].append(sev)
+
+    scores = []
+    for base, sev_list in zip(inputs.base.tolist(), severities):
+        event_impact = sum(sev_list) / len(sev_list) if sev_list else 0
+        scores.append(base * RISK_BASE_WEIGHT + event_impact * RISK_EVENT_WEIGHT)
+    return scores
+
+
+# ====================================
+# Write back
+# ====================================
+def write_scores(supplier_ids, scores, batch_size=RISK_WRITE_BATCH):
+    """
+    Store scores through risk_engine.apply_scores, so unchanged scores
+    are skipped and alerts follow the same hysteresis as the sweep.
+    Returns the apply_scores rows.
+    """
+    rows = []
+    for start in range(0, len(supplier_ids), batch_size):
+        batch = [
+            {"id": sid, "risk": float(risk)}
+            for sid, risk in zip(supplier_ids[start:start + batch_size], scores[start:start + batch_size])
+        ]
+        rows.extend(execute_write(apply_scores, batch))
+    return rows
+
+
+def rescore_suppliers(ids=None):
+    """
+    Load, score and store `last_computed_risk` (with alert transitions)
+    for every supplier, or just `ids`. Returns timing and size stats.
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    with get_session() as session:
+        inputs = load_scoring_inputs(session, ids)
+    timings["load_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    scores = score(inputs)
+    timings["score_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    started = time.perf_counter()
+    rows = write_scores(inputs.supplier_ids, scores)
+    timings["write_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    written = sum(1 for r in rows if r["changed"])
+    opened = sum(1 for r in rows if r["action"] == "open")
+    closed = sum(1 for r in rows if r["action"] == "close")
+    if written or opened or closed:
+        bump_data_version()
+
+    return {
+        "suppliers": inputs.n_suppliers,
+        "events": inputs.n_events,
+        "written": written,
+        "opened": opened,
+        "closed": closed,
+        **timings
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore every supplier's last_computed_risk")
+    parser.parse_args()
+
+    print("📊 Rescore:", rescore_suppliers())
@@ -6,10 +6,13 @@ async function askAgent() {
         return;
     }
 
-    document.getElementById("explanation").innerText = "Thinking...";
-    document.getElementById("data").innerText = "";
+    const explanationEl = document.getElementById("explanation");
+    const dataEl = document.getElementById("data");
 
-    const response = await fetch("/api/agent", {
+    explanationEl.innerText = "Thinking...";
+    dataEl.innerText = "";
+
+    const response = await fetch("/api/agent/stream", {
         method: "POST",
         headers: {
             "Content-Type": "application/json"
@@ -17,16 +20,55 @@ async function askAgent() {
         body: JSON.stringify({ message: question })
     });
 
-    const result = await response.json();
-
-    if (result.error) {
-        document.getElementById("explanation").innerText = result.error;
+    if (!response.ok) {
+        const result = await response.json();
+        explanationEl.innerText = result.error || "Request failed";
         return;
     }
 
-    document.getElementById("explanation").innerText =
-        result.answer.explanation || "No explanation";
+    let explanation = "";
+
+    await readEvents(response, (event, payload) => {
+        if (event === "data") {
+            // Graph results arrive before the explanation starts
+            dataEl.innerText = JSON.stringify(payload, null, 2);
+            explanationEl.innerText = "Explaining...";
+        } else if (event === "token") {
+            explanation += payload;
+            explanationEl.innerText = explanation;
+        } else if (event === "done") {
+            explanationEl.innerText = payload.explanation || "No explanation";
+        } else if (event === "error") {
+            explanationEl.innerText = payload.error;
+        }
+    });
+}
+
+// Parse a text/event-stream body, calling onEvent(event, payload) per message
+async function readEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
 
-    document.getElementById("data").innerText =
-        JSON.stringify(result.answer.data, null, 2);
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = "message";
+            const data = [];
+            for (const line of raw.split("\n")) {
+                if (line.startsWith("event:")) event = line.slice(6).trim();
+                else if (line.startsWith("data:")) data.push(line.slice(5).trim());
+            }
+
+            if (data.length) onEvent(event, JSON.parse(data.join("\n")));
+        }
+    }
 }
@@ -0,0 +1,92 @@
+const PAGE_SIZE = 50;
+let nextCursor = null;
+
+function riskLevel(score) {
+    if (score >= 0.7) return { css: "high-risk", label: "🔴 High" };
+    if (score >= 0.4) return { css: "medium-risk", label: "🟠 Medium" };
+    return { css: "low-risk", label: "🟢 Low" };
+}
+
+function supplierRow(s) {
+    const score = s.risk_score || 0;
+    const level = riskLevel(score);
+    const tr = document.createElement("tr");
+    tr.className = level.css;
+
+    const link = document.createElement("a");
+    link.href = `/agent-ui?supplier=${encodeURIComponent(s.supplier)}`;
+    link.className = "fw-bold";
+    link.innerText = s.supplier;
+
+    const events = document.createElement("td");
+    if (!s.risk_events.length) {
+        events.innerText = "✅ No active risk";
+    } else {
+        for (const r of s.risk_events) {
+            const badge = document.createElement("span");
+            badge.className = "badge bg-danger me-1";
+            badge.innerText = r;
+            events.appendChild(badge);
+        }
+    }
+
+    const cells = [document.createElement("td"), s.country || "", score.toFixed(2)];
+    cells[0].appendChild(link);
+
+    for (const cell of cells) {
+        if (cell instanceof HTMLElement) {
+            tr.appendChild(cell);
+        } else {
+            const td = document.createElement("td");
+            td.innerText = cell;
+            tr.appendChild(td);
+        }
+    }
+    tr.appendChild(events);
+
+    const levelCell = document.createElement("td");
+    levelCell.innerText = level.label;
+    tr.appendChild(levelCell);
+
+    return tr;
+}
+
+async function loadSuppliers() {
+    const params = new URLSearchParams({
+        limit: PAGE_SIZE,
+        sort: document.getElementById("sortBy").value
+    });
+    const name = document.getElementById("filterName").value.trim();
+    const country = document.getElementById("filterCountry").value.trim();
+    if (name) params.set("q", name);
+    if (country) params.set("country", country);
+    if (nextCursor) params.set("cursor", nextCursor);
+
+    const status = document.getElementById("status");
+    const loadMore = document.getElementById("loadMore");
+    status.innerText = "Loading...";
+    loadMore.classList.add("d-none");
+
+    const response = await fetch(`/api/suppliers?${params}`);
+    const result = await response.json();
+
+    if (!response.ok) {
+        status.innerText = result.error || "Failed to load suppliers";
+        return;
+    }
+
+    const rows = document.getElementById("supplierRows");
+    for (const s of result.items) rows.appendChild(supplierRow(s));
+
+    nextCursor = result.next_cursor;
+    status.innerText = rows.children.length ? "" : "No suppliers found";
+    loadMore.classList.toggle("d-none", !nextCursor);
+}
+
+function reloadSuppliers() {
+    nextCursor = null;
+    document.getElementById("supplierRows").innerHTML = "";
+    loadSuppliers();
+}
+
+reloadSuppliers();
@@ -0,0 +1,80 @@
+import os
+import threading
+
+
+# ====================================
+# Graph storage backend
+# ====================================
+#   GRAPH_BACKEND=neo4j      (default) Cypher against NEO4J_URI
+#   GRAPH_BACKEND=embedded   in-process EmbeddedGraph, persisted to
+#                            EMBEDDED_GRAPH_PATH when set
+#
+# Callers go through get_graph() (dashboards, supplier detail, event
+# writes, the risk sweep, propagation, the data version) or the MCP
+# factories below, never branch on the backend themselves. Neo4jGraph
+# and EmbeddedGraph implement the same methods.
+GRAPH_BACKEND = os.getenv("GRAPH_BACKEND", "neo4j").lower()
+EMBEDDED_GRAPH_PATH = os.getenv("EMBEDDED_GRAPH_PATH") or None
+
+BACKENDS = ("neo4j", "embedded")
+if GRAPH_BACKEND not in BACKENDS:
+    raise ValueError(f"GRAPH_BACKEND must be one of {BACKENDS}, got {GRAPH_BACKEND!r}")
+
+# Sort names every backend implements for the paginated dashboards
+ALERT_SORTS = ("risk", "created_at", "country")
+SUPPLIER_SORTS = ("risk", "created_at", "country", "name")
+
+_store = None
+_neo4j_graph = None
+_lock = threading.Lock()
+
+
+def is_embedded():
+    return GRAPH_BACKEND == "embedded"
+
+
+def get_store():
+    """The process-wide EmbeddedGraph (embedded backend only)."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                from backend.storage.embedded import EmbeddedGraph
+                _store = EmbeddedGraph(EMBEDDED_GRAPH_PATH)
+    return _store
+
+
+def get_graph():
+    """The graph store for the configured backend (Neo4jGraph or EmbeddedGraph)."""
+    global _neo4j_graph
+    if is_embedded():
+        return get_store()
+    if _neo4j_graph is None:
+        from backend.storage.neo4j_graph import Neo4jGraph
+        _neo4j_graph = Neo4jGraph()
+    return _neo4j_graph
+
+
+# Imported lazily: the MCP modules import this package's users
+def graph_mcp():
+    if is_embedded():
+        from backend.storage.mcp import EmbeddedGraphMCP
+        return EmbeddedGraphMCP(get_store())
+    from backend.mcp.graph_mcp import GraphMCP
+    return GraphMCP()
+
+
+def risk_mcp():
+    if is_embedded():
+        from backend.storage.mcp import EmbeddedRiskMCP
+        return EmbeddedRiskMCP(get_store())
+    from backend.mcp.risk_mcp import RiskMCP
+    return RiskMCP()
+
+
+def data_mcp():
+    if is_embedded():
+        from backend.storage.mcp import EmbeddedDataMCP
+        return EmbeddedDataMCP(get_store())
+    from backend.mcp.data_mcp import DataMCP
+    return DataMCP()
@@ -0,0 +1,849 @@
+import re
+import time
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+from backend.mcp.name_resolver import normalize_name, SUPPLIER_MATCH_LIMIT
+from backend.pagination import after_cursor
+from backend.storage.sqlite_store import SQLitePersistence
+from backend import metrics
+
+
+NAN = float("nan")
+EPOCH_ISO = "1970-01-01T00:00:00+00:00"
+
+
+def _num(value):
+    return NAN if value is None else float(value)
+
+
+def _opt(value):
+    # NaN is the "null" of the float columns
+    return None if value != value else value
+
+
+def _iso(ts):
+    ts = _opt(ts)
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _round(value, digits=2):
+    return round(value, digits) if value is not None else None
+
+
+def _tokens(text):
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+def _desc_nulls_first(value):
+    # Cypher sorts null above every number, so DESC lists nulls first
+    return (value is None, value if value is not None else 0.0)
+
+
+class EmbeddedGraph:
+    """
+    In-process graph store for running without a Neo4j server.
+
+    Suppliers and events live in slot-indexed columns (typed arrays for
+    numbers, NaN for null) with AFFECTS / SUPPLIES_TO as per-slot arrays
+    of neighbour slots. Lookups go through dict indexes on id, name_norm,
+    country and name tokens. Supplier aggregates are maintained on write
+    exactly like backend.aggregates, so reads never walk every edge.
+
+    With `path`, every mutation is mirrored to SQLite and the graph is
+    rebuilt from it on start-up. All access is serialized by one lock.
+    """
+
+    def __init__(self, path=None):
+        self._lock = threading.RLock()
+        self._db = SQLitePersistence(path) if path else None
+
+        # Suppliers
+        self._supplier_slot = {}
+        self.supplier_ids = []
+        self.names = []
+        self.name_norms = []
+        self.aliases = []
+        self.countries = []
+        self.products = []
+        self.risk = array("d")
+        self.last_computed_risk = array("d")
+        self.propagated_risk = array("d")
+        self.created_at = []
+        self.supplier_events = []
+        self.downstream = []
+
+        # Aggregates (same meaning as the Neo4j properties)
+        self.event_count = array("l")
+        self.severity_events = array("l")
+        self.severity_sum = array("d")
+        self.severity_max = array("d")
+        self.event_types = []
+
+        # Events
+        self._event_slot = {}
+        self.event_ids = []
+        self.summaries = []
+        self.sentiments = []
+        self.sentiment_scores = array("d")
+        self.severity = array("d")
+        self.types = []
+        self.sources = []
+        self.ingested_at = array("d")
+        self.event_suppliers = []
+
+        # Indexes
+        self._by_name_norm = {}
+        self._by_country = {}
+        self._by_token = {}
+        self._sorted_tokens = None
+
+        # Open alerts by supplier slot; closed ones are only persisted
+        self._open_alerts = {}
+        self._next_alert_id = 1
+
+        # Risk sweep bookkeeping: twin of risk_touched_at + watermark.
+        # _touched maps slot -> tick of its last touch.
+        self._touched = {}
+        self._tick = 0
+        self._swept = False
+        self.version = 0
+
+        if self._db:
+            self._load()
+
+    # -----------------------------------
+    # Supplier writes
+    # -----------------------------------
+    def _index_supplier(self, slot, add):
+        keys = [
+            (self._by_name_norm, self.name_norms[slot]),
+            (self._by_country, self.countries[slot]),
+        ]
+        for label in [self.names[slot], *self.aliases[slot]]:
+            keys.extend((self._by_token, token) for token in _tokens(label))
+
+        for index, key in keys:
+            if key is None:
+                continue
+            if add:
+                index.setdefault(key, set()).add(slot)
+            else:
+                slots = index.get(key)
+                if slots is not None:
+                    slots.discard(slot)
+                    if not slots:
+                        del index[key]
+        self._sorted_tokens = None
+
+    def _put_supplier(self, row):
+        """Insert or update one supplier. Returns (slot, risk_changed)."""
+        sid = row["id"]
+        slot = self._supplier_slot.get(sid)
+
+        if slot is None:
+            slot = self._supplier_slot[sid] = len(self.supplier_ids)
+            self.supplier_ids.append(sid)
+            self.names.append(None)
+            self.name_norms.append(None)
+            self.aliases.append(())
+            self.countries.append(None)
+            self.products.append(tuple(row.get("products") or ()))
+            self.risk.append(NAN)
+            self.last_computed_risk.append(_num(row.get("last_computed_risk")))
+            self.propagated_risk.append(_num(row.get("propagated_risk")))
+            self.created_at.append(row.get("created_at") or _now_iso())
+            self.supplier_events.append(array("l"))
+            self.downstream.append(array("l"))
+            self.event_count.append(0)
+            self.severity_events.append(0)
+            self.severity_sum.append(0.0)
+            self.severity_max.append(NAN)
+            self.event_types.append(())
+            old_risk = None
+        else:
+            self._index_supplier(slot, add=False)
+            old_risk = _opt(self.risk[slot])
+
+        self.names[slot] = row.get("name")
+        self.name_norms[slot] = normalize_name(row.get("name")) or None
+        self.aliases[slot] = tuple(row.get("aliases") or ())
+        self.countries[slot] = row.get("country")
+        risk = row.get("risk")
+        if risk is not None:
+            self.risk[slot] = float(risk)
+        self._index_supplier(slot, add=True)
+
+        new_risk = _opt(self.risk[slot])
+        return slot, old_risk is None or old_risk != new_risk
+
+    def _supplier_row(self, slot):
+        return {
+            "id": self.supplier_ids[slot],
+            "name": self.names[slot],
+            "country": self.countries[slot],
+            "aliases": list(self.aliases[slot]),
+            "risk": _opt(self.risk[slot]),
+            "last_computed_risk": _opt(self.last_computed_risk[slot]),
+            "propagated_risk": _opt(self.propagated_risk[slot]),
+            "created_at": self.created_at[slot],
+            "products": list(self.products[slot]),
+        }
+
+    def add_supplier(self, supplier):
+        """
+        Same contract as DataMCP.add_supplier: `risk` is kept when not
+        given, and new suppliers or risk changes are marked for the next
+        incremental risk sweep. Returns the stored properties.
+        """
+        with self._lock:
+            slot, risk_changed = self._put_supplier({
+                "id": supplier["id"],
+                "name": supplier["name"],
+                "country": supplier.get("country"),
+                "aliases": supplier.get("aliases", []),
+                "risk": supplier.get("risk"),
+            })
+            if risk_changed:
+                self._touch(slot)
+            row = self._supplier_row(slot)
+            self._persist("suppliers", [row])
+
+        row["name_norm"] = normalize_name(row["name"])
+        return row
+
+    def link_supplier_product(self, supplier_id, product_name):
+        with self._lock:
+            slot = self._supplier_slot.get(supplier_id)
+            if slot is not None and product_name not in self.products[slot]:
+                self.products[slot] += (product_name,)
+                self._persist("suppliers", [self._supplier_row(slot)])
+
+    def link_supplies_to(self, pairs):
+        """Add (upstream_id, downstream_id) SUPPLIES_TO edges between known suppliers."""
+        with self._lock:
+            added = []
+            for upstream, downstream in pairs:
+                a = self._supplier_slot.get(upstream)
+                b = self._supplier_slot.get(downstream)
+                if a is None or b is None or b in self.downstream[a]:
+                    continue
+                self.downstream[a].append(b)
+                added.append({"upstream_id": upstream, "downstream_id": downstream})
+            self._persist("supplies_to", added)
+
+    # -----------------------------------
+    # Event writes
+    # -----------------------------------
+    def _put_event(self, ev, default_ingested_at):
+        """Insert or update one event. Returns (slot, severity_changed)."""
+        eid = ev["id"]
+        slot = self._event_slot.get(eid)
+
+        if slot is None:
+            slot = self._event_slot[eid] = len(self.event_ids)
+            self.event_ids.append(eid)
+            self.summaries.append(None)
+            self.sentiments.append(None)
+            self.sentiment_scores.append(NAN)
+            self.severity.append(NAN)
+            self.types.append(None)
+            self.sources.append(None)
+            self.ingested_at.append(_num(ev.get("ingested_at", default_ingested_at)))
+            self.event_suppliers.append(array("l"))
+            old_severity = None
+        else:
+            old_severity = _opt(self.severity[slot])
+
+        self.summaries[slot] = ev.get("summary")
+        self.sentiments[slot] = ev.get("sentiment")
+        self.sentiment_scores[slot] = _num(ev.get("sentiment_score"))
+        self.severity[slot] = _num(ev.get("severity"))
+        self.types[slot] = ev.get("type", self.types[slot])
+        self.sources[slot] = ev.get("source")
+
+        new_severity = _opt(self.severity[slot])
+        return slot, old_severity is not None and old_severity != new_severity
+
+    def _event_row(self, slot):
+        return {
+            "id": self.event_ids[slot],
+            "summary": self.summaries[slot],
+            "sentiment": self.sentiments[slot],
+            "sentiment_score": _opt(self.sentiment_scores[slot]),
+            "severity": _opt(self.severity[slot]),
+            "type": self.types[slot],
+            "source": self.sources[slot],
+            "ingested_at": _opt(self.ingested_at[slot]),
+        }
+
+    def _fold_event(self, s, e):
+        """Add event slot e to supplier slot s's aggregates (ON_LINK_AGGREGATES)."""
+        self.event_count[s] += 1
+        severity = _opt(self.severity[e])
+        if severity is not None:
+            self.severity_events[s] += 1
+            self.severity_sum[s] += severity
+            current = _opt(self.severity_max[s])
+            if current is None or severity > current:
+                self.severity_max[s] = severity
+        event_type = self.types[e]
+        if event_type is not None and event_type not in self.event_types[s]:
+            self.event_types[s] += (event_type,)
+
+    def _refresh_aggregates(self, s):
+        """Recompute supplier slot s's aggregates from its edges."""
+        self.event_count[s] = 0
+        self.severity_events[s] = 0
+        self.severity_sum[s] = 0.0
+        self.severity_max[s] = NAN
+        self.event_types[s] = ()
+        for e in self.supplier_events[s]:
+            self._fold_event(s, e)
+
+    def _link(self, e, s):
+        if s in self.event_suppliers[e]:
+            return False
+        self.event_suppliers[e].append(s)
+        self.supplier_events[s].append(e)
+        self._fold_event(s, e)
+        return True
+
+    def _unlink(self, e, s):
+        self.event_suppliers[e].remove(s)
+        self.supplier_events[s].remove(e)
+        self._refresh_aggregates(s)
+
+    @metrics.instrument("embedded.write_events")
+    def upsert_events(self, events):
+        """
+        Twin of ingest_news.write_events_batch: upsert events (keeping the
+        first ingested_at) and link each to exactly its `supplier_ids`
+        (links are left alone when the key is missing).
+        Suppliers with new or removed links or changed severities are
+        marked for the risk sweep.
+        """
+        now = time.time()
+        with self._lock:
+            event_rows, links, unlinks = [], [], []
+            for ev in events:
+                e, severity_changed = self._put_event(ev, now)
+                event_rows.append(self._event_row(e))
+
+                wanted = ev.get("supplier_ids")
+                stale = [] if wanted is None else [
+                    s for s in self.event_suppliers[e] if self.supplier_ids[s] not in wanted
+                ]
+                for s in stale:
+                    self._unlink(e, s)
+                    self._touch(s)
+                    unlinks.append({"event_id": ev["id"], "supplier_id": self.supplier_ids[s]})
+
+                if severity_changed:
+                    for s in self.event_suppliers[e]:
+                        self._refresh_aggregates(s)
+                        self._touch(s)
+
+                for sid in ev.get("supplier_ids") or ():
+                    s = self._supplier_slot.get(sid)
+                    if s is not None and self._link(e, s):
+                        self._touch(s)
+                        links.append({"event_id": ev["id"], "supplier_id": sid})
+
+            self._persist("events", event_rows)
+            self._persist("affects", links)
+            if self._db is not None and unlinks:
+                self._db.delete("affects", unlinks)
+
+    def bulk_load(self, suppliers=(), events=(), affects=(), supplies_to=()):
+        """
+        Load plain rows (e.g. from backend.benchmarks.synthetic): supplier
+        and event dicts, (event_id, supplier_id) and (upstream_id,
+        downstream_id) pairs.
+        """
+        with self._lock:
+            for row in suppliers:
+                self._touch(self._put_supplier(row)[0])
+            now = time.time()
+            for ev in events:
+                self._put_event(ev, now)
+
+            links = []
+            for eid, sid in affects:
+                e, s = self._event_slot.get(eid), self._supplier_slot.get(sid)
+                if e is not None and s is not None and self._link(e, s):
+                    links.append({"event_id": eid, "supplier_id": sid})
+
+            self._persist("suppliers", [self._supplier_row(self._supplier_slot[r["id"]]) for r in suppliers])
+            self._persist("events", [self._event_row(self._event_slot[ev["id"]]) for ev in events])
+            self._persist("affects", links)
+            self.link_supplies_to(supplies_to)
+
+    # -----------------------------------
+    # Name resolution (SupplierResolver twin)
+    # -----------------------------------
+    def _prefix_slots(self, prefix):
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._by_token)
+        tokens = self._sorted_tokens
+        slots = set()
+        for i in range(bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            slots |= self._by_token[tokens[i]]
+        return slots
+
+    def resolve(self, supplier, limit=SUPPLIER_MATCH_LIMIT):
+        """
+        Exact name_norm match first, otherwise suppliers whose name or
+        alias tokens start with every term. Ordered by exact-token hits,
+        then name, then id.
+        """
+        name_norm = normalize_name(supplier)
+        if not name_norm:
+            return []
+
+        with self._lock:
+            exact = self._by_name_norm.get(name_norm)
+            if exact:
+                return sorted(self.supplier_ids[s] for s in exact)[:limit]
+
+            terms = _tokens(name_norm)
+            if not terms:
+                return []
+
+            candidates = None
+            for term in terms:
+                slots = self._prefix_slots(term)
+                candidates = slots if candidates is None else candidates & slots
+                if not candidates:
+                    return []
+
+            def rank(s):
+                hits = sum(1 for t in terms if s in self._by_token.get(t, ()))
+                return (-hits, self.names[s] or "", self.supplier_ids[s])
+
+            return [self.supplier_ids[s] for s in heapq.nsmallest(limit, candidates, key=rank)]
+
+    # -----------------------------------
+    # GraphMCP queries
+    # -----------------------------------
+    def _avg(self, s):
+        n = self.severity_events[s]
+        return self.severity_sum[s] / n if n else None
+
+    def _slots(self, supplier_ids):
+        return [self._supplier_slot[sid] for sid in dict.fromkeys(supplier_ids) if sid in self._supplier_slot]
+
+    def top_risky_suppliers(self, limit=5):
+        with self._lock:
+            slots = heapq.nlargest(
+                limit,
+                (s for s in range(len(self.supplier_ids)) if self.event_count[s] > 0),
+                key=lambda s: self.severity_sum[s]
+            )
+            return [
+                {
+                    "supplier": self.names[s],
+                    "country": self.countries[s],
+                    "event_count": self.event_count[s],
+                    "avg_severity": _round(self._avg(s)),
+                    "total_severity": _round(self.severity_sum[s]),
+                }
+                for s in slots
+            ]
+
+    def latest_events_for_ids(self, supplier_ids, limit=5):
+        with self._lock:
+            pairs = [(s, e) for s in self._slots(supplier_ids) for e in self.supplier_events[s]]
+            pairs = heapq.nlargest(limit, pairs, key=lambda p: _desc_nulls_first(_opt(self.ingested_at[p[1]])))
+            return [
+                {
+                    "event_type": self.types[e],
+                    "summary": self.summaries[e],
+                    "severity": _opt(self.severity[e]),
+                    "ingested_at": _iso(self.ingested_at[e]),
+                }
+                for _, e in pairs
+            ]
+
+    def risk_summary_for_ids(self, supplier_ids):
+        with self._lock:
+            return [
+                {
+                    "supplier": self.names[s],
+                    "total_events": self.event_count[s],
+                    "avg_severity": _round(self._avg(s)),
+                    "max_severity": _opt(self.severity_max[s]),
+                }
+                for s in self._slots(supplier_ids)
+                if self.event_count[s] > 0
+            ]
+
+    def top_severe_events(self, country="India", limit=5):
+        with self._lock:
+            pairs = (
+                (s, e)
+                for s in self._by_country.get(country, ())
+                for e in self.supplier_events[s]
+            )
+            pairs = heapq.nlargest(limit, pairs, key=lambda p: _desc_nulls_first(_opt(self.severity[p[1]])))
+            return [
+                {
+                    "supplier": self.names[s],
+                    "country": self.countries[s],
+                    "event_type": self.types[e],
+                    "severity": _opt(self.severity[e]),
+                }
+                for s, e in pairs
+            ]
+
+    def get_all_suppliers(self):
+        with self._lock:
+            return [
+                {"id": sid, "name": self.names[s], "aliases": list(self.aliases[s])}
+                for s, sid in enumerate(self.supplier_ids)
+            ]
+
+    # -----------------------------------
+    # RiskMCP queries
+    # -----------------------------------
+    def risk_report_for_id(self, supplier_id):
+        with self._lock:
+            s = self._supplier_slot.get(supplier_id)
+            if s is None:
+                return {"error": "Supplier not found"}
+            return {
+                "supplier": self.names[s],
+                "event_count": self.event_count[s],
+                "average_severity": round(self._avg(s) or 0, 2),
+                "max_severity": _opt(self.severity_max[s]),
+                "propagated_risk": _opt(self.propagated_risk[s]),
+                "events": [self.summaries[e] for e in self.supplier_events[s] if self.summaries[e] is not None]
+            }
+
+    def top_risky_by_avg(self, limit=5):
+        with self._lock:
+            slots = heapq.nlargest(
+                limit,
+                (s for s in range(len(self.supplier_ids)) if self.severity_events[s] > 0),
+                key=self._avg
+            )
+            return [
+                {"supplier": self.names[s], "risk_score": self._avg(s), "events": self.event_count[s]}
+                for s in slots
+            ]
+
+    # -----------------------------------
+    # Risk engine
+    # -----------------------------------
+    def _touch(self, slot):
+        self._tick += 1
+        self._touched[slot] = self._tick
+
+    def touched_supplier_ids(self, full=False, include_open_alerts=False):
+        """
+        (mode, ids, watermark): ("full", every id) on the first sweep or
+        when `full`, otherwise ("incremental", ids touched since the last
+        finished sweep, plus suppliers with open alerts if
+        `include_open_alerts`). Nothing is cleared until the sweep
+        passes `watermark` to finish_sweep.
+        """
+        with self._lock:
+            if full or not self._swept:
+                mode, slots = "full", range(len(self.supplier_ids))
+            else:
+                touched = set(self._touched)
+                if include_open_alerts:
+                    touched.update(self._open_alerts)
+                mode, slots = "incremental", sorted(touched)
+            return mode, [self.supplier_ids[s] for s in slots], self._tick
+
+    def finish_sweep(self, watermark):
+        """
+        Twin of risk_engine.set_watermark: forget touches up to
+        `watermark`. Suppliers touched during the sweep stay dirty.
+        """
+        with self._lock:
+            self._touched = {s: t for s, t in self._touched.items() if t > watermark}
+            self._swept = True
+
+    def scoring_inputs(self, slots):
+        """risk_scoring.ScoringInputs for supplier `slots`, in that order."""
+        from backend.risk_scoring import ScoringInputs
+
+        owner, severity, ingested_at, sources, types = [], [], [], [], []
+        for i, s in enumerate(slots):
+            for e in self.supplier_events[s]:
+                if _opt(self.severity[e]) is None:
+                    continue
+                owner.append(i)
+                severity.append(self.severity[e])
+                ingested_at.append(self.ingested_at[e])
+                sources.append(self.sources[e])
+                types.append(self.types[e])
+
+        return ScoringInputs(
+            [self.supplier_ids[s] for s in slots],
+            [_opt(self.risk[s]) or 0.0 for s in slots],
+            owner, severity, ingested_at, sources, types
+        )
+
+    def compute_risk_chunk(self, ids, scorer, epsilon, open_threshold, close_threshold):
+        """
+        Twin of risk_engine.compute_risk_chunk: score with
+        `scorer(ScoringInputs)`, write changed scores, apply alert
+        hysteresis on max(score, propagated_risk). Returns the same rows.
+        """
+        with self._lock:
+            slots = self._slots(ids)
+            scores = scorer(self.scoring_inputs(slots)) if slots else []
+
+            rows, suppliers, alerts = [], [], []
+            for s, score in zip(slots, scores):
+                score = float(score)
+
+                stored = _opt(self.last_computed_risk[s])
+                changed = stored is None or abs(score - stored) > epsilon
+                if changed:
+                    self.last_computed_risk[s] = score
+                    suppliers.append(self._supplier_row(s))
+
+                # EFFECTIVE_RISK
+                propagated = _opt(self.propagated_risk[s])
+                if propagated is not None and propagated > score:
+                    score = propagated
+
+                alert = self._open_alerts.get(s)
+                action = None
+                if alert is None and score >= open_threshold:
+                    action = "open"
+                    alert = self._open_alerts[s] = {
+                        "id": self._next_alert_id,
+                        "supplier_id": self.supplier_ids[s],
+                        "open": 1,
+                        "risk_value": score,
+                        # Snapshot, like the Neo4j Alert.country
+                        "country": self.countries[s] or "",
+                        "created_at": _now_iso(),
+                        "updated_at": None,
+                        "closed_at": None,
+                    }
+                    self._next_alert_id += 1
+                elif alert is not None and score < close_threshold:
+                    action = "close"
+                    del self._open_alerts[s]
+                    alert.update(open=0, risk_value=score, closed_at=_now_iso())
+                elif alert is not None and (alert["risk_value"] is None or abs(score - alert["risk_value"]) > epsilon):
+                    action = "update"
+                    alert.update(risk_value=score, updated_at=_now_iso())
+                if action:
+                    alerts.append(dict(alert))
+
+                rows.append({"supplier": self.supplier_ids[s], "risk": score, "changed": changed, "action": action})
+
+            self._persist("suppliers", suppliers)
+            self._persist("alerts", alerts)
+            return rows
+
+    # -----------------------------------
+    # Propagation
+    # -----------------------------------
+    def supply_graph(self):
+        """propagation.SupplyGraph over suppliers, seeded with last_computed_risk."""
+        from backend.propagation import SupplyGraph
+
+        with self._lock:
+            src, dst = [], []
+            for a, downstream in enumerate(self.downstream):
+                src.extend([a] * len(downstream))
+                dst.extend(downstream)
+            seed = [_opt(r) or 0.0 for r in self.last_computed_risk]
+            return SupplyGraph(list(self.supplier_ids), seed, src, dst)
+
+    def write_propagated(self, ids, risk, epsilon):
+        """
+        Twin of propagation.write_propagated_batch: store changed values
+        and mark those suppliers for the next sweep. Returns the count.
+        """
+        with self._lock:
+            rows = []
+            for sid, value in zip(ids, risk):
+                s = self._supplier_slot.get(sid)
+                if s is None:
+                    continue
+                stored = _opt(self.propagated_risk[s])
+                if stored is not None and abs(float(value) - stored) <= epsilon:
+                    continue
+                self.propagated_risk[s] = float(value)
+                self._touch(s)
+                rows.append(self._supplier_row(s))
+            self._persist("suppliers", rows)
+            return len(rows)
+
+    # -----------------------------------
+    # Dashboards
+    # -----------------------------------
+    def _keyset_page(self, rows, descending, cursor_value, cursor_tiebreak, tiebreak, fetch):
+        rows = [
+            r for r in rows
+            if after_cursor(r["_sort"], r[tiebreak], descending, cursor_value, cursor_tiebreak)
+        ]
+        rows.sort(key=lambda r: r[tiebreak])
+        rows.sort(key=lambda r: r["_sort"], reverse=descending)
+        return rows[:fetch]
+
+    ALERT_SORT_KEYS = {
+        "risk": (lambda graph, s, a: a["risk_value"] if a["risk_value"] is not None else 0.0, True),
+        "created_at": (lambda graph, s, a: a["created_at"] or EPOCH_ISO, True),
+        "country": (lambda graph, s, a: a["country"], False),
+    }
+
+    def list_alerts(self, sort, fetch, cursor_value=None, cursor_tiebreak=None,
+                    min_risk=None, country=None, supplier_id=None):
+        """Open alerts in the /api/alerts row shape, with `_sort`."""
+        key, descending = self.ALERT_SORT_KEYS[sort]
+        with self._lock:
+            rows = [
+                {
+                    "supplier_id": a["supplier_id"],
+                    "risk": a["risk_value"],
+                    "created_at": a["created_at"],
+                    "country": a["country"],
+                    "_sort": key(self, s, a),
+                }
+                for s, a in self._open_alerts.items()
+                if (min_risk is None or (a["risk_value"] is not None and a["risk_value"] >= min_risk))
+                and (country is None or a["country"] == country)
+                and (supplier_id is None or a["supplier_id"] == supplier_id)
+            ]
+        return self._keyset_page(rows, descending, cursor_value, cursor_tiebreak, "supplier_id", fetch)
+
+    SUPPLIER_SORT_KEYS = {
+        "risk": (lambda graph, s: graph._avg(s) or 0.0, True),
+        "created_at": (lambda graph, s: graph.created_at[s], True),
+        # Like the Cypher sorts, suppliers without a country / name are left out
+        "country": (lambda graph, s: graph.countries[s], False),
+        "name": (lambda graph, s: graph.name_norms[s], False),
+    }
+
+    def list_suppliers(self, sort, fetch, cursor_value=None, cursor_tiebreak=None,
+                       country=None, q=None, min_risk=None):
+        """Suppliers in the /api/suppliers row shape, with `_sort`."""
+        key, descending = self.SUPPLIER_SORT_KEYS[sort]
+        with self._lock:
+            slots = self._by_country.get(country, ()) if country is not None else range(len(self.supplier_ids))
+            rows = []
+            for s in slots:
+                sort_value = key(self, s)
+                if sort_value is None:
+                    continue
+                avg = self._avg(s)
+                if q is not None and not (self.name_norms[s] or "").startswith(q):
+                    continue
+                if min_risk is not None and (avg is None or avg < min_risk):
+                    continue
+                rows.append({
+                    "id": self.supplier_ids[s],
+                    "supplier": self.names[s],
+                    "country": self.countries[s],
+                    "risk_score": avg or 0.0,
+                    "risk_events": list(self.event_types[s]),
+                    "propagated_risk": _opt(self.propagated_risk[s]),
+                    "_sort": sort_value,
+                })
+        return self._keyset_page(rows, descending, cursor_value, cursor_tiebreak, "id", fetch)
+
+    def supplier_detail(self, supplier_id):
+        """Supplier properties plus product names and event properties."""
+        with self._lock:
+            s = self._supplier_slot.get(supplier_id)
+            if s is None:
+                return None
+            detail = {k: v for k, v in self._supplier_row(s).items() if v is not None and k != "products"}
+            avg = self._avg(s)
+            detail.update({
+                "name_norm": self.name_norms[s],
+                "event_count": self.event_count[s],
+                "severity_events": self.severity_events[s],
+                "severity_sum": self.severity_sum[s],
+                "severity_max": _opt(self.severity_max[s]),
+                "severity_avg": avg,
+                "event_types": list(self.event_types[s]),
+                "products": list(self.products[s]),
+                "events": [
+                    {**{k: v for k, v in self._event_row(e).items() if v is not None},
+                     "ingested_at": _iso(self.ingested_at[e])}
+                    for e in self.supplier_events[s]
+                ],
+            })
+            return {k: v for k, v in detail.items() if v is not None}
+
+    # -----------------------------------
+    # Data version / persistence
+    # -----------------------------------
+    def bump_version(self):
+        with self._lock:
+            self.version += 1
+            self._persist("meta", [{"key": "version", "value": str(self.version)}])
+            return self.version
+
+    def current_version(self):
+        return self.version
+
+    def stats(self):
+        with self._lock:
+            return {
+                "suppliers": len(self.supplier_ids),
+                "events": len(self.event_ids),
+                "affects": sum(len(e) for e in self.event_suppliers),
+                "supplies_to": sum(len(d) for d in self.downstream),
+                "open_alerts": len(self._open_alerts),
+                "version": self.version,
+                "persistent": self._db is not None,
+            }
+
+    def _persist(self, table, rows):
+        if self._db is not None and rows:
+            self._db.upsert(table, rows)
+
+    def _load(self):
+        data = self._db.load()
+        db, self._db = self._db, None  # don't write back while rebuilding
+        try:
+            for row in data["suppliers"]:
+                self._put_supplier(row)
+            for row in data["events"]:
+                self._put_event(row, None)
+            for row in data["affects"]:
+                e = self._event_slot.get(row["event_id"])
+                s = self._supplier_slot.get(row["supplier_id"])
+                if e is not None and s is not None:
+                    self._link(e, s)
+            self.link_supplies_to((r["upstream_id"], r["downstream_id"]) for r in data["supplies_to"])
+
+            for alert in data["alerts"]:
+                self._next_alert_id = max(self._next_alert_id, alert["id"] + 1)
+                s = self._supplier_slot.get(alert["supplier_id"])
+                if alert["open"] and s is not None:
+                    if alert.get("country") is None:
+                        alert["country"] = self.countries[s] or ""
+                    self._open_alerts[s] = alert
+
+            meta = {r["key"]: r["value"] for r in data["meta"]}
+            self.version = int(meta.get("version", 0))
+        finally:
+            self._db = db
+
+        # Files from before suppliers had created_at: keep the one just set
+        self._persist("suppliers", [
+            self._supplier_row(self._supplier_slot[row["id"]])
+            for row in data["suppliers"] if not row.get("created_at")
+        ])
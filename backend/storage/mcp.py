@@ -0,0 +1,91 @@
+from backend.supplier_index import invalidate_supplier_index
+from backend.data_version import bump_data_version
+from backend import metrics
+
+
+# ====================================
+# MCP helpers over the embedded graph
+# ====================================
+# Same methods and result shapes as backend.mcp.GraphMCP / RiskMCP /
+# DataMCP, answered from an EmbeddedGraph instead of Cypher.
+class EmbeddedGraphMCP:
+    def __init__(self, store):
+        self.store = store
+
+    def close(self):
+        pass
+
+    @metrics.instrument("mcp.graph.top_risky_suppliers")
+    def top_risky_suppliers(self, limit: int = 5):
+        return self.store.top_risky_suppliers(limit)
+
+    def latest_supplier_events(self, supplier, limit=5):
+        ids = self.store.resolve(supplier)
+        return self.latest_events_for_ids(ids, limit) if ids else []
+
+    @metrics.instrument("mcp.graph.latest_events_for_ids")
+    def latest_events_for_ids(self, supplier_ids, limit=5):
+        return self.store.latest_events_for_ids(supplier_ids, limit)
+
+    def supplier_risk_summary(self, supplier):
+        ids = self.store.resolve(supplier)
+        return self.risk_summary_for_ids(ids) if ids else []
+
+    @metrics.instrument("mcp.graph.risk_summary_for_ids")
+    def risk_summary_for_ids(self, supplier_ids):
+        return self.store.risk_summary_for_ids(supplier_ids)
+
+    @metrics.instrument("mcp.graph.top_severe_events")
+    def top_severe_events(self, country="India", limit=5):
+        return self.store.top_severe_events(country, limit)
+
+    @metrics.instrument("mcp.graph.get_all_suppliers")
+    def get_all_suppliers(self):
+        return self.store.get_all_suppliers()
+
+
+class EmbeddedRiskMCP:
+    def __init__(self, store):
+        self.store = store
+
+    def close(self):
+        pass
+
+    def supplier_risk_report(self, supplier_name: str):
+        ids = self.store.resolve(supplier_name, limit=1)
+        if not ids:
+            return {"error": "Supplier not found"}
+        return self.risk_report_for_id(ids[0])
+
+    @metrics.instrument("mcp.risk.risk_report_for_id")
+    def risk_report_for_id(self, supplier_id):
+        return self.store.risk_report_for_id(supplier_id)
+
+    @metrics.instrument("mcp.risk.top_risky_suppliers")
+    def top_risky_suppliers(self, limit=5):
+        return self.store.top_risky_by_avg(limit)
+
+
+class EmbeddedDataMCP:
+    def __init__(self, store):
+        self.store = store
+
+    def close(self):
+        pass
+
+    @metrics.instrument("mcp.data.add_supplier")
+    def add_supplier(self, supplier: dict):
+        row = self.store.add_supplier(supplier)
+
+        # Names/aliases may have changed
+        invalidate_supplier_index()
+        bump_data_version()
+
+        return row
+
+    @metrics.instrument("mcp.data.link_supplier_product")
+    def link_supplier_product(self, supplier_id, product_name):
+        self.store.link_supplier_product(supplier_id, product_name)
+        bump_data_version()
+
+        return {"ok": True}
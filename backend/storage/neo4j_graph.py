@@ -0,0 +1,198 @@
+from backend.utils.neo4j_pool import get_session, execute_write
+from backend.utils.neo4j_utils import serialize_record
+from backend.pagination import keyset_predicate
+
+
+class Neo4jGraph:
+    """
+    Neo4j side of the backend.storage interface: the same methods and
+    result shapes as EmbeddedGraph, answered with Cypher over the shared
+    driver pool. Stateless; the Cypher for risk, ingest and propagation
+    stays in those modules (imported where used, as they pull in numpy
+    and the LLM clients).
+    """
+
+    # -----------------------------------
+    # Dashboards
+    # -----------------------------------
+    # Sort name -> (Cypher expression, descending, cursor value expression).
+    # Raw indexed Alert properties, all set when the alert is created, so
+    # the ORDER BY and keyset predicate can be served from the index. The
+    # country filter uses the same a.country snapshot the sort does.
+    ALERT_SORTS = {
+        "risk": ("a.risk_value", True, "$cursor_value"),
+        "created_at": ("a.created_at", True, "datetime($cursor_value)"),
+        "country": ("a.country", False, "$cursor_value"),
+    }
+
+    # Raw indexed Supplier properties. severity_score and created_at are
+    # never null (see backend.aggregates, DataMCP.add_supplier); suppliers
+    # without a country / name are left out of those sorts, since an index
+    # holds no nulls to order.
+    SUPPLIER_SORTS = {
+        "risk": ("s.severity_score", True, "$cursor_value"),
+        "created_at": ("s.created_at", True, "datetime($cursor_value)"),
+        "country": ("s.country", False, "$cursor_value"),
+        "name": ("s.name_norm", False, "$cursor_value"),
+    }
+
+    def list_alerts(self, sort, fetch, cursor_value=None, cursor_tiebreak=None,
+                    min_risk=None, country=None, supplier_id=None):
+        """Open alerts in the /api/alerts row shape, with `_sort`."""
+        expr, descending, value_expr = self.ALERT_SORTS[sort]
+        query = f"""
+        MATCH (a:Alert {{open: true}})
+        WHERE {expr} IS NOT NULL
+          AND ($min_risk IS NULL OR a.risk_value >= $min_risk)
+          AND ($supplier_id IS NULL OR a.supplier_id = $supplier_id)
+          AND ($country IS NULL OR a.country = $country)
+          AND {keyset_predicate(expr, "a.supplier_id", descending, value_expr)}
+        RETURN a.supplier_id AS supplier_id,
+               a.risk_value AS risk,
+               a.created_at AS created_at,
+               a.country AS country,
+               {expr} AS _sort
+        ORDER BY {expr} {"DESC" if descending else "ASC"}, a.supplier_id ASC
+        LIMIT $fetch
+        """
+        with get_session() as session:
+            return serialize_record(session.run(
+                query,
+                min_risk=min_risk,
+                country=country,
+                supplier_id=supplier_id,
+                cursor_value=cursor_value,
+                cursor_tiebreak=cursor_tiebreak,
+                fetch=fetch
+            ).data())
+
+    def list_suppliers(self, sort, fetch, cursor_value=None, cursor_tiebreak=None,
+                       country=None, q=None, min_risk=None):
+        """Suppliers in the /api/suppliers row shape, with `_sort`."""
+        expr, descending, value_expr = self.SUPPLIER_SORTS[sort]
+        query = f"""
+        MATCH (s:Supplier)
+        WHERE {expr} IS NOT NULL
+          AND ($country IS NULL OR s.country = $country)
+          AND ($q IS NULL OR s.name_norm STARTS WITH $q)
+          AND ($min_risk IS NULL OR s.severity_avg >= $min_risk)
+          AND {keyset_predicate(expr, "s.id", descending, value_expr)}
+        RETURN
+            s.id AS id,
+            s.name AS supplier,
+            s.country AS country,
+            coalesce(s.severity_avg, 0.0) AS risk_score,
+            coalesce(s.event_types, []) AS risk_events,
+            s.propagated_risk AS propagated_risk,
+            {expr} AS _sort
+        ORDER BY {expr} {"DESC" if descending else "ASC"}, s.id ASC
+        LIMIT $fetch
+        """
+        with get_session() as session:
+            return serialize_record(session.run(
+                query,
+                country=country,
+                q=q,
+                min_risk=min_risk,
+                cursor_value=cursor_value,
+                cursor_tiebreak=cursor_tiebreak,
+                fetch=fetch
+            ).data())
+
+    def supplier_detail(self, supplier_id):
+        """Supplier properties plus product names and event properties."""
+        query = """
+        MATCH (s:Supplier {id:$sid})
+        OPTIONAL MATCH (s)-[:SUPPLIES]->(p:Product)
+        OPTIONAL MATCH (e:RiskEvent)-[:AFFECTS]->(s)
+        RETURN s{.*,
+                products: collect(DISTINCT p.name),
+                events: collect(DISTINCT e{.*})} AS supplier
+        """
+        with get_session() as session:
+            record = session.run(query, sid=supplier_id).single()
+        return serialize_record(record["supplier"]) if record else None
+
+    # -----------------------------------
+    # Event writes
+    # -----------------------------------
+    def upsert_events(self, events):
+        """Chunked ingest_news.write_events_batch transactions."""
+        from backend import metrics
+        from backend.ingest_news import write_events_batch, INGEST_BATCH_SIZE
+
+        for start in range(0, len(events), INGEST_BATCH_SIZE):
+            with metrics.timed("neo4j.write_events_batch"):
+                execute_write(write_events_batch, events[start:start + INGEST_BATCH_SIZE])
+
+    # -----------------------------------
+    # Risk engine
+    # -----------------------------------
+    def touched_supplier_ids(self, full=False, include_open_alerts=False):
+        """
+        (mode, ids, watermark): every supplier when `full` or before the
+        first sweep, otherwise those touched since the stored watermark.
+        The watermark is the sweep's start time; pass it to finish_sweep.
+        """
+        from backend.risk_engine import get_watermark, touched_supplier_ids
+
+        with get_session() as session:
+            # Anything touched while we sweep is stamped after this and
+            # will be picked up next time.
+            sweep_started = session.run("RETURN datetime() AS now").single()["now"]
+            watermark = None if full else session.execute_read(get_watermark)
+
+            if watermark is None:
+                ids = [r["id"] for r in session.run("MATCH (s:Supplier) RETURN s.id AS id")]
+                return "full", ids, sweep_started
+
+            ids = session.execute_read(
+                touched_supplier_ids, watermark, include_open_alerts=include_open_alerts
+            )
+            return "incremental", ids, sweep_started
+
+    def finish_sweep(self, watermark):
+        from backend.risk_engine import set_watermark
+
+        execute_write(set_watermark, watermark)
+
+    def compute_risk_chunk(self, ids, scorer, epsilon, open_threshold, close_threshold):
+        """risk_engine.compute_risk_chunk in one write transaction."""
+        from backend.risk_engine import compute_risk_chunk
+
+        return execute_write(
+            compute_risk_chunk, ids, scorer=scorer, epsilon=epsilon,
+            open_threshold=open_threshold, close_threshold=close_threshold
+        )
+
+    # -----------------------------------
+    # Propagation
+    # -----------------------------------
+    def supply_graph(self):
+        from backend.propagation import load_supply_graph
+
+        return load_supply_graph()
+
+    def write_propagated(self, ids, risk, epsilon):
+        from backend.propagation import write_propagated
+
+        return write_propagated(ids, risk, epsilon)
+
+    # -----------------------------------
+    # Data version
+    # -----------------------------------
+    def bump_version(self):
+        with get_session() as session:
+            return session.run("""
+                MERGE (v:DataVersion {id: 'graph'})
+                SET v.version = coalesce(v.version, 0) + 1
+                RETURN v.version AS version
+            """).single()["version"]
+
+    def current_version(self):
+        with get_session() as session:
+            record = session.run("""
+                MATCH (v:DataVersion {id: 'graph'})
+                RETURN v.version AS version
+            """).single()
+        return record["version"] if record else 0
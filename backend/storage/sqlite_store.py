@@ -0,0 +1,125 @@
+import os
+import json
+import sqlite3
+import threading
+
+
+# ====================================
+# SQLite persistence for the embedded graph
+# ====================================
+# Write-through: the embedded graph keeps everything in memory and
+# mirrors every mutation here, then rebuilds itself from these tables
+# on start-up.
+TABLES = {
+    "suppliers": ("id", "name", "country", "aliases", "risk", "last_computed_risk", "propagated_risk",
+                  "created_at", "products"),
+    "events": ("id", "summary", "sentiment", "sentiment_score", "severity", "type", "source", "ingested_at"),
+    "affects": ("event_id", "supplier_id"),
+    "supplies_to": ("upstream_id", "downstream_id"),
+    "alerts": ("id", "supplier_id", "open", "risk_value", "country", "created_at", "updated_at", "closed_at"),
+    "meta": ("key", "value"),
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS suppliers (
+        id TEXT PRIMARY KEY, name TEXT, country TEXT, aliases TEXT,
+        risk REAL, last_computed_risk REAL, propagated_risk REAL, created_at TEXT, products TEXT)""",
+    """CREATE TABLE IF NOT EXISTS events (
+        id TEXT PRIMARY KEY, summary TEXT, sentiment TEXT, sentiment_score REAL,
+        severity REAL, type TEXT, source TEXT, ingested_at REAL)""",
+    """CREATE TABLE IF NOT EXISTS affects (
+        event_id TEXT NOT NULL, supplier_id TEXT NOT NULL,
+        PRIMARY KEY (event_id, supplier_id))""",
+    """CREATE TABLE IF NOT EXISTS supplies_to (
+        upstream_id TEXT NOT NULL, downstream_id TEXT NOT NULL,
+        PRIMARY KEY (upstream_id, downstream_id))""",
+    """CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY, supplier_id TEXT NOT NULL, open INTEGER NOT NULL,
+        risk_value REAL, country TEXT, created_at TEXT, updated_at TEXT, closed_at TEXT)""",
+    "CREATE INDEX IF NOT EXISTS alerts_open ON alerts(open)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+# Columns added after a table first shipped: added to older files on open
+ADDED_COLUMNS = {
+    "suppliers": {"propagated_risk": "REAL", "created_at": "TEXT"},
+    "alerts": {"country": "TEXT"},
+}
+
+# Columns stored as JSON text
+JSON_COLUMNS = {"aliases", "products"}
+
+
+class SQLitePersistence:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for column, kind in columns.items():
+                    if column not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+            self._conn.commit()
+        return self._conn
+
+    def upsert(self, table, rows):
+        """INSERT OR REPLACE dict rows (keys from TABLES[table])."""
+        if not rows:
+            return
+        columns = TABLES[table]
+        values = [
+            tuple(json.dumps(row.get(c)) if c in JSON_COLUMNS else row.get(c) for c in columns)
+            for row in rows
+        ]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                values
+            )
+            conn.commit()
+
+    def delete(self, table, rows):
+        """DELETE rows matching every key of each dict row."""
+        if not rows:
+            return
+        columns = list(rows[0])
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                f"DELETE FROM {table} WHERE {' AND '.join(f'{c} = ?' for c in columns)}",
+                [tuple(row[c] for c in columns) for row in rows]
+            )
+            conn.commit()
+
+    def load(self):
+        """Every table as a list of dict rows."""
+        with self._lock:
+            conn = self._connect()
+            data = {}
+            for table, columns in TABLES.items():
+                cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+                data[table] = [
+                    {
+                        c: json.loads(v) if c in JSON_COLUMNS and v is not None else v
+                        for c, v in zip(columns, row)
+                    }
+                    for row in cursor
+                ]
+            return data
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
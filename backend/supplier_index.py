@@ -0,0 +1,132 @@
+import os
+import re
+import time
+import threading
+
+from backend import storage
+
+# Seconds before the shared index is reloaded from Neo4j
+SUPPLIER_INDEX_TTL = float(os.getenv("SUPPLIER_INDEX_TTL", "300"))
+
+# Trie key marking the end of a name/alias
+_END = ""
+
+
+def normalize_tokens(text):
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+class SupplierIndex:
+    """
+    In-memory supplier name/alias index.
+
+    Every contiguous token run of every name and alias maps to the
+    supplier ids that contain it, so resolving an extracted entity is a
+    single dict lookup instead of a CONTAINS scan over all suppliers.
+
+    Full names and aliases also go into a token trie, which finds
+    suppliers mentioned in free text in one pass over the message.
+    Instances are never mutated after construction, so readers need no
+    locking.
+    """
+
+    def __init__(self, suppliers):
+        """
+        suppliers = [{id, name, aliases (list)}, ...]
+        """
+        self.names = {}
+        self.built_at = time.monotonic()
+        self._ngrams = {}
+        self._trie = {}
+
+        # Sorted so that ambiguous labels resolve to the same id every time
+        for supplier in sorted(suppliers, key=lambda s: str(s["id"])):
+            sid = supplier["id"]
+            self.names[sid] = supplier["name"]
+
+            for label in [supplier["name"], *(supplier.get("aliases") or [])]:
+                tokens = normalize_tokens(label)
+                if not tokens:
+                    continue
+
+                for i in range(len(tokens)):
+                    for j in range(i + 1, len(tokens) + 1):
+                        self._ngrams.setdefault(" ".join(tokens[i:j]), set()).add(sid)
+
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, sid)
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, entity):
+        """Supplier ids whose name or an alias contains `entity` (token-wise)."""
+        key = " ".join(normalize_tokens(entity))
+        return sorted(self._ngrams.get(key, ())) if key else []
+
+    def resolve_all(self, entities):
+        ids = set()
+        for entity in entities:
+            ids.update(self.resolve(entity))
+        return sorted(ids)
+
+    def find_in_text(self, text):
+        """
+        Supplier id of the longest name/alias mentioned in `text`
+        (earliest wins on ties), or None.
+        """
+        tokens = normalize_tokens(text)
+        best_id, best_len = None, 0
+
+        for start in range(len(tokens)):
+            node = self._trie
+            for offset, token in enumerate(tokens[start:], 1):
+                node = node.get(token)
+                if node is None:
+                    break
+                if _END in node and offset > best_len:
+                    best_id, best_len = node[_END], offset
+
+        return best_id
+
+    def find_name_in_text(self, text):
+        sid = self.find_in_text(text)
+        return self.names[sid] if sid is not None else None
+
+
+# ====================================
+# Shared instance
+# ====================================
+_index = None
+_lock = threading.Lock()
+
+
+def load_supplier_index():
+    return SupplierIndex(storage.graph_mcp().get_all_suppliers())
+
+
+def get_supplier_index(refresh=False, ttl=SUPPLIER_INDEX_TTL):
+    """
+    Return the shared index, building it on first use, once it is older
+    than `ttl` seconds, or when `refresh` is set (e.g. once at the start
+    of every ingest run).
+    """
+    global _index
+    index = _index
+    if index is not None and not refresh and time.monotonic() - index.built_at < ttl:
+        return index
+
+    with _lock:
+        # Another thread may have rebuilt it while we waited
+        if _index is None or _index is index:
+            _index = load_supplier_index()
+        return _index
+
+
+def invalidate_supplier_index():
+    """Drop the shared index; the next lookup reloads it."""
+    global _index
+    with _lock:
+        _index = None
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError, ServiceUnavailable, SessionExpired
+
+
+# ====================================
+# Load .env
+# ====================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+env_path = os.path.join(BASE_DIR, ".env")
+if os.path.exists(env_path):
+    load_dotenv(env_path)
+
+
+# ====================================
+# Pool Settings
+# ====================================
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+NEO4J_WRITE_RETRIES = int(os.getenv("NEO4J_WRITE_RETRIES", "3"))
+
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled session frees up within the acquisition timeout."""
+
+
+class DriverRegistry:
+    """
+    Process-wide holder for a single pooled Neo4j driver.
+
+    Sessions are borrowed through `session()`. A bounded semaphore sized
+    to the driver's pool mirrors its capacity, so callers queue here
+    (and we can measure how long they wait) instead of opening sockets.
+    """
+
+    def __init__(self, uri=None, user=None, password=None,
+                 max_pool_size=NEO4J_MAX_POOL_SIZE,
+                 max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                 acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT):
+        self.uri = uri or os.getenv("NEO4J_URI")
+        self.user = user or os.getenv("NEO4J_USER")
+        self.password = password or os.getenv("NEO4J_PASSWORD")
+        self.max_pool_size = max_pool_size
+        self.max_connection_lifetime = max_connection_lifetime
+        self.acquisition_timeout = acquisition_timeout
+
+        self._driver = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pool_size)
+
+        self._in_use = 0
+        self._borrows = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # -----------------------------------
+    # Driver
+    # -----------------------------------
+    @property
+    def driver(self):
+        if self._driver is None:
+            with self._lock:
+                if self._driver is None:
+                    self._driver = GraphDatabase.driver(
+                        self.uri,
+                        auth=(self.user, self.password),
+                        max_connection_pool_size=self.max_pool_size,
+                        max_connection_lifetime=self.max_connection_lifetime,
+                        connection_acquisition_timeout=self.acquisition_timeout
+                    )
+        return self._driver
+
+    def close(self):
+        with self._lock:
+            if self._driver is not None:
+                self._driver.close()
+                self._driver = None
+
+    # -----------------------------------
+    # Borrow a session
+    # -----------------------------------
+    @contextmanager
+    def session(self, **kwargs):
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.acquisition_timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f"No Neo4j session available after {self.acquisition_timeout}s"
+            )
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            self._in_use += 1
+            self._borrows += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        try:
+            with self.driver.session(**kwargs) as session:
+                yield session
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    # -----------------------------------
+    # Stats
+    # -----------------------------------
+    def stats(self):
+        """
+        Borrowing stats from our semaphore, not the driver's socket pool:
+        `in_use` counts borrowed sessions and `free_slots` how many more
+        can be borrowed without waiting (connections may not exist yet).
+        """
+        with self._lock:
+            borrows = self._borrows
+            return {
+                "max_pool_size": self.max_pool_size,
+                "in_use": self._in_use,
+                "free_slots": self.max_pool_size - self._in_use,
+                "borrows": borrows,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / borrows * 1000, 3) if borrows else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "total_wait_ms": round(self._total_wait * 1000, 3),
+            }
+
+
+_registry = DriverRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+def get_driver():
+    return _registry.driver
+
+
+def get_session(**kwargs):
+    """
+    Borrow a session from the shared pool:
+
+        with get_session() as session:
+            session.run(...)
+    """
+    return _registry.session(**kwargs)
+
+
+def execute_write(work, *args, retries=NEO4J_WRITE_RETRIES, backoff=0.5, **kwargs):
+    """
+    Run a write unit of work in a fresh pooled session, retrying on
+    transient cluster errors (deadlocks, leader switches, dropped
+    connections) with exponential backoff. `work` must be idempotent.
+    """
+    for attempt in range(retries + 1):
+        try:
+            with get_session() as session:
+                return session.execute_write(work, *args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == retries:
+                raise
+            print(f"⚠ Neo4j write retry {attempt + 1}/{retries}:", e)
+            time.sleep(backoff * 2 ** attempt)
+
+
+def pool_stats():
+    return _registry.stats()
+
+
+def close_driver():
+    _registry.close()
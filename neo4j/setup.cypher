@@ -15,6 +15,8 @@ SET c.name = row.name, c.geo_risk_index = toFloat(row.geo_risk_index);
 LOAD CSV WITH HEADERS FROM 'file:///suppliers.csv' AS row
 MERGE (s:Supplier {id: row.supplier_id})
 SET s.name = row.name,
+    s.name_norm = toLower(trim(row.name)),
+    s.created_at = coalesce(s.created_at, datetime()),
     s.esg_score = toInteger(row.esg_score),
     s.financial_health = toFloat(row.financial_health),
     s.lead_time_days = toInteger(row.lead_time_days);
@@ -70,4 +72,7 @@ MERGE (r:RiskEvent {id: row.event_id})
 SET r.type = row.type, r.severity = toFloat(row.severity), r.description = row.description
 WITH r, row
 MATCH (c:Country {code: row.country})
-MERGE (r)-[:AFFECTS]->(c);
\ No newline at end of file
+MERGE (r)-[:AFFECTS]->(c);
+
+// Indexes and engine-state constraints are applied by the migration runner:
+//   python -m backend.migrations
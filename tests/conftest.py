@@ -0,0 +1,39 @@
+import os
+import uuid
+
+import pytest
+
+# The Groq clients are built at import time; unit tests never call them.
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("GRAPH_BACKEND", "neo4j")
+os.environ.setdefault("METRICS_ENABLED", "0")
+
+
+@pytest.fixture(scope="session")
+def neo4j_available():
+    """Skip unless NEO4J_URI points at a reachable server."""
+    if not os.getenv("NEO4J_URI"):
+        pytest.skip("NEO4J_URI not set")
+
+    from backend.utils.neo4j_pool import get_registry
+    try:
+        get_registry().driver.verify_connectivity()
+    except Exception as e:
+        pytest.skip(f"Neo4j not reachable: {e}")
+
+
+@pytest.fixture
+def test_prefix(neo4j_available):
+    """Unique id prefix for nodes a test creates; removed afterwards."""
+    from backend.utils.neo4j_pool import get_session
+
+    prefix = f"TEST_{uuid.uuid4().hex[:8]}_"
+    yield prefix
+
+    with get_session() as session:
+        session.run("""
+            MATCH (n)
+            WHERE (n:Supplier OR n:RiskEvent) AND n.id STARTS WITH $prefix
+               OR n:Alert AND n.supplier_id STARTS WITH $prefix
+            DETACH DELETE n
+        """, prefix=prefix)
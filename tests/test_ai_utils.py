@@ -0,0 +1,57 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend import ai_utils
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def put(self, key, value):
+        self.data[key] = value
+
+
+def _client(reply):
+    message = SimpleNamespace(content=reply)
+    response = SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+    create = lambda **kwargs: response
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr(ai_utils, "analysis_cache", fake)
+    return fake
+
+
+@pytest.mark.parametrize("reply", [
+    "[1, 2]", '"fire"', "0.7", '{"summary": "x"}',
+    '{"entities": "Marico", "severity": 0.5}', '{"entities": [], "severity": "high"}',
+])
+def test_malformed_analysis_is_defaulted_and_not_cached(monkeypatch, cache, reply):
+    monkeypatch.setattr(ai_utils, "client", _client(reply))
+    assert ai_utils.analyze_text("Fire at plant") == ai_utils.default_analysis("Fire at plant")
+    assert cache.data == {}
+
+
+def test_valid_analysis_is_cached(monkeypatch, cache):
+    analysis = {"summary": "s", "entities": ["Marico"], "severity": 0.8}
+    monkeypatch.setattr(ai_utils, "client", _client(json.dumps(analysis)))
+    assert ai_utils.analyze_text("Fire at plant") == analysis
+    assert list(cache.data.values()) == [analysis]
+
+
+def test_packed_items_are_validated(monkeypatch, cache):
+    reply = json.dumps([{"index": 0, "entities": [], "severity": 0.2}, {"index": 1, "severity": 0.9}])
+    monkeypatch.setattr(ai_utils, "client", _client(reply))
+    results = ai_utils.analyze_texts(["a", "b"], batch_size=2)
+    assert results[0] == {"entities": [], "severity": 0.2}
+    assert results[1] == ai_utils.default_analysis("b")
+    assert len(cache.data) == 1
@@ -0,0 +1,39 @@
+from backend.dedup import canonical_url, simhash, dedup_articles
+
+
+def test_canonical_url_drops_tracking_and_cosmetics():
+    a = canonical_url("http://www.Example.com/story/?utm_source=x&b=2&a=1#top")
+    b = canonical_url("https://example.com/story?a=1&b=2&fbclid=abc")
+    assert a == b == "https://example.com/story?a=1&b=2"
+    assert canonical_url(None) is None
+    assert canonical_url("not a url") is None
+
+
+def test_simhash_is_none_without_tokens():
+    assert simhash("") is None
+    assert simhash("  -- !! ") is None
+    assert simhash("fire") is not None
+
+
+def test_url_and_near_duplicates_are_dropped():
+    text = "Fire at Marico plant in Mumbai halts production of edible oils for a week"
+    kept, report = dedup_articles([
+        {"title": "Plant fire", "text": text, "url": "https://example.com/a?utm_medium=rss"},
+        {"title": "Other", "text": "unrelated", "url": "https://www.example.com/a/"},
+        {"title": "Plant fire", "text": text + ".", "url": "https://other.com/b"},
+        {"title": "Floods in Assam", "text": "Tea estates shut after heavy rain", "url": None},
+    ])
+    assert [a["title"] for a in kept] == ["Plant fire", "Floods in Assam"]
+    assert report == {"input": 4, "url_duplicates": 1, "near_duplicates": 1, "kept": 2}
+
+
+def test_empty_articles_only_dedupe_by_url():
+    kept, report = dedup_articles([
+        {"title": "", "text": "", "url": "https://example.com/1"},
+        {"title": None, "text": None, "url": "https://example.com/2"},
+        {"title": "", "text": "", "url": None},
+        {"title": "", "text": "", "url": "https://example.com/1"},
+    ])
+    assert [a["url"] for a in kept] == ["https://example.com/1", "https://example.com/2", None]
+    assert report["url_duplicates"] == 1
+    assert report["near_duplicates"] == 0
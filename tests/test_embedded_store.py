@@ -0,0 +1,137 @@
+import pytest
+
+from backend.storage.embedded import EmbeddedGraph
+from backend.risk_scoring import score
+
+
+SUPPLIERS = [
+    {"id": "S1", "name": "Marico Ltd", "country": "India", "risk": 0.2},
+    {"id": "S2", "name": "Marico Foods", "country": "India", "risk": 0.1},
+    {"id": "S3", "name": "Dabur", "country": None, "risk": 0.0},
+]
+
+
+@pytest.fixture
+def graph():
+    g = EmbeddedGraph()
+    for row in SUPPLIERS:
+        g.add_supplier(row)
+    return g
+
+
+def _scorer(inputs):
+    return score(inputs, base_weight=0.0, event_weight=1.0, half_life_days=0,
+                 source_weights={}, type_weights={})
+
+
+def _sweep(g, full=False):
+    _, ids, watermark = g.touched_supplier_ids(full=full, include_open_alerts=True)
+    rows = g.compute_risk_chunk(ids, _scorer, 0.001, 0.5, 0.4)
+    g.finish_sweep(watermark)
+    return {r["supplier"]: r for r in rows}
+
+
+def test_resolve_returns_every_match_up_to_limit(graph):
+    assert graph.resolve("marico") == ["S2", "S1"]
+    assert graph.resolve("marico", limit=1) == ["S2"]
+    assert graph.resolve("Marico Ltd") == ["S1"]
+    assert graph.resolve("nestle") == []
+
+
+def test_aggregates_follow_links_and_severity_changes(graph):
+    graph.upsert_events([
+        {"id": "E1", "severity": 0.8, "type": "fire", "supplier_ids": ["S1"]},
+        {"id": "E2", "severity": 0.4, "type": "strike", "supplier_ids": ["S1", "S2"]},
+    ])
+    detail = graph.supplier_detail("S1")
+    assert detail["event_count"] == 2
+    assert detail["severity_avg"] == pytest.approx(0.6)
+    assert detail["severity_max"] == pytest.approx(0.8)
+    assert detail["event_types"] == ["fire", "strike"]
+
+    graph.upsert_events([{"id": "E1", "severity": 0.2, "type": "fire"}])
+    assert graph.supplier_detail("S1")["severity_max"] == pytest.approx(0.4)
+
+
+def test_sweep_opens_skips_then_closes_with_hysteresis(graph):
+    graph.upsert_events([{"id": "E1", "severity": 0.9, "supplier_ids": ["S1"]}])
+
+    first = _sweep(graph)
+    assert first["S1"]["action"] == "open" and first["S1"]["changed"]
+    assert first["S2"]["action"] is None
+
+    # Nothing touched: only the open alert's supplier is re-scored, unchanged
+    second = _sweep(graph)
+    assert set(second) == {"S1"}
+    assert not second["S1"]["changed"] and second["S1"]["action"] is None
+
+    # Between the close and open thresholds the alert stays open
+    graph.upsert_events([{"id": "E1", "severity": 0.45}])
+    assert _sweep(graph)["S1"]["action"] == "update"
+    assert graph.stats()["open_alerts"] == 1
+
+    graph.upsert_events([{"id": "E1", "severity": 0.1}])
+    assert _sweep(graph)["S1"]["action"] == "close"
+    assert graph.stats()["open_alerts"] == 0
+
+
+def test_supplier_pages_skip_rows_without_a_sort_key(graph):
+    rows = graph.list_suppliers("country", fetch=10)
+    assert [r["id"] for r in rows] == ["S1", "S2"]
+
+    rows = graph.list_suppliers("name", fetch=10)
+    assert [r["_sort"] for r in rows] == ["dabur", "marico foods", "marico ltd"]
+
+    rows = graph.list_suppliers("name", fetch=10, cursor_value="dabur", cursor_tiebreak="S3")
+    assert [r["id"] for r in rows] == ["S2", "S1"]
+
+
+def test_touched_suppliers_survive_a_failed_sweep(graph):
+    _sweep(graph)
+    graph.upsert_events([{"id": "E1", "severity": 0.9, "supplier_ids": ["S1"]}])
+
+    # A sweep that dies before finish_sweep leaves S1 dirty
+    assert graph.touched_supplier_ids()[1] == ["S1"]
+    assert graph.touched_supplier_ids()[1] == ["S1"]
+
+    # Touched again mid-sweep: still dirty after the sweep finishes
+    _, ids, watermark = graph.touched_supplier_ids()
+    graph.upsert_events([{"id": "E2", "severity": 0.5, "supplier_ids": ["S2"]}])
+    graph.finish_sweep(watermark)
+    assert graph.touched_supplier_ids()[1] == ["S2"]
+
+
+def test_alerts_filter_and_sort_on_the_country_snapshot(graph):
+    graph.upsert_events([{"id": "E1", "severity": 0.9, "supplier_ids": ["S1", "S2"]}])
+    _sweep(graph)
+    graph.add_supplier({"id": "S2", "name": "Marico Foods", "country": "Nepal"})
+
+    rows = graph.list_alerts("country", fetch=10, country="India")
+    assert [(r["supplier_id"], r["country"], r["_sort"]) for r in rows] == [
+        ("S1", "India", "India"), ("S2", "India", "India")
+    ]
+    assert graph.list_alerts("country", fetch=10, country="Nepal") == []
+
+
+def test_suppliers_sort_newest_first(graph):
+    graph.add_supplier({"id": "S4", "name": "Nestle", "country": "India"})
+    rows = graph.list_suppliers("created_at", fetch=10)
+    assert rows[0]["id"] == "S4"
+    assert [r["_sort"] for r in rows] == sorted((r["_sort"] for r in rows), reverse=True)
+
+
+def test_reingest_moves_links_to_the_new_suppliers(tmp_path):
+    path = str(tmp_path / "graph.db")
+    g = EmbeddedGraph(path)
+    for row in SUPPLIERS:
+        g.add_supplier(row)
+
+    g.upsert_events([{"id": "E1", "severity": 0.8, "type": "fire", "supplier_ids": ["S1", "S2"]}])
+    g.upsert_events([{"id": "E1", "severity": 0.8, "type": "fire", "supplier_ids": ["S2", "S3"]}])
+
+    for graph in (g, EmbeddedGraph(path)):
+        assert graph.supplier_detail("S1")["event_count"] == 0
+        assert "severity_avg" not in graph.supplier_detail("S1")
+        assert graph.supplier_detail("S2")["event_count"] == 1
+        assert graph.supplier_detail("S3")["severity_avg"] == pytest.approx(0.8)
+    assert "S1" in g.touched_supplier_ids()[1]
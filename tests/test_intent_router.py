@@ -0,0 +1,49 @@
+import pytest
+
+from backend.intent_router import classify, record_route, router_stats, INTENT_CONFIDENCE_THRESHOLD
+
+
+def fast_path(message, has_supplier=False):
+    label, confidence = classify(message, has_supplier=has_supplier)
+    return label if confidence >= INTENT_CONFIDENCE_THRESHOLD else None
+
+
+@pytest.mark.parametrize("message", [
+    "Which suppliers have the highest risk?",
+    "Show me the top risky suppliers",
+    "suppliers with the most risk",
+])
+def test_graph_phrasings_take_fast_path(message):
+    assert fast_path(message) == "GRAPH_QUERY"
+
+
+@pytest.mark.parametrize("message", [
+    "Can you update me on supplier data?",
+    "should I remove this supplier from my shortlist given risk?",
+    "Add supplier S99 with name Acme",
+])
+def test_data_update_never_skips_the_llm(message):
+    assert fast_path(message) is None
+
+
+def test_news_and_severity():
+    assert fast_path("Any recent news about supplier strikes?") == "NEWS_QUERY"
+    assert fast_path("What is the risk severity in India?") == "EVENT_SEVERITY"
+
+
+def test_supplier_rules_only_with_known_supplier():
+    assert fast_path("How risky is ITC Limited?", has_supplier=True) == "SUPPLIER_RISK"
+    assert fast_path("How risky is ITC Limited?") is None
+
+
+def test_no_match_is_unknown():
+    assert classify("hello there") == ("UNKNOWN", 0.0)
+
+
+def test_memo_hits_count_toward_total_but_not_rules_share():
+    before = router_stats()
+    record_route("rules")
+    record_route("memo")
+    after = router_stats()
+    assert after["memo"] == before["memo"] + 1
+    assert after["total"] == before["total"] + 2
@@ -0,0 +1,64 @@
+import pytest
+
+from backend.pagination import (
+    PaginationError, parse_limit, parse_float, encode_cursor, decode_cursor,
+    keyset_predicate, after_cursor, page
+)
+
+
+def test_parse_limit():
+    assert parse_limit(None) == 50
+    assert parse_limit("10") == 10
+    assert parse_limit("100000") == 500
+    for bad in ("abc", "0", "-3"):
+        with pytest.raises(PaginationError):
+            parse_limit(bad)
+
+
+def test_parse_float_rejects_garbage_instead_of_dropping_the_filter():
+    assert parse_float(None, "min_risk") is None
+    assert parse_float("", "min_risk") is None
+    assert parse_float("0.6", "min_risk") == 0.6
+    with pytest.raises(PaginationError, match="min_risk"):
+        parse_float("abc", "min_risk")
+
+
+def test_cursor_round_trip_and_sort_mismatch():
+    cursor = encode_cursor("risk", 0.75, "S7")
+    assert decode_cursor(cursor, "risk") == (0.75, "S7")
+    assert decode_cursor(None, "risk") == (None, None)
+    with pytest.raises(PaginationError):
+        decode_cursor(cursor, "country")
+    with pytest.raises(PaginationError):
+        decode_cursor("not-a-cursor", "risk")
+
+
+def test_keyset_predicate_direction():
+    assert "s.severity_score < $cursor_value" in keyset_predicate("s.severity_score", "s.id", True)
+    assert "s.country > $cursor_value" in keyset_predicate("s.country", "s.id", False)
+
+
+def test_after_cursor_matches_keyset_order():
+    assert after_cursor(0.9, "S1", True, None, None)
+    assert after_cursor(0.5, "S1", True, 0.7, "S9")
+    assert not after_cursor(0.8, "S1", True, 0.7, "S9")
+    assert after_cursor(0.7, "S9", True, 0.7, "S3")
+    assert not after_cursor(0.7, "S3", True, 0.7, "S3")
+    assert after_cursor("India", "S1", False, "China", "S9")
+
+
+def test_pages_cover_every_row_once():
+    rows = [{"_sort": v, "id": f"S{i}"} for i, v in enumerate([0.9, 0.7, 0.7, 0.7, 0.5, 0.1])]
+    ordered = sorted(rows, key=lambda r: (-r["_sort"], r["id"]))
+
+    seen, cursor = [], None
+    while True:
+        value, tiebreak = decode_cursor(cursor, "risk")
+        fetch = [r for r in ordered if after_cursor(r["_sort"], r["id"], True, value, tiebreak)][:3]
+        result = page(fetch, 2, "risk", "_sort", "id")
+        seen.extend(r["id"] for r in result["items"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [r["id"] for r in ordered]
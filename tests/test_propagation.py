@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import backend.propagation as propagation
+from backend.propagation import SupplyGraph, propagate
+
+
+def _chain(seed):
+    """0 -> 1 -> 2 -> ... (each node supplies the next)."""
+    n = len(seed)
+    return SupplyGraph([f"n{i}" for i in range(n)], seed, list(range(n - 1)), list(range(1, n)))
+
+
+def test_risk_travels_downstream_with_damping():
+    risk, _ = propagate(_chain([0.8, 0.0, 0.0]), damping=0.5, max_depth=5)
+    assert risk == pytest.approx([0.8, 0.4, 0.2])
+
+
+def test_max_depth_limits_how_far_risk_travels():
+    risk, hops = propagate(_chain([0.8, 0.0, 0.0, 0.0]), damping=0.5, max_depth=1)
+    assert hops == 1
+    assert risk == pytest.approx([0.8, 0.4, 0.0, 0.0])
+
+
+def test_upstream_mean_and_cap():
+    # 0 and 1 both supply 2; 2 has its own seed
+    graph = SupplyGraph(["a", "b", "c"], [1.0, 0.0, 0.9], [0, 1], [2, 2])
+    risk, _ = propagate(graph, damping=0.5)
+    assert risk == pytest.approx([1.0, 0.0, 1.0])
+
+    risk, _ = propagate(SupplyGraph(["a", "b", "c"], [1.0, 0.0, 0.1], [0, 1], [2, 2]), damping=0.5)
+    assert risk[2] == pytest.approx(0.35)
+
+
+def test_stops_early_once_converged():
+    _, hops = propagate(_chain([0.5, 0.0]), damping=0.5, max_depth=50)
+    assert hops < 50
+
+
+def test_numpy_fallback_matches_sparse(monkeypatch):
+    seed = [0.9, 0.2, 0.0, 0.4]
+    src, dst = [0, 1, 2, 0], [1, 2, 3, 3]
+    with_scipy, _ = propagate(SupplyGraph(list("abcd"), seed, src, dst))
+
+    monkeypatch.setattr(propagation, "sparse", None)
+    without, _ = propagate(SupplyGraph(list("abcd"), seed, src, dst))
+    assert np.allclose(with_scipy, without)
+
+
+def test_empty_graph():
+    risk, _ = propagate(SupplyGraph([], [], [], []))
+    assert len(risk) == 0
+
+
+def test_upstream_disruption_opens_downstream_alert(monkeypatch):
+    from backend import storage
+    from backend.storage.embedded import EmbeddedGraph
+    from backend.risk_engine import update_changed_risks_and_alerts
+
+    monkeypatch.setattr(storage, "GRAPH_BACKEND", "embedded")
+    monkeypatch.setattr(storage, "_store", EmbeddedGraph())
+    graph = storage.get_store()
+    graph.add_supplier({"id": "UP", "name": "Upstream", "risk": 1.0})
+    graph.add_supplier({"id": "DOWN", "name": "Downstream", "risk": 0.0})
+    graph.link_supplies_to([("UP", "DOWN")])
+    graph.upsert_events([{"id": "E1", "severity": 1.0, "supplier_ids": ["UP"]}])
+
+    first = update_changed_risks_and_alerts(full=True)
+    assert [a["supplier"] for a in first["alerts_created"]] == ["UP"]
+
+    result = propagation.propagate_risk(damping=0.8)
+    assert result["changed"] == 2
+    assert graph.risk_report_for_id("DOWN")["propagated_risk"] == pytest.approx(0.8)
+
+    # Only suppliers whose propagated risk moved are swept again
+    second = update_changed_risks_and_alerts()
+    assert second["alerts_created"] == [{"supplier": "DOWN", "risk": pytest.approx(0.8)}]
+    assert propagation.propagate_risk(damping=0.8)["changed"] == 0
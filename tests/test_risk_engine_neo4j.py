@@ -0,0 +1,74 @@
+"""Runs the sweep Cypher against a real server (skipped without NEO4J_URI)."""
+from backend.utils.neo4j_pool import get_session
+from backend.risk_engine import compute_risk_chunk, transition_alert
+
+
+def _seed(prefix, base, severities):
+    sid = f"{prefix}S1"
+    with get_session() as session:
+        session.run("""
+            CREATE (s:Supplier {id: $sid, name: $sid, risk: $base})
+            WITH s
+            UNWIND range(0, size($severities) - 1) AS i
+            CREATE (:RiskEvent {id: $sid + '_E' + toString(i), severity: $severities[i],
+                                ingested_at: datetime()})-[:AFFECTS]->(s)
+        """, sid=sid, base=base, severities=severities)
+    return sid
+
+
+def _open_alerts(sid):
+    with get_session() as session:
+        return session.run(
+            "MATCH (a:Alert {supplier_id: $sid, open: true}) RETURN count(a) AS n", sid=sid
+        ).single()["n"]
+
+
+def test_compute_risk_chunk_opens_then_skips(test_prefix):
+    sid = _seed(test_prefix, 1.0, [0.9, 0.8])
+
+    with get_session() as session:
+        first = session.execute_write(compute_risk_chunk, [sid])
+        second = session.execute_write(compute_risk_chunk, [sid])
+
+    assert first[0]["changed"] and first[0]["action"] == "open"
+    assert not second[0]["changed"] and second[0]["action"] is None
+    assert _open_alerts(sid) == 1
+
+
+def test_transition_alert_closes_below_close_threshold(test_prefix):
+    sid = _seed(test_prefix, 1.0, [1.0])
+
+    with get_session() as session:
+        assert session.execute_write(transition_alert, sid, 0.9) == "open"
+        assert session.execute_write(transition_alert, sid, 0.45) == "update"
+        assert session.execute_write(transition_alert, sid, 0.1) == "close"
+
+    assert _open_alerts(sid) == 0
+
+
+def test_propagated_risk_raises_the_alert_score(test_prefix):
+    sid = _seed(test_prefix, 0.0, [])
+    with get_session() as session:
+        session.run("MATCH (s:Supplier {id: $sid}) SET s.propagated_risk = 0.9", sid=sid)
+        rows = session.execute_write(compute_risk_chunk, [sid])
+
+    assert rows[0]["action"] == "open" and rows[0]["risk"] == 0.9
+    assert _open_alerts(sid) == 1
+
+
+def test_reingest_drops_links_to_suppliers_no_longer_resolved(test_prefix):
+    from backend.ingest_news import write_events_batch
+
+    old, new = _seed(test_prefix, 0.0, []), _seed(test_prefix + "N", 0.0, [])
+    event = {"id": test_prefix + "E", "summary": "s", "sentiment": "negative",
+             "sentiment_score": 0.1, "severity": 0.7, "source": "x"}
+
+    with get_session() as session:
+        session.execute_write(write_events_batch, [{**event, "supplier_ids": [old]}])
+        session.execute_write(write_events_batch, [{**event, "supplier_ids": [new]}])
+        counts = {r["id"]: r["n"] for r in session.run("""
+            MATCH (s:Supplier) WHERE s.id IN $ids
+            RETURN s.id AS id, s.event_count AS n
+        """, ids=[old, new])}
+
+    assert counts == {old: 0, new: 1}
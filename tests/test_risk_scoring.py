@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from backend.risk_scoring import ScoringInputs, score, score_loop
+
+NOW = 1_700_000_000.0
+DAY = 86400.0
+
+
+def _inputs(base, events):
+    """events: (supplier index, severity, age in days, source, type)."""
+    return ScoringInputs(
+        [f"S{i}" for i in range(len(base))],
+        base,
+        [e[0] for e in events],
+        [e[1] for e in events],
+        [NOW - e[2] * DAY if e[2] is not None else np.nan for e in events],
+        [e[3] for e in events],
+        [e[4] for e in events],
+    )
+
+
+def test_matches_loop_without_decay_or_weights():
+    inputs = _inputs([0.5, 0.0, 1.0], [
+        (0, 0.9, 1, "a", "fire"),
+        (0, 0.1, 2, "b", "strike"),
+        (2, 0.4, 3, "a", "fire"),
+    ])
+    expected = score_loop(inputs)
+    got = score(inputs, now=NOW, base_weight=0.6, event_weight=0.4,
+                half_life_days=0, source_weights={}, type_weights={})
+    assert got == pytest.approx(expected)
+
+
+def test_supplier_without_events_scores_base_only():
+    inputs = _inputs([0.5], [])
+    assert score(inputs, now=NOW, base_weight=0.6, event_weight=0.4, half_life_days=0,
+                 source_weights={}, type_weights={})[0] == pytest.approx(0.3)
+
+
+def test_decay_lowers_score_of_old_events():
+    inputs = _inputs([0.0], [(0, 1.0, 10, "a", "fire")])
+    kwargs = dict(now=NOW, base_weight=0.0, event_weight=1.0, source_weights={}, type_weights={})
+
+    assert score(inputs, half_life_days=0, **kwargs)[0] == pytest.approx(1.0)
+    assert score(inputs, half_life_days=10, **kwargs)[0] == pytest.approx(0.5)
+    assert score(inputs, half_life_days=5, **kwargs)[0] == pytest.approx(0.25)
+
+
+def test_events_without_timestamp_count_as_fresh():
+    inputs = _inputs([0.0], [(0, 0.8, None, "a", "fire")])
+    assert score(inputs, now=NOW, base_weight=0.0, event_weight=1.0, half_life_days=1,
+                 source_weights={}, type_weights={})[0] == pytest.approx(0.8)
+
+
+def test_source_and_type_weights_shift_the_mean():
+    inputs = _inputs([0.0], [(0, 1.0, 0, "GDELT", "fire"), (0, 0.0, 0, "NewsAPI", "other")])
+    got = score(inputs, now=NOW, base_weight=0.0, event_weight=1.0, half_life_days=0,
+                source_weights={"GDELT": 3.0}, type_weights={})
+    assert got[0] == pytest.approx(0.75)